@@ -1,12 +1,18 @@
-import ast
 import configparser
+import hashlib
+import json
 import os
 import platform
 import shutil
 import sys
+import time
 from lib_python.repo_management import RockProjectRepo
 from lib_python.utils import get_rocm_sdk_env_variables
 from lib_python.utils import printout_list_items
+from lib_python.utils import get_file_sha256
+from lib_python.utils import get_rocm_sdk_version_str
+from lib_python.app_cfg_index import read_app_cfg
+from lib_python.app_cfg_index import get_index_os_name
 from pathlib import Path, PurePosixPath
 import lib_python.rcb_constants as rcb_const
 
@@ -20,9 +26,10 @@ class ConfigReader(configparser.ConfigParser):
         self._is_app_config = False
         self._is_app_list_config = False
         self.cfg_path = cfg_path
+        self.cfg_index_entry = None
         if self.cfg_path.exists():
             try:
-                self.read(self.cfg_path)
+                self.cfg_index_entry = read_app_cfg(self, self.cfg_path)
             except:
                 raise ValueError(
                     "Could not read the configuration file: "
@@ -59,6 +66,35 @@ class ConfigReader(configparser.ConfigParser):
             )
 
 
+    def _get_app_info_value(self, config_key):
+        ret = None
+        if self.has_option(rcb_const.RCB__APP_CFG__SECTION_APP_INFO, config_key):
+            ret = self.get(rcb_const.RCB__APP_CFG__SECTION_APP_INFO, config_key)
+        return ret
+
+
+    def get_app_name(self):
+        return self._get_app_info_value(rcb_const.RCB__APP_CFG__KEY__APP_NAME)
+
+
+    # list of apps that needs to be build before this app
+    def get_app_dependencies(self):
+        ret = []
+        value = self._get_app_info_value(rcb_const.RCB__APP_CFG__KEY__DEPENDS)
+        if value:
+            ret = value.split()
+        return ret
+
+
+    # apps use the rocm sdk unless it is disabled with the PROP_IS_ROCM_SDK_USED
+    def is_rocm_sdk_used(self):
+        ret = True
+        value = self._get_app_info_value(rcb_const.RCB__APP_CFG__KEY__PROP_IS_ROCM_SDK_USED)
+        if value:
+            ret = value.lower().strip() not in ("false", "no", "off", "0")
+        return ret
+
+
 class RockProjectBuilder(configparser.ConfigParser):
     def _to_boolean(self, value):
         if not value:
@@ -100,20 +136,6 @@ class RockProjectBuilder(configparser.ConfigParser):
         return ret
 
 
-    #return either os specific or generic version of command depending which is available.
-    #if both versions of command exist in app-config file, then the os-specific is selected.
-    def _get_cmd_phase_allowing_os_override(self, cmd_generic):
-        if self.is_posix:
-            cmd_os = cmd_generic + rcb_const.RCB__APP_CFG__CMD_PHASE_EXTENSION_LINUX
-        else:
-            cmd_os = cmd_generic + rcb_const.RCB__APP_CFG__CMD_PHASE_EXTENSION_WINDOWS
-        if self.has_option(rcb_const.RCB__APP_CFG__SECTION_APP_INFO, cmd_os):
-            ret = self._get_app_info_config_value(cmd_os)
-        else:
-            ret = self._get_app_info_config_value(cmd_generic)
-        return ret
-
-
     def __init__(
         self,
         rock_builder_root_dir,
@@ -131,7 +153,13 @@ class RockProjectBuilder(configparser.ConfigParser):
         self.app_cfg_path = app_cfg_path
         self.package_output_dir = package_output_dir
         if self.app_cfg_path.exists():
-            self.read(self.app_cfg_path)
+            try:
+                self.cfg_index_entry = read_app_cfg(self, self.app_cfg_path)
+            except (OSError, configparser.Error):
+                raise ValueError(
+                    "Could not read the app configuration file: "
+                    + self.app_cfg_path.as_posix()
+                )
         else:
             raise ValueError(
                 "Could not find the app configuration file: "
@@ -140,7 +168,8 @@ class RockProjectBuilder(configparser.ConfigParser):
         # app_info section is mandatory but the
         # name, repo_url and version information is not
         # (project could want to run pip install command for example)
-        if not self.has_section(rcb_const.RCB__APP_CFG__SECTION_APP_INFO):
+        if (not self.has_section(rcb_const.RCB__APP_CFG__SECTION_APP_INFO) or
+            not self.cfg_index_entry["resolved"]):
             raise ValueError(
                 "Could not find the app_info from configuration file: "
                 + self.app_cfg_path.as_posix()
@@ -155,8 +184,13 @@ class RockProjectBuilder(configparser.ConfigParser):
             self.repo_url = None
 
         if self.has_option(rcb_const.RCB__APP_CFG__SECTION_APP_INFO, rcb_const.RCB__APP_CFG__KEY__PROP_FETCH_REPO_TAGS):
-            self.repo_tags = self._get_app_info_boolean_value(rcb_const.RCB__APP_CFG__KEY__PROP_FETCH_REPO_TAGS)
-            if self.repo_tags:
+            repo_tags_value = self._get_app_info_config_value(rcb_const.RCB__APP_CFG__KEY__PROP_FETCH_REPO_TAGS)
+            if repo_tags_value and repo_tags_value.strip().lower() == rcb_const.RCB__FETCH_REPO_TAGS_NEAREST:
+                # shallow fetch deepened until the nearest tag is found
+                self.repo_tags = rcb_const.RCB__FETCH_REPO_TAGS_NEAREST
+            else:
+                self.repo_tags = self._get_app_info_boolean_value(rcb_const.RCB__APP_CFG__KEY__PROP_FETCH_REPO_TAGS)
+            if self.repo_tags is True:
                 self.repo_depth = 0
             else:
                 self.repo_depth = 1
@@ -204,44 +238,24 @@ class RockProjectBuilder(configparser.ConfigParser):
                 self.enable_on_os = True
 
         self._get_app_info_boolean_value
+        # commands and environment variables of the current os are resolved in the config index.
+        # (CMD_XXX_LINUX or CMD_XXX_WINDOWS option is used instead of the generic "CMD_XXX" if set
+        # and ENV_VAR_LINUX or ENV_VAR_WINDOWS are appended to the ENV_VAR)
+        resolved_app_info = self.cfg_index_entry["resolved"][get_index_os_name(self.is_posix)]
         self.env_setup_cmd = None
-        value = self._get_app_info_config_value(rcb_const.RCB__APP_CFG__KEY__ENV_VAR)
-        if value:
-            self.env_setup_cmd = list(
-                filter(None, (x.strip() for x in value.splitlines()))
-            )
-        if self.is_posix:
-            value = self._get_app_info_config_value(rcb_const.RCB__APP_CFG__KEY__ENV_VAR_LINUX)
-            if value:
-                temp_env_list = list(
-                    filter(None, (x.strip() for x in value.splitlines()))
-                )
-                if self.env_setup_cmd:
-                    self.env_setup_cmd.extend(temp_env_list)
-                else:
-                    self.env_setup_cmd = temp_env_list
-        else:
-            value = self._get_app_info_config_value(rcb_const.RCB__APP_CFG__KEY__ENV_VAR_WINDOWS)
-            if value:
-                temp_env_list = list(
-                    filter(None, (x.strip() for x in value.splitlines()))
-                )
-                if self.env_setup_cmd:
-                    self.env_setup_cmd.extend(temp_env_list)
-                else:
-                    self.env_setup_cmd = temp_env_list
-        # here we want to check if specific CMD_XXX_LINUX or CMD_XXX_WINDOWS option is set
-        # otherwise we use generic "CMD_XXX" option
-        self.CMD_INIT         = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_INIT)
-        self.CMD_CLEAN        = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_CLEAN)
-        self.CMD_HIPIFY       = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY)
-        self.CMD_PRE_CONFIG   = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_PRE_CONFIG)
-        self.CMD_CONFIG       = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_CONFIG)
-        self.CMD_POST_CONFIG  = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_POST_CONFIG)
-        self.CMD_BUILD        = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_BUILD)
-        self.CMD_CMAKE_CONFIG = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_CONFIG)
-        self.CMD_INSTALL      = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_INSTALL)
-        self.CMD_POST_INSTALL = self._get_cmd_phase_allowing_os_override(rcb_const.RCB__APP_CFG__KEY__CMD_POST_INSTALL)
+        if resolved_app_info["env_var_list"]:
+            self.env_setup_cmd = list(resolved_app_info["env_var_list"])
+        resolved_cmd_dict = resolved_app_info["cmd"]
+        self.CMD_INIT         = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_INIT]
+        self.CMD_CLEAN        = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_CLEAN]
+        self.CMD_HIPIFY       = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY]
+        self.CMD_PRE_CONFIG   = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_PRE_CONFIG]
+        self.CMD_CONFIG       = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_CONFIG]
+        self.CMD_POST_CONFIG  = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_POST_CONFIG]
+        self.CMD_BUILD        = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_BUILD]
+        self.CMD_CMAKE_CONFIG = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_CONFIG]
+        self.CMD_INSTALL      = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_INSTALL]
+        self.CMD_POST_INSTALL = resolved_cmd_dict[rcb_const.RCB__APP_CFG__KEY__CMD_POST_INSTALL]
 
         self.app_root_dir_path = Path(rock_builder_root_dir)
         self.app_src_dir_path = app_src_dir
@@ -258,6 +272,13 @@ class RockProjectBuilder(configparser.ConfigParser):
         self.patch_dir_root_arr.append(rcb_const.THEROCK_SDK_SRC__PATCHES_ROOT_DIR)
         for ii, element in enumerate(self.patch_dir_root_arr):
             self.patch_dir_root_arr[ii] = self.patch_dir_root_arr[ii].resolve()
+        self.cmd_phase_fingerprint_dict = {}
+        self.build_cache_key = None
+        self.build_cache_key_inputs = None
+        # (compiler cache, phase name) while the compiler cache stats of the phase are collected
+        self.compiler_cache_phase = None
+        self.phase_start_time = None
+        self.phase_start_trace_time = None
         self.app_repo = RockProjectRepo(
             self.package_output_dir,
             self.app_name,
@@ -271,6 +292,11 @@ class RockProjectBuilder(configparser.ConfigParser):
             self.app_patch_dir_base_name,
             self.patch_dir_root_arr,
         )
+        from lib_python.wheel_install import is_python_wheel_install_deferred
+        # apps with post install commands need the wheel installed before them
+        self.app_repo.is_wheel_install_deferred = (is_python_wheel_install_deferred(self.app_cfg_base_name) and
+                                                   not self.CMD_POST_INSTALL)
+        self.app_repo.wheel_install_stamp_fname = self._get_cmd_phase_stamp_filename(rcb_const.RCB__APP_CFG__KEY__CMD_INSTALL)
 
     # printout project builder specific info for logging and debug purposes
     def printout(self, phase):
@@ -294,6 +320,7 @@ class RockProjectBuilder(configparser.ConfigParser):
         print("------------------------")
 
     def printout_error_and_terminate(self, phase):
+        self.app_repo.printout_phase_log_tail()
         self.printout(phase)
         print(phase + " failed for " + self.app_name)
         sys.exit(1)
@@ -310,6 +337,44 @@ class RockProjectBuilder(configparser.ConfigParser):
         ret = Path(self.app_build_dir_path) / fname
         return ret
 
+    # Command phases executed by the build step.
+    # (build steps are the init, checkout, hipify, ... post_install arguments of the rockbuilder)
+    def get_build_step_cmd_phase_list(self, build_step: str):
+        ret = []
+        if build_step == "init":
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_INIT)
+        elif build_step == "checkout":
+            if self.repo_url:
+                ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_CHECKOUT)
+        elif build_step == "hipify":
+            if self.repo_url:
+                ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY)
+        elif build_step == "pre_config":
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_PRE_CONFIG)
+        elif build_step == "config":
+            if self.CMD_CMAKE_CONFIG:
+                ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_CONFIG)
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_CONFIG)
+        elif build_step == "post_config":
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_POST_CONFIG)
+        elif build_step == "build":
+            if self.CMD_CMAKE_CONFIG:
+                ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_BUILD)
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_BUILD)
+        elif build_step == "install":
+            if self.CMD_CMAKE_CONFIG:
+                ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_INSTALL)
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_INSTALL)
+        elif build_step == "post_install":
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_POST_INSTALL)
+        return ret
+
+    # Check only whether the stamp file of the phase exist.
+    # Changed phase inputs are noticed when the phase is executed.
+    def is_cmd_phase_done(self, cmd_phase_name: str):
+        ret = self._get_cmd_phase_stamp_filename(cmd_phase_name).exists()
+        return ret
+
     def _add_stamp_filename_to_list_if_phase_equal_or_forced(self,
                           phase_stamp_fname_arr,
                           searched_phase_name: str,
@@ -367,6 +432,69 @@ class RockProjectBuilder(configparser.ConfigParser):
                 sys.exit(1)
 
 
+    def _get_cmd_phase_command(self, cmd_phase_name:str):
+        phase_cmd_dict = {
+            rcb_const.RCB__APP_CFG__KEY__CMD_INIT: self.CMD_INIT,
+            rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY: self.CMD_HIPIFY,
+            rcb_const.RCB__APP_CFG__KEY__CMD_PRE_CONFIG: self.CMD_PRE_CONFIG,
+            rcb_const.RCB__APP_CFG__KEY__CMD_CONFIG: self.CMD_CONFIG,
+            rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_CONFIG: self.CMD_CMAKE_CONFIG,
+            rcb_const.RCB__APP_CFG__KEY__CMD_POST_CONFIG: self.CMD_POST_CONFIG,
+            rcb_const.RCB__APP_CFG__KEY__CMD_BUILD: self.CMD_BUILD,
+            rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_BUILD: self.CMD_CMAKE_CONFIG,
+            rcb_const.RCB__APP_CFG__KEY__CMD_INSTALL: self.CMD_INSTALL,
+            rcb_const.RCB__APP_CFG__KEY__CMD_CMAKE_INSTALL: self.CMD_CMAKE_CONFIG,
+            rcb_const.RCB__APP_CFG__KEY__CMD_POST_INSTALL: self.CMD_POST_INSTALL,
+        }
+        ret = phase_cmd_dict.get(cmd_phase_name)
+        if ret:
+            ret = os.path.expandvars(str(ret))
+        return ret
+
+    # Inputs that affect to the result of the command phase.
+    #
+    # Checkout phase depends only from the repository, version, the commit
+    # the version resolves to and patches so that it can also be executed before the app environment is set up.
+    # Source tree and config file are not used for the init, checkout and hipify phases
+    # because the hipify modifies the source tree and because the editing of
+    # the build commands should not cause a new checkout.
+    def _get_cmd_phase_inputs(self, cmd_phase_name:str):
+        ret = {"phase": cmd_phase_name}
+        if cmd_phase_name == rcb_const.RCB__APP_CFG__KEY__CMD_CHECKOUT:
+            ret["repo_url"] = self.repo_url
+            ret["version"] = self.app_version
+            ret["repo_depth"] = self.repo_depth
+            ret["repo_tags"] = self.repo_tags
+            ret["version_sha"] = self.app_repo.get_src_commit_sha()
+            ret["patch_set"] = self.app_repo.get_patch_set_hash()
+        else:
+            ret["cmd"] = self._get_cmd_phase_command(cmd_phase_name)
+            ret["env"] = self.app_repo.get_app_env_variables()
+            ret["gpu_targets"] = os.environ.get(rcb_const.RCB__ENV_VAR__AMDGPU_TARGETS)
+            if cmd_phase_name != rcb_const.RCB__APP_CFG__KEY__CMD_INIT:
+                ret["patch_set"] = self.app_repo.get_patch_set_hash()
+            if cmd_phase_name not in (rcb_const.RCB__APP_CFG__KEY__CMD_INIT,
+                                      rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY):
+                ret["cfg"] = get_file_sha256(self.app_cfg_path)
+                ret["src_tree"] = self.app_repo.get_src_tree_hash()
+        return ret
+
+    def _get_cmd_phase_fingerprint(self, cmd_phase_inputs: dict):
+        inputs_str = json.dumps(cmd_phase_inputs, sort_keys=True)
+        ret = hashlib.sha256(inputs_str.encode()).hexdigest()
+        return ret
+
+    # Read the stamp file saved when the command phase was done last time.
+    # Returns None for the empty stamp files of older rockbuilder versions.
+    def _read_cmd_phase_stamp(self, fname: Path):
+        ret = None
+        try:
+            with open(fname, "r") as stamp_file:
+                ret = json.load(stamp_file)
+        except (OSError, ValueError):
+            ret = None
+        return ret
+
     def _is_cmd_phase_exec_required(self,
                       cmd_phase_name:str,
                       cmd_init_force_exec:bool,
@@ -374,26 +502,112 @@ class RockProjectBuilder(configparser.ConfigParser):
         #print("cmd_phase_name: " + cmd_phase_name)
         #print("cmd_init_force_exec: " + str(cmd_init_force_exec))
         #print("cmd_any_force_exec: " + str(cmd_any_force_exec))
+        inputs = self._get_cmd_phase_inputs(cmd_phase_name)
+        fingerprint = self._get_cmd_phase_fingerprint(inputs)
+        self.cmd_phase_fingerprint_dict[cmd_phase_name] = (fingerprint, inputs)
         if cmd_init_force_exec or cmd_any_force_exec:
             # exec of command phase needed
             ret = True
         else:
             # exec needed if stamp filename does not exist
+            # or if the inputs of the phase have changed
             fname = self._get_cmd_phase_stamp_filename(cmd_phase_name)
             ret = not fname.exists()
             #print("_is_cmd_phase_exec_required, fname: " + str(fname) + ", res: " + str(ret))
+            if not ret:
+                stamp = self._read_cmd_phase_stamp(fname)
+                if stamp is None:
+                    # stamp from older rockbuilder version without fingerprint
+                    self._write_cmd_phase_stamp(cmd_phase_name)
+                elif stamp.get("fingerprint") != fingerprint:
+                    old_inputs = stamp.get("inputs", {})
+                    changed_list = sorted(key for key in set(inputs) | set(old_inputs)
+                                          if inputs.get(key) != old_inputs.get(key))
+                    print(cmd_phase_name + " inputs changed: " + ", ".join(changed_list))
+                    # phase and all phases after it needs to be executed again
+                    self._clean_pending_cmd_phases_stamp_filenames(cmd_phase_name,
+                                                                   True,
+                                                                   True)
+                    ret = True
         if ret:
             self._clean_pending_cmd_phases_stamp_filenames(cmd_phase_name,
                                      cmd_init_force_exec,
                                      cmd_any_force_exec)
+            self._start_compiler_cache_stats(cmd_phase_name)
+            self._start_phase_resource_usage()
+        return ret
+
+    def _get_compiler_cache_stats_log_filename(self, cmd_phase_name: str):
+        return self.app_build_dir_path / ("compiler_cache_" + cmd_phase_name + ".log")
+
+    # compiler cache stats are collected only for the phases which can compile code.
+    # (checkout phase can also run on background thread)
+    def _start_compiler_cache_stats(self, cmd_phase_name: str):
+        from lib_python.compiler_cache import get_compiler_cache
+        if cmd_phase_name in rcb_const.RCB__COMPILER_CACHE_PHASE_LIST:
+            compiler_cache = get_compiler_cache()
+            if compiler_cache and compiler_cache.is_available():
+                self.app_build_dir_path.mkdir(parents=True, exist_ok=True)
+                compiler_cache.start_phase(self._get_compiler_cache_stats_log_filename(cmd_phase_name))
+                self.compiler_cache_phase = (compiler_cache, cmd_phase_name)
+
+    def _end_compiler_cache_stats(self, cmd_phase_name: str):
+        from lib_python.compiler_cache import add_compiler_cache_stats
+        if self.compiler_cache_phase and self.compiler_cache_phase[1] == cmd_phase_name:
+            compiler_cache = self.compiler_cache_phase[0]
+            hit_cnt, miss_cnt = compiler_cache.end_phase(self._get_compiler_cache_stats_log_filename(cmd_phase_name))
+            add_compiler_cache_stats(self.app_name, cmd_phase_name, hit_cnt, miss_cnt)
+            self.compiler_cache_phase = None
+
+    def _start_phase_resource_usage(self):
+        from lib_python.build_report import RockCmdResourceUsage
+        self.phase_start_time = time.monotonic()
+        self.phase_start_trace_time = time.time()
+        self.app_repo.cmd_resource_usage = RockCmdResourceUsage()
+
+    # add the resource usage of the phase to the build report and the phase to the trace
+    def _end_phase_resource_usage(self, res: bool, cmd_phase_name: str):
+        from lib_python.trace_events import add_trace_complete_event
+        from lib_python.trace_events import TRACE_CAT_PHASE
+        from lib_python.build_report import add_build_report_record
+        if self.app_repo.cmd_resource_usage:
+            add_trace_complete_event(cmd_phase_name,
+                                     TRACE_CAT_PHASE,
+                                     self.phase_start_trace_time,
+                                     {"app": self.app_cfg_base_name, "success": bool(res)})
+            record = {"app": self.app_cfg_base_name,
+                      "phase": cmd_phase_name,
+                      "success": bool(res),
+                      "wall_time": round(time.monotonic() - self.phase_start_time, 3)}
+            record.update(self.app_repo.cmd_resource_usage.to_dict())
+            add_build_report_record(record)
+            self.app_repo.cmd_resource_usage = None
+
+    def _write_cmd_phase_stamp(self, cmd_phase_name: str):
+        # commit checked out is known only after the checkout
+        if cmd_phase_name == rcb_const.RCB__APP_CFG__KEY__CMD_CHECKOUT:
+            self.cmd_phase_fingerprint_dict.pop(cmd_phase_name, None)
+        if cmd_phase_name in self.cmd_phase_fingerprint_dict:
+            fingerprint, inputs = self.cmd_phase_fingerprint_dict[cmd_phase_name]
+        else:
+            inputs = self._get_cmd_phase_inputs(cmd_phase_name)
+            fingerprint = self._get_cmd_phase_fingerprint(inputs)
+        fname = self._get_cmd_phase_stamp_filename(cmd_phase_name)
+        with open(fname, "w") as stamp_file:
+            json.dump({"fingerprint": fingerprint, "inputs": inputs},
+                      stamp_file,
+                      indent=4,
+                      sort_keys=True)
+        ret = fname.exists()
         return ret
 
     def _set_cmd_phase_done_on_success(self, res: bool, cmd_phase_name: str):
         #print("_set_cmd_phase_done_on_success, phase: " + cmd_phase_name + ", res: " + str(res))
+        self._end_compiler_cache_stats(cmd_phase_name)
+        self._end_phase_resource_usage(res, cmd_phase_name)
         if res:
             fname = self._get_cmd_phase_stamp_filename(cmd_phase_name)
-            fname.touch()
-            ret = fname.exists()
+            res = self._write_cmd_phase_stamp(cmd_phase_name)
             if not res:
                 print("Failed to create operation success stamp file: " + str(fname))
                 sys.exit(1)
@@ -425,6 +639,198 @@ class RockProjectBuilder(configparser.ConfigParser):
         if not res:
             self.printout_error_and_terminate("undo_env_setup")
 
+    # Build cache can be used for the apps which only install the python wheel build by them.
+    def _is_build_cache_supported(self):
+        ret = False
+        if self.repo_url and self.app_version and self.CMD_INSTALL and not self.CMD_CMAKE_CONFIG:
+            install_cmd_list = list(
+                filter(None, (x.strip() for x in self.CMD_INSTALL.splitlines()))
+            )
+            ret = ((len(install_cmd_list) == 1) and
+                   install_cmd_list[0].startswith(rcb_const.RCB_CALLBACK__INSTALL_PYTHON_WHEEL))
+        return ret
+
+    def is_build_cache_used(self):
+        from lib_python.build_cache import get_build_cache
+        ret = (get_build_cache() is not None) and self._is_build_cache_supported()
+        return ret
+
+    # Inputs used to calculate the build cache key.
+    # Returns None if the source version can not be resolved.
+    def _get_build_cache_key_inputs(self):
+        import sysconfig
+        ret = None
+        version_sha = self.app_repo.get_remote_version_sha()
+        if version_sha:
+            rocm_sdk_version = ""
+            if self.use_rocm_sdk and "ROCM_HOME" in os.environ:
+                rocm_sdk_version = get_rocm_sdk_version_str(Path(os.environ["ROCM_HOME"]))
+            ret = {
+                "app": self.app_cfg_base_name,
+                "cfg": get_file_sha256(self.app_cfg_path),
+                "version_sha": version_sha,
+                "patch_set": self.app_repo.get_patch_set_hash(),
+                "gpu_targets": os.environ.get(rcb_const.RCB__ENV_VAR__AMDGPU_TARGETS),
+                "python_abi": sysconfig.get_config_var("SOABI") or sys.implementation.cache_tag,
+                "platform": sysconfig.get_platform(),
+                "rocm_sdk": rocm_sdk_version,
+            }
+        return ret
+
+    # Install the app from the build cache if the wheel build with same inputs is found.
+    # Returns True if app was installed from the build cache and the phases
+    # from checkout to install can be skipped.
+    def install_from_build_cache(self):
+        from lib_python.build_cache import get_build_cache
+        ret = False
+        self.build_cache_key = None
+        if not self.is_build_cache_used():
+            return ret
+        build_cache = get_build_cache()
+        fname = self._get_cmd_phase_stamp_filename(rcb_const.RCB__APP_CFG__KEY__CMD_INSTALL)
+        if fname.exists():
+            # app has been build earlier, phase stamps decide what needs to be done
+            return ret
+        key_inputs = self._get_build_cache_key_inputs()
+        if key_inputs is None:
+            print("Build cache not used, could not resolve the commit of version: " + str(self.app_version))
+            return ret
+        self.build_cache_key_inputs = key_inputs
+        self.build_cache_key = self._get_cmd_phase_fingerprint(key_inputs)
+        wheel_dir = self.app_build_dir_path / "build_cache"
+        if build_cache.fetch(self.build_cache_key, wheel_dir):
+            ret = self.app_repo.install_python_wheel_from_dir(wheel_dir)
+            if not ret:
+                self.printout_error_and_terminate("build cache install")
+        return ret
+
+    # store the python wheel installed by the app to build cache
+    def _store_to_build_cache(self):
+        from lib_python.build_cache import get_build_cache
+        build_cache = get_build_cache()
+        if build_cache and self.build_cache_key and self.app_repo.last_installed_wheel:
+            res = build_cache.store(self.build_cache_key,
+                                    [self.app_repo.last_installed_wheel],
+                                    self.build_cache_key_inputs)
+            if not res:
+                print("Warning, failed to store the python wheel to build cache: " + self.app_name)
+
+    # Inputs used to calculate the key of the source snapshot.
+    # Source tree after the checkout and hipify depends only from the upstream version,
+    # patches and hipify command. Returns None if the source snapshots are not used.
+    def _get_src_snapshot_key_inputs(self):
+        import sysconfig
+        from lib_python.git_mirror import get_git_mirror
+        from lib_python.build_cache import get_build_cache
+        from lib_python.src_snapshot import is_src_snapshot_cache_enabled
+        ret = None
+        if not self.repo_url or not self.app_version or not is_src_snapshot_cache_enabled():
+            return ret
+        if get_build_cache() is None:
+            return ret
+        if get_git_mirror():
+            # repositories using the mirror as a reference repository can not be restored on other hosts
+            return ret
+        version_sha = self.app_repo.get_remote_version_sha()
+        if version_sha:
+            ret = {
+                "type": rcb_const.RCB__SRC_SNAPSHOT_BASE_FILE_NAME,
+                "app": self.app_cfg_base_name,
+                "repo_url": self.repo_url,
+                "version_sha": version_sha,
+                "repo_depth": self.repo_depth,
+                "repo_tags": self.repo_tags,
+                "clone_filter": self._get_clone_filter(),
+                "sparse_checkout": self._get_sparse_checkout_path_list(),
+                "patch_set": self.app_repo.get_patch_set_hash(),
+                "hipify_cmd": self.CMD_HIPIFY,
+                "platform": sysconfig.get_platform(),
+            }
+        return ret
+
+    def _get_src_snapshot_state_filename(self):
+        return self.app_build_dir_path / rcb_const.RCB__SRC_SNAPSHOT_STATE_FILE_NAME
+
+    def _read_src_snapshot_state(self):
+        ret = None
+        try:
+            with open(self._get_src_snapshot_state_filename(), "r") as state_file:
+                ret = json.load(state_file)
+        except (OSError, ValueError):
+            ret = None
+        return ret
+
+    # State is read by the hipify phase which can be executed by other rockbuilder process
+    # (checkout done by --fetch-only or by the background prefetch)
+    def _write_src_snapshot_state(self, state: str, key: str, key_inputs: dict):
+        self.app_build_dir_path.mkdir(parents=True, exist_ok=True)
+        with open(self._get_src_snapshot_state_filename(), "w") as state_file:
+            json.dump({"state": state, "key": key, "inputs": key_inputs},
+                      state_file,
+                      indent=4,
+                      sort_keys=True)
+
+    def _remove_src_snapshot_state(self):
+        fname = self._get_src_snapshot_state_filename()
+        if fname.exists():
+            fname.unlink()
+
+    # Restore the source code from the snapshot instead of doing the checkout.
+    # Returns True if the source code was restored and the hipify can also be skipped.
+    def _restore_src_snapshot(self):
+        from lib_python.build_cache import get_build_cache
+        from lib_python.src_snapshot import extract_src_snapshot
+        import tarfile
+        ret = False
+        self._remove_src_snapshot_state()
+        if self.app_src_dir_path.exists() and any(self.app_src_dir_path.iterdir()):
+            # checkout of existing source tree does only the needed changes
+            return ret
+        key_inputs = self._get_src_snapshot_key_inputs()
+        if key_inputs is None:
+            return ret
+        key = self._get_cmd_phase_fingerprint(key_inputs)
+        snapshot_dir = self.app_build_dir_path / rcb_const.RCB__SRC_SNAPSHOT_BASE_FILE_NAME
+        if get_build_cache().fetch(key, snapshot_dir):
+            snapshot_fname_list = list(snapshot_dir.glob(rcb_const.RCB__SRC_SNAPSHOT_BASE_FILE_NAME + ".tar.*"))
+            if snapshot_fname_list:
+                try:
+                    extract_src_snapshot(snapshot_fname_list[0], self.app_src_dir_path)
+                    print("Source code restored from snapshot: " + key)
+                    ret = True
+                except (OSError, tarfile.TarError) as e:
+                    print("Warning, failed to restore the source code from snapshot: " + str(snapshot_fname_list[0]))
+                    print("    " + str(e))
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+        if ret:
+            self._write_src_snapshot_state(rcb_const.RCB__SRC_SNAPSHOT_STATE_RESTORED, key, key_inputs)
+        else:
+            # snapshot is stored after the hipify
+            self._write_src_snapshot_state(rcb_const.RCB__SRC_SNAPSHOT_STATE_PENDING, key, key_inputs)
+        return ret
+
+    # Store the patched and hipified source code to the build cache
+    def _store_src_snapshot(self, snapshot_state: dict):
+        from lib_python.build_cache import get_build_cache
+        from lib_python.src_snapshot import get_src_snapshot_file_name
+        from lib_python.src_snapshot import create_src_snapshot
+        import tarfile
+        build_cache = get_build_cache()
+        if build_cache:
+            snapshot_dir = self.app_build_dir_path / rcb_const.RCB__SRC_SNAPSHOT_BASE_FILE_NAME
+            snapshot_fname = snapshot_dir / get_src_snapshot_file_name()
+            try:
+                create_src_snapshot(self.app_src_dir_path, snapshot_fname)
+                res = build_cache.store(snapshot_state["key"],
+                                        [snapshot_fname],
+                                        snapshot_state["inputs"])
+            except (OSError, tarfile.TarError) as e:
+                print("    " + str(e))
+                res = False
+            if not res:
+                print("Warning, failed to store the source snapshot to build cache: " + self.app_name)
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+
     def init(self, cmd_init_force_exec:bool, cmd_any_force_exec:bool):
         phase_name = rcb_const.RCB__APP_CFG__KEY__CMD_INIT
         res = self._is_cmd_phase_exec_required(phase_name, cmd_init_force_exec, cmd_any_force_exec)
@@ -444,12 +850,54 @@ class RockProjectBuilder(configparser.ConfigParser):
         # and finally run other optional clean commands
         res = self.app_repo.do_clean(self.CMD_CLEAN)
 
+    # Submodule fetch job count from the PROP_FETCH_JOBS of the app or
+    # from the RCB_FETCH_JOBS environment variable. 0 = auto-tuned job count.
+    def _get_fetch_job_cnt(self):
+        ret = 0
+        value = self._get_app_info_config_value(rcb_const.RCB__APP_CFG__KEY__PROP_FETCH_JOBS)
+        if not value:
+            value = os.environ.get(rcb_const.RCB__ENV_VAR__FETCH_JOBS)
+        if value and value.strip().lower() != rcb_const.RCB__FETCH_JOBS_AUTO:
+            try:
+                ret = max(1, int(value))
+            except ValueError:
+                print("Error, invalid fetch job count: " + value + ", expected a number or " + rcb_const.RCB__FETCH_JOBS_AUTO)
+                sys.exit(1)
+        return ret
+
+    # Partial clone filter from the PROP_CLONE_FILTER of the app or None
+    def _get_clone_filter(self):
+        ret = self._get_app_info_config_value(rcb_const.RCB__APP_CFG__KEY__PROP_CLONE_FILTER)
+        if ret:
+            ret = ret.strip()
+        if not ret or ret.lower() == rcb_const.RCB__CLONE_FILTER_NONE:
+            ret = None
+        return ret
+
+    # Sparse checkout directories from the PROP_SPARSE_CHECKOUT of the app.
+    # Empty list if the whole repository is checked out.
+    def _get_sparse_checkout_path_list(self):
+        ret = []
+        value = self._get_app_info_config_value(rcb_const.RCB__APP_CFG__KEY__PROP_SPARSE_CHECKOUT)
+        if value:
+            for cur_path in value.split():
+                cur_path = cur_path.strip("/")
+                if cur_path:
+                    ret.append(cur_path)
+        return ret
+
     def checkout(self, cmd_init_force_exec:bool, cmd_any_force_exec:bool):
         if self.repo_url:
             phase_name = rcb_const.RCB__APP_CFG__KEY__CMD_CHECKOUT
             res = self._is_cmd_phase_exec_required(phase_name, cmd_init_force_exec, cmd_any_force_exec)
             if res:
-                res = self.app_repo.do_checkout(repo_fetch_depth=self.repo_depth, repo_fetch_tags=self.repo_tags)
+                res = self._restore_src_snapshot()
+                if not res:
+                    res = self.app_repo.do_checkout(repo_fetch_depth=self.repo_depth,
+                                                    repo_fetch_tags=self.repo_tags,
+                                                    repo_fetch_job_cnt=self._get_fetch_job_cnt(),
+                                                    repo_clone_filter=self._get_clone_filter(),
+                                                    repo_sparse_path_list=self._get_sparse_checkout_path_list())
                 self._set_cmd_phase_done_on_success(res, phase_name)
 
     def hipify(self, cmd_init_force_exec:bool, cmd_any_force_exec:bool):
@@ -457,7 +905,16 @@ class RockProjectBuilder(configparser.ConfigParser):
             phase_name = rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY
             res = self._is_cmd_phase_exec_required(phase_name, cmd_init_force_exec, cmd_any_force_exec)
             if res:
-                res = self.app_repo.do_hipify(self.CMD_HIPIFY)
+                snapshot_state = self._read_src_snapshot_state()
+                if snapshot_state and snapshot_state.get("state") == rcb_const.RCB__SRC_SNAPSHOT_STATE_RESTORED:
+                    # source code restored from snapshot has been hipified already
+                    print("Hipify skipped, source code was restored from snapshot")
+                    res = True
+                else:
+                    res = self.app_repo.do_hipify(self.CMD_HIPIFY)
+                    if res and snapshot_state and snapshot_state.get("state") == rcb_const.RCB__SRC_SNAPSHOT_STATE_PENDING:
+                        self._store_src_snapshot(snapshot_state)
+                self._remove_src_snapshot_state()
                 self._set_cmd_phase_done_on_success(res, phase_name)
 
     def pre_config(self, cmd_init_force_exec:bool, cmd_any_force_exec:bool):
@@ -520,6 +977,8 @@ class RockProjectBuilder(configparser.ConfigParser):
         res = self._is_cmd_phase_exec_required(phase_name, cmd_init_force_exec, cmd_any_force_exec)
         if res:
             res = self.app_repo.do_install(self.CMD_INSTALL)
+            if res:
+                self._store_to_build_cache()
             self._set_cmd_phase_done_on_success(res, phase_name)
 
 
@@ -546,7 +1005,8 @@ class RockExternalProjectListManager(configparser.ConfigParser):
             if config_info.is_app_config():
                 self.prj_list = [config_info.cfg_path]
             elif config_info.is_app_list_config():
-                self.read(config_info.cfg_path)
+                # app list file has already been parsed to the config index by the config reader
+                self.read_dict(config_info.cfg_index_entry["sections"])
                 value = self.get(rcb_const.RCB__APPS_CFG__SECTION_APPS,
                                  rcb_const.RCB__APPS_CFG__KEY__APP_LIST)
                 # convert to list of project string names
@@ -557,6 +1017,15 @@ class RockExternalProjectListManager(configparser.ConfigParser):
     def get_external_app_list(self):
         return self.prj_list
 
+    # dependencies declared in the dependencies section of app list file
+    def get_declared_app_dependencies(self):
+        ret = {}
+        if self.has_section(rcb_const.RCB__APPS_CFG__SECTION_DEPENDENCIES):
+            for app_name, value in self.items(rcb_const.RCB__APPS_CFG__SECTION_DEPENDENCIES):
+                if value:
+                    ret[app_name] = value.split()
+        return ret
+
     def get_rock_app_builder(
         self,
         app_src_dir: Path,
@@ -0,0 +1,167 @@
+import atexit
+import configparser
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+
+
+# Compiled index of the app and app list config files.
+#
+# Config files are parsed once and the parsed sections are saved together
+# with the app commands and environment variables resolved for linux and windows
+# to the index file in the build directory. Index entry is used as long as the
+# modification time and the size of the config file are unchanged. If they have
+# changed, the sha256 of the file content decides whether the file is parsed again.
+
+INDEX_OS_NAME_LINUX = "linux"
+INDEX_OS_NAME_WINDOWS = "windows"
+
+# files modified less than this before they were indexed are verified with the sha256,
+# because their later changes may not be visible in the modification time
+_RACY_MTIME_NS = 2 * 1000 * 1000 * 1000
+
+
+def get_index_os_name(is_posix: bool):
+    if is_posix:
+        ret = INDEX_OS_NAME_LINUX
+    else:
+        ret = INDEX_OS_NAME_WINDOWS
+    return ret
+
+
+def _get_app_info_value(cfg_parser, config_key):
+    ret = None
+    try:
+        if cfg_parser.has_option(rcb_const.RCB__APP_CFG__SECTION_APP_INFO, config_key):
+            ret = cfg_parser.get(rcb_const.RCB__APP_CFG__SECTION_APP_INFO, config_key)
+    except configparser.Error:
+        # values which can not be interpolated are handled like missing values
+        pass
+    return ret
+
+
+def _get_value_line_list(value):
+    ret = []
+    if value:
+        ret = list(filter(None, (x.strip() for x in value.splitlines())))
+    return ret
+
+
+# Commands and environment variables of the app for the operating system.
+# Os specific CMD_XXX_LINUX and CMD_XXX_WINDOWS commands override the generic CMD_XXX
+# and the os specific ENV_VAR_LINUX and ENV_VAR_WINDOWS are appended to the ENV_VAR.
+def _resolve_app_info(cfg_parser, is_posix: bool):
+    ret = {"cmd": {}, "env_var_list": []}
+    if is_posix:
+        cmd_os_ext = rcb_const.RCB__APP_CFG__CMD_PHASE_EXTENSION_LINUX
+        env_var_os_key = rcb_const.RCB__APP_CFG__KEY__ENV_VAR_LINUX
+    else:
+        cmd_os_ext = rcb_const.RCB__APP_CFG__CMD_PHASE_EXTENSION_WINDOWS
+        env_var_os_key = rcb_const.RCB__APP_CFG__KEY__ENV_VAR_WINDOWS
+    for cmd_key in rcb_const.RCB__APP_CFG__CMD_KEY_LIST:
+        if cfg_parser.has_option(rcb_const.RCB__APP_CFG__SECTION_APP_INFO, cmd_key + cmd_os_ext):
+            ret["cmd"][cmd_key] = _get_app_info_value(cfg_parser, cmd_key + cmd_os_ext)
+        else:
+            ret["cmd"][cmd_key] = _get_app_info_value(cfg_parser, cmd_key)
+    ret["env_var_list"].extend(_get_value_line_list(_get_app_info_value(cfg_parser, rcb_const.RCB__APP_CFG__KEY__ENV_VAR)))
+    ret["env_var_list"].extend(_get_value_line_list(_get_app_info_value(cfg_parser, env_var_os_key)))
+    return ret
+
+
+# Parse the config file content to index entry.
+# Raises configparser.Error if the file can not be parsed.
+def _compile_index_entry(cfg_path: Path, cfg_content: str):
+    cfg_parser = configparser.ConfigParser(allow_no_value=True)
+    cfg_parser.read_string(cfg_content, source=cfg_path.as_posix())
+    ret = {"sections": {}, "resolved": None}
+    for section in cfg_parser.sections():
+        # raw values, interpolation is done when the values are read from the config parser
+        ret["sections"][section] = dict(cfg_parser.items(section, raw=True))
+    if cfg_parser.has_section(rcb_const.RCB__APP_CFG__SECTION_APP_INFO):
+        ret["resolved"] = {
+            INDEX_OS_NAME_LINUX: _resolve_app_info(cfg_parser, True),
+            INDEX_OS_NAME_WINDOWS: _resolve_app_info(cfg_parser, False),
+        }
+    return ret
+
+
+class RockAppCfgIndex:
+    def __init__(self, index_fname: Path):
+        self.index_fname = Path(index_fname)
+        self.entry_dict = {}
+        self.is_changed = False
+        try:
+            with open(self.index_fname, "r") as index_file:
+                index_data = json.load(index_file)
+            if index_data.get("version") == rcb_const.RCB__APP_CFG_INDEX_FORMAT_VERSION:
+                self.entry_dict = index_data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            # index is created again if it does not exist or can not be read
+            pass
+
+    # Returns the index entry of the config file.
+    # Raises OSError if the file can not be read and configparser.Error if it can not be parsed.
+    def get_entry(self, cfg_path: Path):
+        cfg_path = Path(cfg_path)
+        entry_key = cfg_path.resolve().as_posix()
+        cfg_stat = os.stat(cfg_path)
+        ret = self.entry_dict.get(entry_key)
+        if (ret and
+            ret["mtime_ns"] == cfg_stat.st_mtime_ns and
+            ret["size"] == cfg_stat.st_size and
+            ret["indexed_ns"] - cfg_stat.st_mtime_ns > _RACY_MTIME_NS):
+            return ret
+        with open(cfg_path, "rb") as cfg_file:
+            cfg_content = cfg_file.read()
+        content_sha256 = hashlib.sha256(cfg_content).hexdigest()
+        if not ret or ret["sha256"] != content_sha256:
+            ret = _compile_index_entry(cfg_path, cfg_content.decode("utf-8"))
+            ret["sha256"] = content_sha256
+        ret["mtime_ns"] = cfg_stat.st_mtime_ns
+        ret["size"] = cfg_stat.st_size
+        ret["indexed_ns"] = time.time_ns()
+        self.entry_dict[entry_key] = ret
+        self.is_changed = True
+        return ret
+
+    # Save the index if it has changed. Index is saved also at exit.
+    def save(self):
+        if not self.is_changed:
+            return
+        try:
+            self.index_fname.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_fname = tempfile.mkstemp(prefix=self.index_fname.name + ".",
+                                             dir=self.index_fname.parent)
+            with os.fdopen(fd, "w") as index_file:
+                json.dump({"version": rcb_const.RCB__APP_CFG_INDEX_FORMAT_VERSION,
+                           "entries": self.entry_dict},
+                          index_file)
+            # parallel app builds may save the index at the same time
+            os.replace(tmp_fname, self.index_fname)
+            self.is_changed = False
+        except OSError as e:
+            print("Warning, failed to save the app config index: " + str(e))
+
+
+_app_cfg_index = None
+
+
+def get_app_cfg_index():
+    global _app_cfg_index
+
+    if _app_cfg_index is None:
+        _app_cfg_index = RockAppCfgIndex(rcb_const.RCB__APP_CFG_INDEX_FILE_NAME)
+        atexit.register(_app_cfg_index.save)
+    return _app_cfg_index
+
+
+# Read the sections of the config file from the index to the config parser.
+# Returns the index entry of the config file.
+def read_app_cfg(cfg_parser, cfg_path: Path):
+    ret = get_app_cfg_index().get_entry(cfg_path)
+    cfg_parser.read_dict(ret["sections"])
+    return ret
@@ -0,0 +1,117 @@
+import concurrent.futures
+import threading
+import time
+from pathlib import Path
+
+
+# Fetches and patches the source code of the apps on background threads.
+#
+# In the pipelined mode the sources of the next apps in the list are
+# fetched while the current app is build, so that the network time
+# and the build time overlap. In the fetch only mode the sources of
+# all apps are fetched concurrently.
+#
+# Only the checkout phase is executed on the background.
+# Checkout phase stamp file is written on success, so the checkout phase
+# is skipped when the app is build. If the background fetch fails,
+# the checkout is done again normally when the app build is started.
+#
+# Each app is fetched in its own process started by the launch_app_fetch_func
+# because the app builds done meanwhile modify the process environment variables.
+# launch_app_fetch_func(app_index, log_file) needs to return subprocess.Popen object
+# whose output is written to the log file. If launch_app_fetch_func is None,
+# the apps are fetched on the threads of the current process.
+#
+# prj_builder_list can contain None items for the apps which are
+# not fetched on background.
+class RockAppSourcePrefetcher:
+    def __init__(self,
+                 prj_builder_list: list,
+                 prefetch_app_cnt: int,
+                 cmd_init_force_exec: bool,
+                 cmd_any_force_exec: bool,
+                 launch_app_fetch_func=None):
+        self.prj_builder_list = prj_builder_list
+        self.prefetch_app_cnt = max(1, prefetch_app_cnt)
+        self.cmd_init_force_exec = cmd_init_force_exec
+        self.cmd_any_force_exec = cmd_any_force_exec
+        self.launch_app_fetch_func = launch_app_fetch_func
+        self.future_dict = {}
+        self._print_lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.prefetch_app_cnt,
+            thread_name_prefix="rcb_prefetch")
+
+    def _fetch_app_in_child_process(self, app_index: int, log_fname: Path):
+        ret = False
+        with open(log_fname, "w") as log_file:
+            proc = self.launch_app_fetch_func(app_index, log_file)
+            ret = proc.wait() == 0
+        return ret
+
+    def _fetch_app_in_current_process(self, prj_builder):
+        ret = False
+        try:
+            prj_builder.checkout(self.cmd_init_force_exec, self.cmd_any_force_exec)
+            ret = True
+        except (Exception, SystemExit) as e:
+            print("Error, checkout failed: " + str(e))
+        return ret
+
+    def _fetch_app(self, app_index: int):
+        ret = False
+        prj_builder = self.prj_builder_list[app_index]
+        start_time = time.monotonic()
+        log_fname = None
+        with self._print_lock:
+            print("Fetching app sources on background: " + prj_builder.app_cfg_base_name)
+            if self.launch_app_fetch_func:
+                prj_builder.app_build_dir_path.mkdir(parents=True, exist_ok=True)
+                log_fname = prj_builder.app_build_dir_path / "checkout_prefetch.log"
+                print("    log: " + log_fname.as_posix())
+        if log_fname:
+            ret = self._fetch_app_in_child_process(app_index, log_fname)
+        else:
+            ret = self._fetch_app_in_current_process(prj_builder)
+        elapsed = time.monotonic() - start_time
+        with self._print_lock:
+            if ret:
+                print("App sources fetched: " + prj_builder.app_cfg_base_name +
+                      " (" + str(round(elapsed, 1)) + " sec)")
+            else:
+                print("Failed to fetch app sources on background: " + prj_builder.app_cfg_base_name)
+                if log_fname:
+                    print("    log: " + log_fname.as_posix())
+        return ret
+
+    # start fetching the sources of apps app_index ... app_index + prefetch_app_cnt - 1
+    def start(self, app_index: int):
+        last_index = min(app_index + self.prefetch_app_cnt, len(self.prj_builder_list))
+        for ii in range(app_index, last_index):
+            prj_builder = self.prj_builder_list[ii]
+            if prj_builder and ii not in self.future_dict:
+                self.future_dict[ii] = self._executor.submit(self._fetch_app, ii)
+
+    # wait until the background fetch of the app has finished
+    # Returns True if the sources were fetched ok or if the app is not fetched on background.
+    def wait(self, app_index: int):
+        ret = True
+        future = self.future_dict.get(app_index)
+        if future:
+            ret = future.result()
+        return ret
+
+    # fetch sources of all apps and wait until they are done
+    def run_all(self):
+        ret = True
+        for ii, prj_builder in enumerate(self.prj_builder_list):
+            if prj_builder and ii not in self.future_dict:
+                self.future_dict[ii] = self._executor.submit(self._fetch_app, ii)
+        for ii in range(len(self.prj_builder_list)):
+            if not self.wait(ii):
+                ret = False
+        self.shutdown()
+        return ret
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,195 @@
+import os
+import queue
+import sys
+import threading
+import time
+
+
+# Dependency graph between the apps listed in the app list file.
+#
+# Dependencies can be declared either in the app list file:
+#
+#     [dependencies]
+#     pytorch_vision_25 = pytorch_29_amd
+#
+# or in the app config file:
+#
+#     [app_info]
+#     DEPENDS = torch
+#
+# Dependency names can refer either to the app list item, to the app cfg
+# base name or to the APP_NAME of the app. Dependencies to apps that are
+# not in the list are ignored because they are expected to be already installed.
+#
+# If no dependencies are declared at all for the apps in the list,
+# each app is assumed to depend from the app listed before it,
+# which matches the sequential build order.
+class RockAppDependencyGraph:
+    def __init__(self,
+                 app_list: list[str],
+                 declared_deps: dict[str, list[str]],
+                 app_name_dict: dict[str, str]):
+        self.app_list = list(app_list)
+        self.deps = {}
+        self.users = {}
+        for app in self.app_list:
+            self.deps[app] = []
+            self.users[app] = []
+        # map app list items, cfg base names and APP_NAMEs to app list items
+        alias_dict = {}
+        for app in self.app_list:
+            alias_dict.setdefault(app.lower(), []).append(app)
+            cfg_base_name = os.path.splitext(os.path.basename(app))[0]
+            if cfg_base_name.lower() != app.lower():
+                alias_dict.setdefault(cfg_base_name.lower(), []).append(app)
+        for app, app_name in app_name_dict.items():
+            if app_name and (app_name.lower() != app.lower()):
+                alias_dict.setdefault(app_name.lower(), []).append(app)
+        self.is_declared = False
+        for app in self.app_list:
+            dep_name_list = declared_deps.get(app, [])
+            if dep_name_list:
+                self.is_declared = True
+            for dep_name in dep_name_list:
+                dep_app_list = alias_dict.get(dep_name.lower())
+                if not dep_app_list:
+                    print(app + ": dependency " + dep_name + " not in app list, expecting it to be installed already")
+                    continue
+                for dep_app in dep_app_list:
+                    if dep_app != app and dep_app not in self.deps[app]:
+                        self.deps[app].append(dep_app)
+        if not self.is_declared:
+            for ii in range(1, len(self.app_list)):
+                self.deps[self.app_list[ii]].append(self.app_list[ii - 1])
+        for app in self.app_list:
+            for dep_app in self.deps[app]:
+                self.users[dep_app].append(app)
+        cycle = self._find_cycle()
+        if cycle:
+            raise ValueError("Dependency cycle between apps: " + " -> ".join(cycle))
+
+    def _find_cycle(self):
+        ret = None
+        # 0 = not visited, 1 = in progress, 2 = done
+        state = dict.fromkeys(self.app_list, 0)
+        path = []
+
+        def visit(app):
+            state[app] = 1
+            path.append(app)
+            for dep_app in self.deps[app]:
+                if state[dep_app] == 1:
+                    return path[path.index(dep_app):] + [dep_app]
+                if state[dep_app] == 0:
+                    res = visit(dep_app)
+                    if res:
+                        return res
+            path.pop()
+            state[app] = 2
+            return None
+
+        for app in self.app_list:
+            if state[app] == 0:
+                ret = visit(app)
+                if ret:
+                    break
+        return ret
+
+    def get_app_list(self):
+        return self.app_list
+
+    def get_dependencies(self, app: str):
+        return self.deps[app]
+
+    def get_users(self, app: str):
+        return self.users[app]
+
+    def printout(self):
+        print("App dependencies:")
+        for app in self.app_list:
+            if self.deps[app]:
+                print("    " + app + ": " + " ".join(self.deps[app]))
+            else:
+                print("    " + app + ": -")
+
+
+# Runs the app builds in dependency order so that up to max_parallel_apps
+# independent apps are build at the same time.
+#
+# Each app is build in its own process started by the launch_app_func
+# because the app builds modify the process environment variables.
+# launch_app_func(app) needs to return subprocess.Popen object whose
+# stdout is a text pipe.
+class RockAppScheduler:
+    def __init__(self,
+                 dep_graph: RockAppDependencyGraph,
+                 max_parallel_apps: int,
+                 launch_app_func):
+        self.dep_graph = dep_graph
+        self.max_parallel_apps = max(1, max_parallel_apps)
+        self.launch_app_func = launch_app_func
+        self._print_lock = threading.Lock()
+        self._done_queue = queue.Queue()
+        self.failed_app_list = []
+
+    def _printout_app_output(self, app, proc):
+        for line in proc.stdout:
+            with self._print_lock:
+                sys.stdout.write("[" + app + "] " + line)
+                sys.stdout.flush()
+        proc.wait()
+        self._done_queue.put((app, proc.returncode))
+
+    def _get_ready_apps(self, pending_app_list, done_app_set):
+        ret = []
+        for app in pending_app_list:
+            if all(dep_app in done_app_set for dep_app in self.dep_graph.get_dependencies(app)):
+                ret.append(app)
+        return ret
+
+    def run(self):
+        pending_app_list = list(self.dep_graph.get_app_list())
+        done_app_set = set()
+        running_dict = {}
+        start_time = time.monotonic()
+        while pending_app_list or running_dict:
+            if not self.failed_app_list:
+                for app in self._get_ready_apps(pending_app_list, done_app_set):
+                    if len(running_dict) >= self.max_parallel_apps:
+                        break
+                    pending_app_list.remove(app)
+                    with self._print_lock:
+                        print("Starting app build: " + app)
+                    proc = self.launch_app_func(app)
+                    thread = threading.Thread(target=self._printout_app_output,
+                                              args=(app, proc),
+                                              daemon=True)
+                    thread.start()
+                    running_dict[app] = (thread, time.monotonic())
+            elif not running_dict:
+                # do not start new builds after failure
+                break
+            if not running_dict:
+                # should not happen as the graph has no cycles
+                print("Error, no buildable apps left: " + " ".join(pending_app_list))
+                self.failed_app_list.extend(pending_app_list)
+                break
+            app, returncode = self._done_queue.get()
+            thread, app_start_time = running_dict.pop(app)
+            thread.join()
+            elapsed = time.monotonic() - app_start_time
+            with self._print_lock:
+                if returncode == 0:
+                    print("App build done: " + app + " (" + str(round(elapsed, 1)) + " sec)")
+                else:
+                    print("App build failed: " + app + ", exit code: " + str(returncode))
+            if returncode == 0:
+                done_app_set.add(app)
+            else:
+                self.failed_app_list.append(app)
+        elapsed = time.monotonic() - start_time
+        print("App builds finished in " + str(round(elapsed, 1)) + " sec")
+        if pending_app_list:
+            print("Apps not build: " + " ".join(pending_app_list))
+        ret = not self.failed_app_list and not pending_app_list
+        return ret
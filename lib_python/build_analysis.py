@@ -0,0 +1,201 @@
+import json
+import os
+from pathlib import Path
+from lib_python.app_scheduler import RockAppDependencyGraph
+
+
+# Build time analysis of the app list.
+#
+# Durations of the app build phases are read from the build reports of the earlier
+# rockbuilder runs. Latest successful duration of each phase is used, so the apps
+# build phase by phase on different runs have also complete history.
+#
+# Critical path and the slack of each app are calculated from the dependency
+# graph of the app list. App builds are simulated with the same scheduling
+# order than the RockAppScheduler uses for different --max-parallel-apps and
+# --jobs values. Parallelism of each phase is estimated from its cpu time divided
+# by its wall time and when the phases of the parallel app builds would need more
+# jobs than the --jobs allows, the phases are slowed down in proportion.
+
+
+# Returns dictionary from app cfg base name to the list of (phase name, wall time, cpu time)
+# and the number of build reports read
+def read_app_phase_durations(report_dir: Path):
+    app_phase_dict = {}
+    report_cnt = 0
+    # report names start with the date and time of the run, so latest reports are read last
+    for report_fname in sorted(report_dir.glob("build_report_*.json")):
+        try:
+            with open(report_fname, "r") as report_file:
+                report = json.load(report_file)
+        except (OSError, ValueError):
+            print("Warning, could not read build report: " + report_fname.as_posix())
+            continue
+        report_cnt = report_cnt + 1
+        for app_name, app_report in report.get("apps", {}).items():
+            phase_dict = app_phase_dict.setdefault(app_name, {})
+            for phase_name, phase_report in app_report.get("phases", {}).items():
+                if phase_report.get("success"):
+                    phase_dict[phase_name] = (float(phase_report["wall_time"]),
+                                              float(phase_report["user_cpu_time"] + phase_report["sys_cpu_time"]))
+    ret = {}
+    for app_name, phase_dict in app_phase_dict.items():
+        ret[app_name] = [(phase_name, value[0], value[1]) for phase_name, value in phase_dict.items()]
+    return ret, report_cnt
+
+
+# Phases of the app as a list of [remaining wall time, parallelism]
+def _get_app_phase_profile(phase_list: list):
+    ret = []
+    for phase_name, wall_time, cpu_time in phase_list:
+        if wall_time > 0:
+            # each running app holds at least one job like with the job server
+            ret.append([wall_time, max(1.0, cpu_time / wall_time)])
+    return ret
+
+
+# Returns the simulated build time of the app list.
+# max_parallel_apps and job_cnt set to None mean that the parallelism is not limited.
+def simulate_app_build_schedule(dep_graph: RockAppDependencyGraph,
+                                app_phase_dict: dict,
+                                max_parallel_apps,
+                                job_cnt):
+    pending_app_list = list(dep_graph.get_app_list())
+    done_app_set = set()
+    running_dict = {}
+    ret = 0.0
+    while pending_app_list or running_dict:
+        # ready apps are started in the app list order
+        for app in list(pending_app_list):
+            if max_parallel_apps and len(running_dict) >= max_parallel_apps:
+                break
+            if all(dep_app in done_app_set for dep_app in dep_graph.get_dependencies(app)):
+                pending_app_list.remove(app)
+                running_dict[app] = _get_app_phase_profile(app_phase_dict.get(app, []))
+        for app in [app for app, phase_list in running_dict.items() if not phase_list]:
+            del running_dict[app]
+            done_app_set.add(app)
+        if not running_dict:
+            continue
+        job_demand = sum(phase_list[0][1] for phase_list in running_dict.values())
+        rate = 1.0
+        if job_cnt and job_demand > job_cnt:
+            rate = job_cnt / job_demand
+        elapsed = min(phase_list[0][0] for phase_list in running_dict.values()) / rate
+        ret = ret + elapsed
+        for phase_list in running_dict.values():
+            phase_list[0][0] = phase_list[0][0] - elapsed * rate
+            if phase_list[0][0] <= 1e-9:
+                phase_list.pop(0)
+    return ret
+
+
+# Returns dictionary from app to (earliest start, earliest end, slack) and the critical path
+def get_app_critical_path(dep_graph: RockAppDependencyGraph, app_duration_dict: dict):
+    end_dict = {}
+    tail_dict = {}
+
+    def get_end_time(app):
+        if app not in end_dict:
+            dep_end_list = [get_end_time(dep_app) for dep_app in dep_graph.get_dependencies(app)]
+            end_dict[app] = max(dep_end_list, default=0.0) + app_duration_dict[app]
+        return end_dict[app]
+
+    # time from the start of the app build to the end of the longest chain of apps depending from it
+    def get_tail_time(app):
+        if app not in tail_dict:
+            user_tail_list = [get_tail_time(user_app) for user_app in dep_graph.get_users(app)]
+            tail_dict[app] = max(user_tail_list, default=0.0) + app_duration_dict[app]
+        return tail_dict[app]
+
+    app_list = dep_graph.get_app_list()
+    critical_path_time = max((get_end_time(app) for app in app_list), default=0.0)
+    app_schedule_dict = {}
+    for app in app_list:
+        start_time = get_end_time(app) - app_duration_dict[app]
+        app_schedule_dict[app] = (start_time,
+                                  get_end_time(app),
+                                  critical_path_time - start_time - get_tail_time(app))
+    critical_path = []
+    app = None
+    if app_list:
+        app = max(app_list, key=get_end_time)
+    while app is not None:
+        critical_path.insert(0, app)
+        dep_app_list = dep_graph.get_dependencies(app)
+        app = None
+        if dep_app_list:
+            app = max(dep_app_list, key=get_end_time)
+    return app_schedule_dict, critical_path
+
+
+def _get_power_of_two_list(max_value: int):
+    ret = []
+    value = 1
+    while value < max_value:
+        ret.append(value)
+        value = value * 2
+    ret.append(max_value)
+    return ret
+
+
+def printout_build_analysis(dep_graph: RockAppDependencyGraph,
+                            app_phase_dict: dict,
+                            report_cnt: int,
+                            report_dir: Path,
+                            max_parallel_apps: int,
+                            job_cnt):
+    app_list = dep_graph.get_app_list()
+    app_duration_dict = {}
+    no_history_app_list = []
+    for app in app_list:
+        if app in app_phase_dict:
+            app_duration_dict[app] = sum(phase[1] for phase in app_phase_dict[app])
+        else:
+            app_duration_dict[app] = 0.0
+            no_history_app_list.append(app)
+    app_schedule_dict, critical_path = get_app_critical_path(dep_graph, app_duration_dict)
+    total_time = sum(app_duration_dict.values())
+    critical_path_time = sum(app_duration_dict[app] for app in critical_path)
+
+    print("Build time analysis from " + str(report_cnt) + " build reports in " + report_dir.as_posix())
+    print("    " + "app".ljust(30) + "build s".rjust(10) + "start s".rjust(10) + "end s".rjust(10) + "slack s".rjust(10))
+    for app in app_list:
+        start_time, end_time, slack = app_schedule_dict[app]
+        line = ("    " + app.ljust(30) +
+                str(round(app_duration_dict[app], 1)).rjust(10) +
+                str(round(start_time, 1)).rjust(10) +
+                str(round(end_time, 1)).rjust(10) +
+                str(round(slack, 1)).rjust(10))
+        if app in critical_path:
+            line = line + "  critical"
+        print(line)
+    if no_history_app_list:
+        print("Apps without build history, 0 sec used: " + " ".join(no_history_app_list))
+    print("Total build time of the apps: " + str(round(total_time, 1)) + " sec")
+    print("Critical path: " + " -> ".join(critical_path) + " (" + str(round(critical_path_time, 1)) + " sec)")
+    if critical_path_time > 0:
+        print("Maximum speedup from parallel app builds: " + str(round(total_time / critical_path_time, 2)) + "x")
+
+    # simulated build times with different parallel app and job counts
+    parallel_app_cnt_list = _get_power_of_two_list(max(1, len(app_list)))
+    if max_parallel_apps not in parallel_app_cnt_list and max_parallel_apps < len(app_list):
+        parallel_app_cnt_list = sorted(parallel_app_cnt_list + [max_parallel_apps])
+    job_cnt_list = _get_power_of_two_list(os.cpu_count() or 1)
+    if job_cnt and job_cnt not in job_cnt_list:
+        job_cnt_list = sorted(job_cnt_list + [job_cnt])
+    print("")
+    print("Simulated build time in sec and speedup, --max-parallel-apps in columns and --jobs in rows:")
+    print("    " + "jobs".ljust(10) + "".join(("apps " + str(app_cnt)).rjust(18) for app_cnt in parallel_app_cnt_list))
+    for cur_job_cnt in [None] + job_cnt_list:
+        if cur_job_cnt:
+            line = "    " + str(cur_job_cnt).ljust(10)
+        else:
+            line = "    " + "unlimited".ljust(10)
+        for app_cnt in parallel_app_cnt_list:
+            build_time = simulate_app_build_schedule(dep_graph, app_phase_dict, app_cnt, cur_job_cnt)
+            cell = str(round(build_time, 1))
+            if build_time > 0:
+                cell = cell + " (" + str(round(total_time / build_time, 2)) + "x)"
+            line = line + cell.rjust(18)
+        print(line)
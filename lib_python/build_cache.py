@@ -0,0 +1,417 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import urllib.parse
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+from lib_python.utils import get_file_sha256
+
+
+# Build output cache for the python wheels build by the apps.
+#
+# Cache entries are identified by a key calculated from the inputs
+# of the app build. (app config, source version, patches, target GPUs, etc)
+# Each cache entry contains the wheel files and metadata.json file
+# that has the sha256 hash of each wheel file.
+#
+# Cache backends implement following methods:
+#   - fetch_entry(key, target_dir) -> metadata dict or None
+#   - store_entry(key, file_list, metadata) -> bool
+#
+# All backends use the same layout for the entries, so the directory of
+# the local backend can also be served to other hosts by the build cache
+# server in rockbuilder_cache_server.py at the root of the repository.
+
+
+# Cache backend storing the entries to local directory:
+#     <cache_dir>/<key[0:2]>/<key>/metadata.json
+#     <cache_dir>/<key[0:2]>/<key>/<wheel_files>
+class RockLocalCacheBackend:
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def __str__(self):
+        return self.cache_dir.as_posix()
+
+    def _get_entry_dir(self, key: str):
+        return self.cache_dir / key[0:2] / key
+
+    def fetch_entry(self, key: str, target_dir: Path):
+        ret = None
+        entry_dir = self._get_entry_dir(key)
+        metadata_fname = entry_dir / rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME
+        if metadata_fname.exists():
+            try:
+                with open(metadata_fname, "r") as metadata_file:
+                    metadata = json.load(metadata_file)
+                target_dir.mkdir(parents=True, exist_ok=True)
+                ret = metadata
+                for fname, sha256 in metadata["files"].items():
+                    target_fname = target_dir / fname
+                    shutil.copy2(entry_dir / fname, target_fname)
+                    if get_file_sha256(target_fname) != sha256:
+                        print("Error, build cache file is corrupted: " + str(entry_dir / fname))
+                        ret = None
+                        break
+            except (OSError, ValueError, KeyError) as e:
+                print("Error, failed to read build cache entry: " + str(entry_dir))
+                print("    " + str(e))
+                ret = None
+        return ret
+
+    def store_entry(self, key: str, file_list: list[Path], metadata: dict):
+        ret = True
+        entry_dir = self._get_entry_dir(key)
+        if (entry_dir / rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME).exists():
+            # same entry stored already by other build
+            return ret
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        # write first to temporary directory and then rename it to make
+        # the entry visible for other builds only when it is complete
+        tmp_dir = Path(tempfile.mkdtemp(prefix=key + ".", dir=entry_dir.parent))
+        try:
+            for fname in file_list:
+                shutil.copy2(fname, tmp_dir / Path(fname).name)
+            with open(tmp_dir / rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME, "w") as metadata_file:
+                json.dump(metadata, metadata_file, indent=4, sort_keys=True)
+            os.rename(tmp_dir, entry_dir)
+        except OSError as e:
+            if not (entry_dir / rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME).exists():
+                print("Error, failed to store build cache entry: " + str(entry_dir))
+                print("    " + str(e))
+                ret = False
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        return ret
+
+
+# Cache backend using HTTP GET and PUT requests.
+# Entries use the same layout than with the local backend:
+#     <base_url>/<key[0:2]>/<key>/metadata.json
+#     <base_url>/<key[0:2]>/<key>/<wheel_files>
+#
+# Files are streamed in chunks and the files of the entry are transferred
+# in parallel. The sha256 hash of each file is sent in request header on upload
+# and verified after download. metadata.json is uploaded as a last file,
+# so other hosts see the entry only after all wheels have been uploaded.
+class RockHttpCacheBackend:
+    def __init__(self, base_url: str, read_only: bool = False):
+        # urllib.request is slow to import, so it is imported only when the http cache is used.
+        # (methods below access it as an attribute of the urllib package)
+        import urllib.error
+        import urllib.request
+        self.base_url = base_url.rstrip("/")
+        self.read_only = read_only
+        self.transfer_cnt = rcb_const.RCB__BUILD_CACHE_TRANSFER_CNT
+        self.timeout = rcb_const.RCB__BUILD_CACHE_HTTP_TIMEOUT
+        self.auth_token = os.environ.get(rcb_const.RCB__ENV_VAR__BUILD_CACHE_TOKEN)
+
+    def __str__(self):
+        return self.base_url
+
+    def _get_entry_url(self, key: str, fname: str):
+        return self.base_url + "/" + key[0:2] + "/" + key + "/" + urllib.parse.quote(fname)
+
+    def _create_request(self, url: str, method: str, data=None, headers=None):
+        ret = urllib.request.Request(url, data=data, method=method)
+        if self.auth_token:
+            ret.add_header("Authorization", "Bearer " + self.auth_token)
+        if headers:
+            for name, value in headers.items():
+                ret.add_header(name, value)
+        return ret
+
+    def _is_entry_available(self, key: str):
+        ret = False
+        req = self._create_request(self._get_entry_url(key, rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME), "HEAD")
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout):
+                ret = True
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                raise
+        return ret
+
+    # download file in chunks and calculate the sha256 hash while downloading
+    def _download_file(self, url: str, target_fname: Path, sha256: str):
+        hash_obj = hashlib.sha256()
+        req = self._create_request(url, "GET")
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            with open(target_fname, "wb") as target_file:
+                for chunk in iter(lambda: response.read(rcb_const.RCB__BUILD_CACHE_CHUNK_SIZE), b""):
+                    hash_obj.update(chunk)
+                    target_file.write(chunk)
+        if hash_obj.hexdigest() != sha256:
+            raise ValueError("sha256 mismatch: " + url)
+
+    # file object is passed as a request data, so the file is streamed
+    # to the server instead of reading it to memory
+    def _upload_file(self, url: str, fname: Path, sha256: str):
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Length": str(Path(fname).stat().st_size),
+            rcb_const.RCB__BUILD_CACHE_SHA256_HEADER: sha256,
+        }
+        with open(fname, "rb") as data_file:
+            req = self._create_request(url, "PUT", data_file, headers)
+            with urllib.request.urlopen(req, timeout=self.timeout):
+                pass
+
+    def _run_parallel(self, func, arg_list):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.transfer_cnt) as executor:
+            future_list = [executor.submit(func, *args) for args in arg_list]
+            for future in future_list:
+                # raises the exception of failed transfer
+                future.result()
+
+    def fetch_entry(self, key: str, target_dir: Path):
+        ret = None
+        url = self._get_entry_url(key, rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME)
+        try:
+            req = self._create_request(url, "GET")
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                metadata = json.load(response)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            arg_list = []
+            for fname, sha256 in metadata["files"].items():
+                arg_list.append((self._get_entry_url(key, fname), target_dir / fname, sha256))
+            self._run_parallel(self._download_file, arg_list)
+            ret = metadata
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                print("Error, failed to fetch build cache entry: " + url)
+                print("    " + str(e))
+        except (OSError, ValueError, KeyError) as e:
+            print("Error, failed to fetch build cache entry: " + url)
+            print("    " + str(e))
+        return ret
+
+    def store_entry(self, key: str, file_list: list[Path], metadata: dict):
+        ret = True
+        if self.read_only:
+            return ret
+        try:
+            if self._is_entry_available(key):
+                # same entry stored already by other build
+                return ret
+            arg_list = []
+            for fname in file_list:
+                fname = Path(fname)
+                arg_list.append((self._get_entry_url(key, fname.name), fname, metadata["files"][fname.name]))
+            self._run_parallel(self._upload_file, arg_list)
+            metadata_data = json.dumps(metadata, indent=4, sort_keys=True).encode()
+            headers = {
+                "Content-Type": "application/json",
+                rcb_const.RCB__BUILD_CACHE_SHA256_HEADER: hashlib.sha256(metadata_data).hexdigest(),
+            }
+            req = self._create_request(self._get_entry_url(key, rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME),
+                                       "PUT",
+                                       metadata_data,
+                                       headers)
+            with urllib.request.urlopen(req, timeout=self.timeout):
+                pass
+        except (OSError, ValueError, KeyError) as e:
+            print("Error, failed to store build cache entry: " + self._get_entry_url(key, ""))
+            print("    " + str(e))
+            ret = False
+        return ret
+
+
+# Cache backend for the S3 compatible object storages.
+# Uses boto3 for authenticated access. Large files are transferred with
+# parallel multipart uploads and downloads and S3 verifies the sha256
+# checksum of the uploaded files.
+# Custom S3 compatible endpoint can be specified with RCB_BUILD_CACHE_S3_ENDPOINT_URL.
+class RockS3CacheBackend:
+    def __init__(self, bucket: str, prefix: str):
+        # optional dependency, imported only when S3 cache is used
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        endpoint_url = os.environ.get(rcb_const.RCB__ENV_VAR__BUILD_CACHE_S3_ENDPOINT_URL)
+        self.s3_client = boto3.client("s3", endpoint_url=endpoint_url or None)
+        self.transfer_config = TransferConfig(multipart_threshold=rcb_const.RCB__BUILD_CACHE_MULTIPART_SIZE,
+                                              multipart_chunksize=rcb_const.RCB__BUILD_CACHE_MULTIPART_SIZE,
+                                              max_concurrency=rcb_const.RCB__BUILD_CACHE_TRANSFER_CNT)
+
+    def __str__(self):
+        return "s3://" + self.bucket + "/" + self.prefix
+
+    def _get_object_key(self, key: str, fname: str):
+        ret = key[0:2] + "/" + key + "/" + fname
+        if self.prefix:
+            ret = self.prefix + "/" + ret
+        return ret
+
+    def fetch_entry(self, key: str, target_dir: Path):
+        from botocore.exceptions import BotoCoreError, ClientError
+        ret = None
+        obj_key = self._get_object_key(key, rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME)
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=obj_key)
+            metadata = json.load(response["Body"])
+            target_dir.mkdir(parents=True, exist_ok=True)
+            ret = metadata
+            for fname, sha256 in metadata["files"].items():
+                target_fname = target_dir / fname
+                self.s3_client.download_file(self.bucket,
+                                             self._get_object_key(key, fname),
+                                             str(target_fname),
+                                             Config=self.transfer_config)
+                if get_file_sha256(target_fname) != sha256:
+                    print("Error, build cache file is corrupted: " + self._get_object_key(key, fname))
+                    ret = None
+                    break
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+                print("Error, failed to fetch build cache entry: " + obj_key)
+                print("    " + str(e))
+            ret = None
+        except (BotoCoreError, OSError, ValueError, KeyError) as e:
+            print("Error, failed to fetch build cache entry: " + obj_key)
+            print("    " + str(e))
+            ret = None
+        return ret
+
+    def store_entry(self, key: str, file_list: list[Path], metadata: dict):
+        from botocore.exceptions import BotoCoreError, ClientError
+        ret = True
+        obj_key = self._get_object_key(key, rcb_const.RCB__BUILD_CACHE_METADATA_FILE_NAME)
+        try:
+            try:
+                self.s3_client.head_object(Bucket=self.bucket, Key=obj_key)
+                # same entry stored already by other build
+                return ret
+            except ClientError:
+                pass
+            for fname in file_list:
+                fname = Path(fname)
+                self.s3_client.upload_file(str(fname),
+                                           self.bucket,
+                                           self._get_object_key(key, fname.name),
+                                           ExtraArgs={"ChecksumAlgorithm": "SHA256"},
+                                           Config=self.transfer_config)
+            self.s3_client.put_object(Bucket=self.bucket,
+                                      Key=obj_key,
+                                      Body=json.dumps(metadata, indent=4, sort_keys=True).encode(),
+                                      ContentType="application/json",
+                                      ChecksumAlgorithm="SHA256")
+        except (BotoCoreError, ClientError, OSError) as e:
+            print("Error, failed to store build cache entry: " + obj_key)
+            print("    " + str(e))
+            ret = False
+        return ret
+
+
+# Resolves the bucket used by the CI builds for the current repository
+# with the same rules that are used for the other CI artifacts.
+# Returns tuple (bucket, prefix for the external repositories)
+def _retrieve_ci_bucket_info():
+    utils_dir = (Path(__file__).resolve().parent.parent / ".github" / "utils").as_posix()
+    if utils_dir not in sys.path:
+        sys.path.append(utils_dir)
+    from github_actions_utils import retrieve_bucket_info
+    external_repo, bucket = retrieve_bucket_info()
+    return bucket, external_repo
+
+
+# Creates the cache backend for the remote cache url:
+#     http://<host>:<port>/<path>
+#     https://<host>/<path>
+#     s3://<bucket>/<prefix>
+#     s3://auto/<prefix>  (bucket resolved like for the CI artifacts)
+# Without boto3 the S3 buckets are accessed read-only over HTTPS.
+def get_build_cache_backend_for_url(url: str):
+    ret = None
+    parsed_url = urllib.parse.urlparse(url)
+    if parsed_url.scheme in ("http", "https"):
+        ret = RockHttpCacheBackend(url)
+    elif parsed_url.scheme == "s3":
+        bucket = parsed_url.netloc
+        prefix = parsed_url.path.strip("/")
+        if bucket == rcb_const.RCB__BUILD_CACHE_S3_AUTO_BUCKET:
+            bucket, external_repo = _retrieve_ci_bucket_info()
+            prefix = external_repo + prefix
+        try:
+            ret = RockS3CacheBackend(bucket, prefix)
+        except ImportError:
+            print("boto3 is not installed, using read-only access to S3 build cache")
+            ret = RockHttpCacheBackend("https://" + bucket + ".s3.amazonaws.com/" + prefix, read_only=True)
+    else:
+        print("Error, unsupported build cache url: " + url)
+        sys.exit(1)
+    return ret
+
+
+class RockBuildCache:
+    def __init__(self, backend_list: list):
+        self.backend_list = backend_list
+
+    # Fetch the wheels of the cache entry to target_dir.
+    # Returns True on cache hit.
+    def fetch(self, key: str, target_dir: Path):
+        ret = False
+        if target_dir.exists():
+            shutil.rmtree(target_dir)
+        for ii, backend in enumerate(self.backend_list):
+            metadata = backend.fetch_entry(key, target_dir)
+            if metadata:
+                print("Build cache hit: " + key + " (" + str(backend) + ")")
+                # store the entry also to faster backends which did not have it
+                file_list = [target_dir / fname for fname in metadata["files"]]
+                for prev_backend in self.backend_list[0:ii]:
+                    prev_backend.store_entry(key, file_list, metadata)
+                ret = True
+                break
+            if target_dir.exists():
+                shutil.rmtree(target_dir)
+        if not ret:
+            print("Build cache miss: " + key)
+        return ret
+
+    def store(self, key: str, file_list: list[Path], key_inputs: dict):
+        ret = True
+        metadata = {
+            "key": key,
+            "inputs": key_inputs,
+            "created": time.time(),
+            "files": {},
+        }
+        for fname in file_list:
+            metadata["files"][Path(fname).name] = get_file_sha256(fname)
+        for backend in self.backend_list:
+            res = backend.store_entry(key, file_list, metadata)
+            if res:
+                print("Stored to build cache: " + key + " (" + str(backend) + ")")
+            else:
+                ret = False
+        return ret
+
+
+# build caches created for the environment variable values
+_build_cache_dict = {}
+
+
+# Returns the build cache configured with environment variables or None
+def get_build_cache():
+    ret = None
+    cache_dir = os.environ.get(rcb_const.RCB__ENV_VAR__BUILD_CACHE_DIR)
+    cache_url = os.environ.get(rcb_const.RCB__ENV_VAR__BUILD_CACHE_URL)
+    if (cache_dir, cache_url) in _build_cache_dict:
+        return _build_cache_dict[(cache_dir, cache_url)]
+    backend_list = []
+    if cache_dir:
+        backend_list.append(RockLocalCacheBackend(Path(cache_dir)))
+    if cache_url:
+        backend_list.append(get_build_cache_backend_for_url(cache_url))
+    if backend_list:
+        ret = RockBuildCache(backend_list)
+    _build_cache_dict[(cache_dir, cache_url)] = ret
+    return ret
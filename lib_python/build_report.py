@@ -0,0 +1,167 @@
+import json
+import os
+import sys
+import time
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+
+
+# Resource usage of the app build phases.
+#
+# Commands executed by the phases, including the batch files of the multi-line
+# commands on windows, are waited with os.wait4 to get their cpu time, peak memory
+# usage and block I/O. Only the wall time is recorded if the os.wait4 is not
+# supported. At the end of each phase a record of the phase is appended to the
+# record file shared by all app builds started by the same rockbuilder run.
+# When the run ends, the records are collected to the JSON build report in
+# the build/reports directory.
+
+
+# Resource usage of the commands executed by a single phase
+class RockCmdResourceUsage:
+    def __init__(self):
+        self.cmd_cnt = 0
+        self.cmd_wall_time = 0.0
+        self.user_cpu_time = 0.0
+        self.sys_cpu_time = 0.0
+        self.max_rss_kb = 0
+        self.block_input = 0
+        self.block_output = 0
+        self.exit_status = 0
+
+    def add(self, wall_time: float, exit_status: int, rusage):
+        self.cmd_cnt = self.cmd_cnt + 1
+        self.cmd_wall_time = self.cmd_wall_time + wall_time
+        if exit_status != 0:
+            self.exit_status = exit_status
+        if rusage:
+            self.user_cpu_time = self.user_cpu_time + rusage.ru_utime
+            self.sys_cpu_time = self.sys_cpu_time + rusage.ru_stime
+            # ru_maxrss is in kilobytes on linux and in bytes on macos
+            max_rss_kb = rusage.ru_maxrss
+            if sys.platform == "darwin":
+                max_rss_kb = max_rss_kb // 1024
+            self.max_rss_kb = max(self.max_rss_kb, max_rss_kb)
+            self.block_input = self.block_input + rusage.ru_inblock
+            self.block_output = self.block_output + rusage.ru_oublock
+
+    def to_dict(self):
+        ret = {"cmd_count": self.cmd_cnt,
+               "cmd_wall_time": round(self.cmd_wall_time, 3),
+               "user_cpu_time": round(self.user_cpu_time, 3),
+               "sys_cpu_time": round(self.sys_cpu_time, 3),
+               "max_rss_kb": self.max_rss_kb,
+               "block_input": self.block_input,
+               "block_output": self.block_output,
+               "exit_status": self.exit_status}
+        return ret
+
+
+# Wait that the process started with subprocess.Popen exits.
+# Returns the exit code and the resource usage of the process and its children
+# or None as a resource usage if the os.wait4 is not supported. (windows)
+def wait_process_with_resource_usage(proc):
+    if hasattr(os, "wait4"):
+        pid, wait_status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(wait_status)
+    else:
+        proc.wait()
+        rusage = None
+    return proc.returncode, rusage
+
+
+# Append a record to the build report record file of the run.
+# Nothing is done if the build report is not used.
+def add_build_report_record(record: dict):
+    fname = os.environ.get(rcb_const.RCB__ENV_VAR__BUILD_REPORT_RECORD_FILE)
+    if fname:
+        line = json.dumps(record) + "\n"
+        # single append write, so parallel app builds do not mix the records
+        fd = os.open(fname, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+
+def _read_build_report_records(record_fname: Path):
+    ret = []
+    if record_fname.exists():
+        with open(record_fname, "r") as record_file:
+            for cur_line in record_file:
+                try:
+                    ret.append(json.loads(cur_line))
+                except ValueError:
+                    continue
+    return ret
+
+
+def _add_phase_record(phase_dict: dict, record: dict):
+    if phase_dict:
+        # phase executed more than once during the run
+        for key in ("wall_time", "cmd_count", "cmd_wall_time", "user_cpu_time", "sys_cpu_time", "block_input", "block_output"):
+            phase_dict[key] = round(phase_dict[key] + record[key], 3)
+        phase_dict["max_rss_kb"] = max(phase_dict["max_rss_kb"], record["max_rss_kb"])
+        if record["exit_status"] != 0:
+            phase_dict["exit_status"] = record["exit_status"]
+        if not record["success"]:
+            phase_dict["success"] = False
+    else:
+        phase_dict.update(record)
+
+
+# Collect the records of the run to the build report.
+# Returns None if no phases were executed.
+def write_build_report(record_fname: Path, report_fname: Path, start_time: float, argv: list):
+    ret = None
+    record_list = _read_build_report_records(record_fname)
+    if not record_list:
+        return ret
+    app_dict = {}
+    for record in record_list:
+        app_report = app_dict.setdefault(record["app"], {"success": None, "wall_time": None, "phases": {}})
+        if "phase" in record:
+            phase_record = dict(record)
+            del phase_record["app"]
+            del phase_record["phase"]
+            _add_phase_record(app_report["phases"].setdefault(record["phase"], {}), phase_record)
+            if not record["success"]:
+                app_report["success"] = False
+        else:
+            # app build done
+            app_report["wall_time"] = record["wall_time"]
+            if app_report["success"] is None:
+                app_report["success"] = record["success"]
+    for app_report in app_dict.values():
+        if app_report["success"] is None:
+            # app build did not finish
+            app_report["success"] = False
+        app_report["user_cpu_time"] = round(sum(x["user_cpu_time"] for x in app_report["phases"].values()), 3)
+        app_report["sys_cpu_time"] = round(sum(x["sys_cpu_time"] for x in app_report["phases"].values()), 3)
+    report = {"version": rcb_const.RCB__BUILD_REPORT_FORMAT_VERSION,
+              "command": argv,
+              "start_time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(start_time)),
+              "wall_time": round(time.time() - start_time, 3),
+              "apps": app_dict}
+    report_fname.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_fname, "w") as report_file:
+        json.dump(report, report_file, indent=4)
+    ret = report
+    return ret
+
+
+def printout_build_report(report: dict, report_fname: Path):
+    print("Build phase resource usage:")
+    print("    " + "app".ljust(30) + "phase".ljust(20) + "wall s".rjust(10) + "user s".rjust(10) +
+          "sys s".rjust(10) + "max rss MB".rjust(12))
+    for app_name, app_report in report["apps"].items():
+        for phase_name, phase_report in app_report["phases"].items():
+            if phase_report["cmd_count"] == 0:
+                # phase without commands
+                continue
+            print("    " + app_name.ljust(30) + phase_name.ljust(20) +
+                  str(round(phase_report["wall_time"], 1)).rjust(10) +
+                  str(round(phase_report["user_cpu_time"], 1)).rjust(10) +
+                  str(round(phase_report["sys_cpu_time"], 1)).rjust(10) +
+                  str(round(phase_report["max_rss_kb"] / 1024, 1)).rjust(12))
+    print("Build report: " + report_fname.as_posix())
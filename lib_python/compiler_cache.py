@@ -0,0 +1,157 @@
+import json
+import os
+import platform
+import shutil
+import subprocess
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+
+
+# Compiler cache (ccache or sccache) used by the app builds.
+#
+# The compiler cache is taken in use by setting environment variables
+# when the app environment is set up:
+#   - CMAKE_<LANG>_COMPILER_LAUNCHER for C, CXX and HIP. These are read by
+#     CMake 3.17 and newer also when CMake is started from the setup.py
+#   - CC and CXX set by the app cfg are replaced with small wrapper scripts
+#     which call the compiler via compiler cache. This covers setuptools
+#     builds and CMake builds where the compiler is given with CC and CXX.
+#
+# Cache hits and misses are collected for each app phase and appended to
+# the stats file shared by all app builds started by the same rockbuilder run.
+class RockCompilerCache:
+    def __init__(self, cache_type: str, cache_dir: str, max_size: str):
+        self.cache_type = cache_type
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.cache_exec = shutil.which(cache_type)
+        self.is_posix = not any(platform.win32_ver())
+        self.phase_start_stats = None
+
+    def is_available(self):
+        return self.cache_exec is not None
+
+    def _create_compiler_wrapper(self, wrapper_dir: Path, compiler: str):
+        # keep the compiler name, build tools check it to detect the compiler type
+        compiler_name = Path(compiler.split()[0]).name
+        wrapper_dir.mkdir(parents=True, exist_ok=True)
+        if self.is_posix:
+            ret = wrapper_dir / compiler_name
+            with open(ret, "w") as wrapper_file:
+                wrapper_file.write("#!/bin/sh\n")
+                wrapper_file.write('exec "' + self.cache_exec + '" ' + compiler + ' "$@"\n')
+            ret.chmod(0o755)
+        else:
+            ret = wrapper_dir / (Path(compiler_name).stem + ".bat")
+            with open(ret, "w") as wrapper_file:
+                wrapper_file.write("@echo off\n")
+                wrapper_file.write('"' + self.cache_exec + '" ' + compiler + " %*\n")
+        return ret.as_posix()
+
+    # Returns dictionary of environment variables needed to build the app with compiler cache
+    def get_env_variables(self, wrapper_dir: Path):
+        ret = {}
+        if self.cache_type == rcb_const.RCB__COMPILER_CACHE_TYPE_CCACHE:
+            ret["CCACHE_DIR"] = self.cache_dir
+            ret["CCACHE_MAXSIZE"] = self.max_size
+        else:
+            ret["SCCACHE_DIR"] = self.cache_dir
+            ret["SCCACHE_CACHE_SIZE"] = self.max_size
+        for lang, compiler_env_var in [("C", "CC"), ("CXX", "CXX")]:
+            compiler = os.environ.get(compiler_env_var)
+            if compiler and (self.cache_type not in compiler):
+                ret[compiler_env_var] = self._create_compiler_wrapper(wrapper_dir, compiler)
+            elif not compiler:
+                ret["CMAKE_" + lang + "_COMPILER_LAUNCHER"] = self.cache_exec
+        ret["CMAKE_HIP_COMPILER_LAUNCHER"] = self.cache_exec
+        return ret
+
+    def _read_sccache_stats(self):
+        ret = (0, 0)
+        try:
+            result = subprocess.run([self.cache_exec, "--show-stats", "--stats-format=json"],
+                                    capture_output=True,
+                                    text=True)
+            stats = json.loads(result.stdout)["stats"]
+            ret = (sum(stats["cache_hits"]["counts"].values()),
+                   sum(stats["cache_misses"]["counts"].values()))
+        except (OSError, ValueError, KeyError):
+            pass
+        return ret
+
+    def start_phase(self, stats_log_fname: Path):
+        if self.cache_type == rcb_const.RCB__COMPILER_CACHE_TYPE_CCACHE:
+            # ccache appends the result of each compilation to stats log file
+            if stats_log_fname.exists():
+                stats_log_fname.unlink()
+            os.environ["CCACHE_STATSLOG"] = stats_log_fname.as_posix()
+        else:
+            # sccache server is shared, so the stats of parallel app builds are combined
+            self.phase_start_stats = self._read_sccache_stats()
+
+    # Returns tuple (hit count, miss count) of the phase
+    def end_phase(self, stats_log_fname: Path):
+        hit_cnt = 0
+        miss_cnt = 0
+        if self.cache_type == rcb_const.RCB__COMPILER_CACHE_TYPE_CCACHE:
+            if "CCACHE_STATSLOG" in os.environ:
+                del os.environ["CCACHE_STATSLOG"]
+            if stats_log_fname.exists():
+                with open(stats_log_fname, "r") as stats_log_file:
+                    for cur_line in stats_log_file:
+                        cur_line = cur_line.strip()
+                        if cur_line in ("direct_cache_hit", "preprocessed_cache_hit"):
+                            hit_cnt = hit_cnt + 1
+                        elif cur_line == "cache_miss":
+                            miss_cnt = miss_cnt + 1
+        elif self.phase_start_stats:
+            end_stats = self._read_sccache_stats()
+            hit_cnt = max(0, end_stats[0] - self.phase_start_stats[0])
+            miss_cnt = max(0, end_stats[1] - self.phase_start_stats[1])
+            self.phase_start_stats = None
+        return (hit_cnt, miss_cnt)
+
+
+# Returns the compiler cache configured with environment variables or None
+def get_compiler_cache():
+    ret = None
+    cache_type = os.environ.get(rcb_const.RCB__ENV_VAR__COMPILER_CACHE)
+    if cache_type:
+        ret = RockCompilerCache(cache_type,
+                                os.environ.get(rcb_const.RCB__ENV_VAR__COMPILER_CACHE_DIR),
+                                os.environ.get(rcb_const.RCB__ENV_VAR__COMPILER_CACHE_MAX_SIZE))
+    return ret
+
+
+# Appends the compiler cache stats of the app phase to the stats file of the rockbuilder run
+def add_compiler_cache_stats(app_name: str, phase_name: str, hit_cnt: int, miss_cnt: int):
+    fname = os.environ.get(rcb_const.RCB__ENV_VAR__COMPILER_CACHE_STATS_FILE)
+    if fname and (hit_cnt or miss_cnt):
+        line = json.dumps({"app": app_name, "phase": phase_name, "hits": hit_cnt, "misses": miss_cnt}) + "\n"
+        # single append write, so parallel app builds do not mix the lines
+        fd = os.open(fname, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+
+def printout_compiler_cache_stats(stats_fname: Path):
+    stats_dict = {}
+    if stats_fname.exists():
+        with open(stats_fname, "r") as stats_file:
+            for cur_line in stats_file:
+                try:
+                    item = json.loads(cur_line)
+                except ValueError:
+                    continue
+                key = (item["app"], item["phase"])
+                hit_cnt, miss_cnt = stats_dict.get(key, (0, 0))
+                stats_dict[key] = (hit_cnt + item["hits"], miss_cnt + item["misses"])
+    if stats_dict:
+        print("Compiler cache stats:")
+        print("    " + "app".ljust(30) + "phase".ljust(20) + "hits".rjust(10) + "misses".rjust(10) + "hit rate".rjust(10))
+        for (app_name, phase_name), (hit_cnt, miss_cnt) in stats_dict.items():
+            hit_rate = str(round(100 * hit_cnt / (hit_cnt + miss_cnt))) + "%"
+            print("    " + app_name.ljust(30) + phase_name.ljust(20) + str(hit_cnt).rjust(10) +
+                  str(miss_cnt).rjust(10) + hit_rate.rjust(10))
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import re
+import subprocess
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+from lib_python.utils import RockFileLock
+
+
+# Bare git mirror repositories shared by the app checkouts.
+#
+# Each repository url (app repositories and their submodules) has its own
+# bare mirror under the mirror root directory. App checkouts borrow the objects
+# from the mirror with the git alternates mechanism, so the objects of the
+# repositories used by multiple apps or app versions are downloaded and stored only once.
+#
+# Fetched versions are stored as refs to the mirror, so that git gc
+# does not remove objects which are used by the app checkouts.
+class RockGitMirror:
+    def __init__(self, mirror_root_dir: Path):
+        self.mirror_root_dir = Path(mirror_root_dir)
+
+    def get_mirror_dir(self, repo_url: str):
+        repo_name = re.sub(r"[^A-Za-z0-9_.-]", "_", repo_url.rstrip("/").split("/")[-1])
+        if repo_name.endswith(".git"):
+            repo_name = repo_name[:-4]
+        url_hash = hashlib.sha256(repo_url.encode()).hexdigest()[0:12]
+        return self.mirror_root_dir / (repo_name + "-" + url_hash + ".git")
+
+    def get_mirror_url(self, repo_url: str):
+        # file:// protocol is needed to make the shallow fetches from local repository
+        return self.get_mirror_dir(repo_url).resolve().as_uri()
+
+    def get_mirror_ref_name(self, version: str):
+        return "refs/rcb/" + re.sub(r"[^A-Za-z0-9_.-]", "_", version)
+
+    def _init_mirror(self, exec_func, repo_url: str, mirror_dir: Path):
+        if not (mirror_dir / "HEAD").exists():
+            mirror_dir.mkdir(parents=True, exist_ok=True)
+            exec_func(["git", "init", "--bare", "--quiet"], cwd=mirror_dir)
+            exec_func(["git", "remote", "add", "origin", repo_url], cwd=mirror_dir)
+            # app checkouts fetch the commits from mirror by their sha
+            exec_func(["git", "config", "uploadpack.allowAnySHA1InWant", "true"], cwd=mirror_dir)
+            # objects are used by the app checkouts via alternates
+            exec_func(["git", "config", "gc.auto", "0"], cwd=mirror_dir)
+
+    # Returns True if the mirror has a full history.
+    # Shallow fetch would make a full mirror shallow.
+    def _is_full_mirror(self, mirror_dir: Path):
+        ret = False
+        if not (mirror_dir / "shallow").exists():
+            ref_list = subprocess.check_output(["git", "for-each-ref", "--count=1"],
+                                               cwd=mirror_dir,
+                                               text=True)
+            ret = len(ref_list.strip()) > 0
+        return ret
+
+    # Fetch to mirror with the fetch arguments given. (for example "origin tag v1.0")
+    # Concurrent updates of the same mirror by parallel app builds are serialized with the lock file.
+    def fetch(self, exec_func, repo_url: str, fetch_args: list[str]):
+        mirror_dir = self.get_mirror_dir(repo_url)
+        with RockFileLock(mirror_dir.parent / (mirror_dir.name + ".lock")):
+            self._init_mirror(exec_func, repo_url, mirror_dir)
+            if self._is_full_mirror(mirror_dir) and "--depth" in fetch_args:
+                ii = fetch_args.index("--depth")
+                fetch_args = fetch_args[:ii] + fetch_args[ii + 2:]
+            exec_func(["git", "fetch", "--force"] + fetch_args, cwd=mirror_dir)
+
+    # Returns True if the commit exist already in the mirror
+    def has_commit(self, repo_url: str, commit_sha: str):
+        ret = False
+        mirror_dir = self.get_mirror_dir(repo_url)
+        if (mirror_dir / "HEAD").exists():
+            res = subprocess.run(["git", "cat-file", "-e", commit_sha + "^{commit}"],
+                                 cwd=mirror_dir,
+                                 stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL)
+            ret = res.returncode == 0
+        return ret
+
+    # Fetch commit to mirror and store it as a ref. Returns True on success.
+    # Commit is fetched with full history because shallow repository
+    # can not be used as a reference repository for submodule clones.
+    def fetch_commit(self, exec_func, repo_url: str, commit_sha: str, fetch_args: list[str]):
+        ret = True
+        if "--depth" in fetch_args:
+            ii = fetch_args.index("--depth")
+            fetch_args = fetch_args[:ii] + fetch_args[ii + 2:]
+        ref_name = self.get_mirror_ref_name(commit_sha)
+        if not self.has_commit(repo_url, commit_sha):
+            try:
+                self.fetch(exec_func, repo_url, fetch_args + ["origin", "+" + commit_sha + ":" + ref_name])
+            except subprocess.CalledProcessError:
+                # server does not allow fetching commits by sha, fetch branches and tags
+                try:
+                    self.fetch(exec_func, repo_url, ["--tags", "origin", "+refs/heads/*:refs/heads/*"])
+                except subprocess.CalledProcessError:
+                    pass
+                ret = self.has_commit(repo_url, commit_sha)
+        if ret:
+            mirror_dir = self.get_mirror_dir(repo_url)
+            exec_func(["git", "update-ref", ref_name, commit_sha], cwd=mirror_dir)
+        return ret
+
+    # Add mirror object store to alternates of the repository.
+    # Mirror is created first if it does not exist, git warns about missing alternates.
+    def add_alternates(self, exec_func, repo_dir: Path, repo_url: str):
+        mirror_dir = self.get_mirror_dir(repo_url)
+        with RockFileLock(mirror_dir.parent / (mirror_dir.name + ".lock")):
+            self._init_mirror(exec_func, repo_url, mirror_dir)
+        git_dir = Path(subprocess.check_output(["git", "rev-parse", "--absolute-git-dir"],
+                                               cwd=repo_dir,
+                                               text=True).strip())
+        mirror_objects_dir = (mirror_dir / "objects").resolve().as_posix()
+        alternates_fname = git_dir / "objects" / "info" / "alternates"
+        alternates_list = []
+        if alternates_fname.exists():
+            alternates_list = alternates_fname.read_text().splitlines()
+        if mirror_objects_dir not in alternates_list:
+            alternates_fname.parent.mkdir(parents=True, exist_ok=True)
+            with open(alternates_fname, "a") as alternates_file:
+                alternates_file.write(mirror_objects_dir + "\n")
+
+
+# Returns the git mirror configured with environment variables or None
+def get_git_mirror():
+    ret = None
+    mirror_root_dir = os.environ.get(rcb_const.RCB__ENV_VAR__GIT_MIRROR_DIR)
+    if mirror_root_dir:
+        ret = RockGitMirror(Path(mirror_root_dir))
+    return ret
@@ -0,0 +1,137 @@
+import os
+import subprocess
+import threading
+from pathlib import Path, PurePosixPath
+import lib_python.rcb_constants as rcb_const
+
+
+# Cached submodule inventory of the source trees and the thread pool
+# used to run the git commands in each repository of the source tree.
+#
+# "git submodule status --recursive" starts git processes for each submodule,
+# so it is executed only once for each source tree and the result is reused
+# until the HEAD commit of the source tree or any of the .gitmodules files change.
+# Operations which add or remove submodules invalidate the inventory explicitly.
+
+_submodule_inventory_dict = {}
+_submodule_inventory_lock = threading.Lock()
+
+
+class RockSubmoduleInfo:
+    def __init__(self, rel_path: PurePosixPath, is_populated: bool, is_nested: bool):
+        # path relative to the root of the source tree
+        self.rel_path = rel_path
+        # False if the submodule has not been checked out
+        self.is_populated = is_populated
+        # True for the submodules of the submodules
+        self.is_nested = is_nested
+
+
+def _get_head_sha(root_dir: Path):
+    ret = None
+    try:
+        ret = subprocess.check_output(["git", "rev-parse", "HEAD"],
+                                      cwd=str(root_dir),
+                                      stderr=subprocess.DEVNULL,
+                                      text=True).strip()
+    except subprocess.CalledProcessError:
+        ret = None
+    return ret
+
+
+# stat of the .gitmodules files of the root repository and of the populated submodules
+def _get_gitmodules_stat_list(root_dir: Path, submodule_list: list):
+    ret = []
+    repo_dir_list = [root_dir] + [root_dir / item.rel_path for item in submodule_list if item.is_populated]
+    for repo_dir in repo_dir_list:
+        try:
+            stat = (repo_dir / ".gitmodules").stat()
+            ret.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            ret.append(None)
+    return ret
+
+
+def _read_submodule_list(root_dir: Path):
+    ret = []
+    raw_output = subprocess.check_output(
+        ["git", "submodule", "status", "--recursive"],
+        cwd=str(root_dir),
+    )
+    path_list = []
+    for line in raw_output.decode().splitlines():
+        # status prefix "-" = not initialized
+        path_list.append((PurePosixPath(line.strip().split()[1]), not line.startswith("-")))
+    path_set = set(path for path, is_populated in path_list)
+    for path, is_populated in path_list:
+        is_nested = any(parent in path_set for parent in path.parents)
+        ret.append(RockSubmoduleInfo(path, is_populated, is_nested))
+    return ret
+
+
+# Returns the list of RockSubmoduleInfo of all submodules (recursively) in the source tree
+def get_submodule_list(root_dir: Path):
+    root_dir = Path(root_dir).resolve()
+    head_sha = _get_head_sha(root_dir)
+    with _submodule_inventory_lock:
+        entry = _submodule_inventory_dict.get(root_dir)
+    if entry and entry[0] == head_sha and entry[1] == _get_gitmodules_stat_list(root_dir, entry[2]):
+        ret = entry[2]
+    else:
+        ret = _read_submodule_list(root_dir)
+        with _submodule_inventory_lock:
+            _submodule_inventory_dict[root_dir] = (head_sha, _get_gitmodules_stat_list(root_dir, ret), ret)
+    return ret
+
+
+# Called after the submodules of the source tree have been updated
+def invalidate_submodule_list(root_dir: Path):
+    with _submodule_inventory_lock:
+        _submodule_inventory_dict.pop(Path(root_dir).resolve(), None)
+
+
+# Number of threads used for the git commands executed in the repositories of the source tree.
+# Commands are mostly limited by the disk and cpu, so the count follows the cpu count.
+def get_repo_op_job_cnt(repo_cnt: int):
+    ret = os.cpu_count() or 1
+    value = os.environ.get(rcb_const.RCB__ENV_VAR__GIT_JOBS)
+    if value:
+        try:
+            ret = int(value)
+        except ValueError:
+            print("Warning, invalid " + rcb_const.RCB__ENV_VAR__GIT_JOBS + " value: " + value)
+    ret = max(1, min(ret, repo_cnt, rcb_const.RCB__GIT_JOBS_MAX))
+    return ret
+
+
+# Call repo_func(repo_dir) for each repository in parallel and return the results in the same order.
+# All calls are finished before the first exception raised by them is raised again.
+def exec_in_repositories(repo_dir_list: list, repo_func):
+    import concurrent.futures
+    ret = []
+    if not repo_dir_list:
+        return ret
+    job_cnt = get_repo_op_job_cnt(len(repo_dir_list))
+    if job_cnt == 1:
+        ret = [repo_func(repo_dir) for repo_dir in repo_dir_list]
+        return ret
+    with concurrent.futures.ThreadPoolExecutor(max_workers=job_cnt) as executor:
+        future_list = [executor.submit(repo_func, repo_dir) for repo_dir in repo_dir_list]
+        concurrent.futures.wait(future_list)
+    ret = [future.result() for future in future_list]
+    return ret
+
+
+# Call repo_func(repo_dir) in parallel for the repositories that are not nested in each other.
+# Repositories are processed level by level, so that a repository and its nested submodules
+# are never processed at the same time. (git add in the parent repository refreshes
+# also the index of the nested submodule)
+def exec_in_repositories_by_nesting_level(repo_dir_list: list, repo_func):
+    ret = []
+    level_dict = {}
+    for repo_dir in repo_dir_list:
+        level = sum(1 for parent_dir in repo_dir_list if Path(parent_dir) in Path(repo_dir).parents)
+        level_dict.setdefault(level, []).append(repo_dir)
+    for level in sorted(level_dict):
+        ret.extend(exec_in_repositories(level_dict[level], repo_func))
+    return ret
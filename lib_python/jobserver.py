@@ -0,0 +1,124 @@
+import os
+import platform
+import re
+import shutil
+import subprocess
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+
+
+# Job slot server shared by all apps build by the RockBuilder.
+#
+# Implements the server side of the GNU make jobserver protocol
+# so that make, ninja 1.13+ and other jobserver aware clients started
+# by the app builds share the same CPU budget. Tokens are handed either
+# over a named fifo (GNU make 4.4+, ninja) or over an inherited pipe
+# for older GNU make versions which do not support the fifo style.
+#
+# Tools that do not speak the jobserver protocol get their share of the
+# jobs via MAX_JOBS environment variable. CMAKE_BUILD_PARALLEL_LEVEL is set only
+# when the job server is not available, because cmake passes it to make as
+# an explicit -j parameter which would override the job server.
+#
+# Job server settings are exported to environment variables, so the
+# child rockbuilder processes used for the parallel app builds
+# will use the job server started by the parent process.
+class RockJobServer:
+    def __init__(self,
+                 job_cnt: int,
+                 load_average: float,
+                 parallel_app_cnt: int,
+                 fifo_dir: Path):
+        self.job_cnt = max(1, job_cnt)
+        self.load_average = load_average
+        self.parallel_app_cnt = max(1, parallel_app_cnt)
+        self.fifo_dir = Path(fifo_dir)
+        self.fifo_path = None
+        self.fifo_fd = None
+        self.pipe_fds = None
+        self.is_posix = not any(platform.win32_ver())
+
+    def _is_fifo_style_supported(self):
+        # GNU make versions older than 4.4 fails if fifo style is used
+        ret = True
+        make_exec = shutil.which("make")
+        if make_exec:
+            try:
+                result = subprocess.run([make_exec, "--version"],
+                                        capture_output=True,
+                                        text=True)
+                res = re.search(r"GNU Make (\d+)\.(\d+)", result.stdout)
+                if res:
+                    ret = (int(res.group(1)), int(res.group(2))) >= (4, 4)
+            except OSError:
+                pass
+        return ret
+
+    def _write_tokens(self, fd):
+        # each client has one implicit job slot
+        token_cnt = self.job_cnt - self.parallel_app_cnt
+        if token_cnt > 0:
+            os.write(fd, b"+" * token_cnt)
+
+    def start(self):
+        # tools not using the jobserver share the jobs evenly between parallel apps
+        app_job_cnt = max(1, self.job_cnt // self.parallel_app_cnt)
+        make_flags = "-j" + str(self.job_cnt)
+        if self.load_average:
+            make_flags = make_flags + " -l" + str(self.load_average)
+            os.environ[rcb_const.RCB__ENV_VAR__LOAD_AVERAGE] = str(self.load_average)
+        if self.is_posix:
+            if self._is_fifo_style_supported():
+                self.fifo_dir.mkdir(parents=True, exist_ok=True)
+                self.fifo_path = self.fifo_dir / ("jobserver_" + str(os.getpid()) + ".fifo")
+                if self.fifo_path.exists():
+                    self.fifo_path.unlink()
+                os.mkfifo(self.fifo_path, 0o600)
+                # keep the fifo open so that tokens stay in it when there are no clients
+                self.fifo_fd = os.open(self.fifo_path, os.O_RDWR | os.O_NONBLOCK)
+                self._write_tokens(self.fifo_fd)
+                make_flags = make_flags + " --jobserver-auth=fifo:" + self.fifo_path.as_posix()
+            else:
+                self.pipe_fds = os.pipe()
+                for fd in self.pipe_fds:
+                    os.set_inheritable(fd, True)
+                self._write_tokens(self.pipe_fds[1])
+                fds_str = str(self.pipe_fds[0]) + "," + str(self.pipe_fds[1])
+                make_flags = make_flags + " --jobserver-auth=" + fds_str
+                os.environ[rcb_const.RCB__ENV_VAR__JOBSERVER_FDS] = fds_str
+        os.environ[rcb_const.RCB__ENV_VAR__JOBS] = str(self.job_cnt)
+        os.environ["MAKEFLAGS"] = make_flags
+        os.environ["MAX_JOBS"] = str(app_job_cnt)
+        print("Job server started: " + make_flags)
+        print("    MAX_JOBS: " + str(app_job_cnt))
+        if "--jobserver-auth" not in make_flags:
+            os.environ["CMAKE_BUILD_PARALLEL_LEVEL"] = str(app_job_cnt)
+            print("    CMAKE_BUILD_PARALLEL_LEVEL: " + str(app_job_cnt))
+
+    def stop(self):
+        if self.fifo_fd is not None:
+            os.close(self.fifo_fd)
+            self.fifo_fd = None
+        if self.fifo_path and self.fifo_path.exists():
+            self.fifo_path.unlink()
+        if self.pipe_fds:
+            for fd in self.pipe_fds:
+                os.close(fd)
+            self.pipe_fds = None
+
+
+# Returns the pipe file descriptors that needs to be passed to the
+# child processes when the pipe style job server is used.
+def get_job_server_pass_fds():
+    ret = ()
+    fds_str = os.environ.get(rcb_const.RCB__ENV_VAR__JOBSERVER_FDS)
+    if fds_str:
+        try:
+            ret = tuple(int(fd) for fd in fds_str.split(","))
+        except ValueError:
+            ret = ()
+    return ret
+
+
+def is_job_server_started():
+    return rcb_const.RCB__ENV_VAR__JOBS in os.environ
@@ -0,0 +1,145 @@
+import collections
+import gzip
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+from lib_python.build_report import wait_process_with_resource_usage
+
+
+# Output of the phase commands is streamed both to the terminal and to the
+# phase log file in the build/<app>/logs directory.
+#
+# Output pipe of the command is read as fast as the command writes to it and the
+# log file is written on a separate thread, so that the slow log file writes or the
+# compression do not block the command. Last lines of the output are kept in a
+# ring buffer, so that they can be printed if the phase fails.
+
+# partial line kept in the ring buffer is truncated to this size
+_MAX_TAIL_LINE_LEN = 4096
+_READ_SIZE = 65536
+
+
+def is_phase_log_compressed():
+    ret = os.environ.get(rcb_const.RCB__ENV_VAR__PHASE_LOG_COMPRESS, "").strip().lower() in ("1", "yes", "true", "on")
+    return ret
+
+
+def get_phase_log_tail_line_cnt():
+    ret = rcb_const.RCB__PHASE_LOG_DEFAULT_TAIL_LINES
+    value = os.environ.get(rcb_const.RCB__ENV_VAR__PHASE_LOG_TAIL_LINES)
+    if value:
+        try:
+            ret = max(0, int(value))
+        except ValueError:
+            print("Error, invalid phase log tail line count: " + value)
+            sys.exit(1)
+    return ret
+
+
+# Log file name of the phase in the app build dir
+def get_phase_log_file_name(app_build_dir: Path, phase_name: str):
+    fname = phase_name.replace(" ", "_") + ".log"
+    if is_phase_log_compressed():
+        fname = fname + ".gz"
+    ret = Path(app_build_dir) / rcb_const.RCB__PHASE_LOG_BASE_DIR / fname
+    return ret
+
+
+class RockPhaseLog:
+    def __init__(self, log_fname: Path, tail_line_cnt: int):
+        self.log_fname = Path(log_fname)
+        self.tail_line_list = collections.deque(maxlen=tail_line_cnt)
+        self._tail_partial_line = b""
+        self._write_queue = queue.SimpleQueue()
+        self._write_error = None
+        self.log_fname.parent.mkdir(parents=True, exist_ok=True)
+        if self.log_fname.name.endswith(".gz"):
+            # low compression level is enough for the build logs and keeps up with the output
+            self._log_file = gzip.open(self.log_fname, "wb", compresslevel=1)
+        else:
+            self._log_file = open(self.log_fname, "wb")
+        self._writer_thread = threading.Thread(target=self._write_log_file, daemon=True)
+        self._writer_thread.start()
+
+    def _write_log_file(self):
+        while True:
+            data = self._write_queue.get()
+            if data is None:
+                break
+            if self._write_error is None:
+                try:
+                    self._log_file.write(data)
+                except OSError as e:
+                    # output is still shown on terminal, only the log file is incomplete
+                    self._write_error = e
+
+    def _add_to_tail(self, data: bytes):
+        line_list = (self._tail_partial_line + data).split(b"\n")
+        self._tail_partial_line = line_list.pop()[-_MAX_TAIL_LINE_LEN:]
+        self.tail_line_list.extend(line[-_MAX_TAIL_LINE_LEN:] for line in line_list)
+
+    def write(self, data: bytes):
+        self._write_queue.put(data)
+
+    # Execute the command in shell and stream its output to terminal and log file.
+    # Resource usage of the command is added to the resource_usage if it is given.
+    # Returns the exit code of the command.
+    def exec(self, exec_cmd: str, exec_dir: str, pass_fds=(), resource_usage=None):
+        self.write(("++ Exec [" + str(exec_dir) + "]$ " + exec_cmd + "\n").encode("utf-8", "replace"))
+        # earlier print calls of the rockbuilder needs to be shown before the command output
+        sys.stdout.flush()
+        start_time = time.monotonic()
+        proc = subprocess.Popen(exec_cmd,
+                                cwd=exec_dir,
+                                shell=True,
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT,
+                                pass_fds=pass_fds)
+        out_fd = proc.stdout.fileno()
+        terminal = sys.stdout.buffer
+        try:
+            while True:
+                data = os.read(out_fd, _READ_SIZE)
+                if not data:
+                    break
+                terminal.write(data)
+                terminal.flush()
+                self.write(data)
+                self._add_to_tail(data)
+        finally:
+            proc.stdout.close()
+            ret, rusage = wait_process_with_resource_usage(proc)
+        if resource_usage:
+            resource_usage.add(time.monotonic() - start_time, ret, rusage)
+        return ret
+
+    # Wait that the output has been written to the log file and close it.
+    # Tail lines are still available after the close.
+    def close(self):
+        if self._log_file:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            try:
+                self._log_file.close()
+            except OSError as e:
+                self._write_error = e
+            self._log_file = None
+            if self._tail_partial_line:
+                self.tail_line_list.append(self._tail_partial_line)
+                self._tail_partial_line = b""
+            if self._write_error:
+                print("Warning, failed to write the phase log file: " + self.log_fname.as_posix())
+                print("    " + str(self._write_error))
+
+    def printout_tail(self):
+        if self.tail_line_list:
+            print("------ last " + str(len(self.tail_line_list)) + " lines of output ----------")
+            for line in self.tail_line_list:
+                print(line.decode("utf-8", "replace"))
+            print("------------------------")
+        print("Log file: " + self.log_fname.as_posix())
@@ -7,10 +7,10 @@ import ast
 import subprocess
 import lib_python.rcb_constants as rcb_const
 from lib_python.utils import get_rocm_home_from_python_wheel_rocm_sdk
+from lib_python.utils import get_config_value
 from lib_python.utils import get_config_value_from_one_element_list
 from lib_python.utils import get_python_wheel_rocm_sdk_gpu_list_str
 from lib_python.utils import get_rocm_sdk_wheel_install_stamp_key
-from lib_python.repo_management import RockProjectRepo
 from pathlib import Path, PurePosixPath
 
 class RCBConfigReader(configparser.ConfigParser):
@@ -29,6 +29,16 @@ class RCBConfigReader(configparser.ConfigParser):
         self.rock_sdk_home_therock_build_dir = None
         # location from where the existing rocm sdk install was found
         self.rock_sdk_home_existing_install_dir = None
+        # local directory for the build output cache
+        self.build_cache_dir = None
+        self.build_cache_url = None
+        self.build_cache_src_snapshots = None
+        self.compiler_cache_type = None
+        self.compiler_cache_dir = None
+        self.compiler_cache_max_size = None
+        self.git_mirror_dir = None
+        self.fetch_jobs = None
+        self.ls_remote_cache_ttl = None
 
         if self.fname.exists():
             try:
@@ -63,6 +73,54 @@ class RCBConfigReader(configparser.ConfigParser):
                                    rcb_const.RCB__CFG__SECTION__ROCM_SDK,
                                    rcb_const.RCB__CFG__KEY__ROCM_SDK_FROM_ROCM_HOME)
                     self.rock_sdk_home_existing_install_dir = Path(self.rock_sdk_home_existing_install_dir).resolve().as_posix()
+                if self.has_option(rcb_const.RCB__CFG__SECTION__BUILD_CACHE,
+                                   rcb_const.RCB__CFG__KEY__BUILD_CACHE_DIR):
+                    self.build_cache_dir = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__BUILD_CACHE,
+                                   rcb_const.RCB__CFG__KEY__BUILD_CACHE_DIR)
+                    self.build_cache_dir = os.path.expanduser(self.build_cache_dir)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__BUILD_CACHE,
+                                   rcb_const.RCB__CFG__KEY__BUILD_CACHE_URL):
+                    self.build_cache_url = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__BUILD_CACHE,
+                                   rcb_const.RCB__CFG__KEY__BUILD_CACHE_URL)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__BUILD_CACHE,
+                                   rcb_const.RCB__CFG__KEY__BUILD_CACHE_SRC_SNAPSHOTS):
+                    self.build_cache_src_snapshots = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__BUILD_CACHE,
+                                   rcb_const.RCB__CFG__KEY__BUILD_CACHE_SRC_SNAPSHOTS)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__COMPILER_CACHE,
+                                   rcb_const.RCB__CFG__KEY__COMPILER_CACHE_TYPE):
+                    self.compiler_cache_type = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__COMPILER_CACHE,
+                                   rcb_const.RCB__CFG__KEY__COMPILER_CACHE_TYPE)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__COMPILER_CACHE,
+                                   rcb_const.RCB__CFG__KEY__COMPILER_CACHE_DIR):
+                    self.compiler_cache_dir = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__COMPILER_CACHE,
+                                   rcb_const.RCB__CFG__KEY__COMPILER_CACHE_DIR)
+                    self.compiler_cache_dir = os.path.expanduser(self.compiler_cache_dir)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__COMPILER_CACHE,
+                                   rcb_const.RCB__CFG__KEY__COMPILER_CACHE_MAX_SIZE):
+                    self.compiler_cache_max_size = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__COMPILER_CACHE,
+                                   rcb_const.RCB__CFG__KEY__COMPILER_CACHE_MAX_SIZE)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__GIT_MIRROR,
+                                   rcb_const.RCB__CFG__KEY__GIT_MIRROR_DIR):
+                    self.git_mirror_dir = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__GIT_MIRROR,
+                                   rcb_const.RCB__CFG__KEY__GIT_MIRROR_DIR)
+                    self.git_mirror_dir = os.path.expanduser(self.git_mirror_dir)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__FETCH,
+                                   rcb_const.RCB__CFG__KEY__FETCH_JOBS):
+                    self.fetch_jobs = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__FETCH,
+                                   rcb_const.RCB__CFG__KEY__FETCH_JOBS)
+                if self.has_option(rcb_const.RCB__CFG__SECTION__FETCH,
+                                   rcb_const.RCB__CFG__KEY__FETCH_LS_REMOTE_CACHE_TTL):
+                    self.ls_remote_cache_ttl = get_config_value(self,
+                                   rcb_const.RCB__CFG__SECTION__FETCH,
+                                   rcb_const.RCB__CFG__KEY__FETCH_LS_REMOTE_CACHE_TTL)
             except PermissionError:
                 print("No permission to read configuration file:")
                 print("    " + str(self.fname))
@@ -178,6 +236,34 @@ class RCBConfigReader(configparser.ConfigParser):
         return ret
 
 
+    def get_build_cache_dir(self):
+        return self.build_cache_dir
+
+    def get_build_cache_url(self):
+        return self.build_cache_url
+
+    def get_build_cache_src_snapshots(self):
+        return self.build_cache_src_snapshots
+
+    def get_compiler_cache_type(self):
+        return self.compiler_cache_type
+
+    def get_compiler_cache_dir(self):
+        return self.compiler_cache_dir
+
+    def get_compiler_cache_max_size(self):
+        return self.compiler_cache_max_size
+
+    def get_git_mirror_dir(self):
+        return self.git_mirror_dir
+
+    def get_fetch_jobs(self):
+        return self.fetch_jobs
+
+    def get_ls_remote_cache_ttl(self):
+        return self.ls_remote_cache_ttl
+
+
     # get target gpus in str which each one separated with semicolon
     def get_configured_gpu_list_str(self):
         ret = None
@@ -29,6 +29,35 @@ RCB__ENV_VAR__AMDGPU_TARGETS                 = "RCB_AMDGPU_TARGETS"
 RCB__ENV_VAR__APP_SRC_DIR                    = "RCB_APP_SRC_DIR"
 RCB__ENV_VAR__APP_BUILD_DIR                  = "RCB_APP_BUILD_DIR"
 RCB__ENV_VAR__APP_VERSION                    = "RCB_APP_VERSION"
+RCB__ENV_VAR__JOBS                           = "RCB_JOBS"
+RCB__ENV_VAR__LOAD_AVERAGE                   = "RCB_LOAD_AVERAGE"
+RCB__ENV_VAR__JOBSERVER_FDS                  = "RCB_JOBSERVER_FDS"
+RCB__ENV_VAR__BUILD_CACHE_DIR                = "RCB_BUILD_CACHE_DIR"
+RCB__ENV_VAR__BUILD_CACHE_URL                = "RCB_BUILD_CACHE_URL"
+RCB__ENV_VAR__BUILD_CACHE_TOKEN              = "RCB_BUILD_CACHE_TOKEN"
+RCB__ENV_VAR__BUILD_CACHE_S3_ENDPOINT_URL    = "RCB_BUILD_CACHE_S3_ENDPOINT_URL"
+RCB__ENV_VAR__SRC_SNAPSHOT_CACHE             = "RCB_SRC_SNAPSHOT_CACHE"
+RCB__ENV_VAR__COMPILER_CACHE                 = "RCB_COMPILER_CACHE"
+RCB__ENV_VAR__COMPILER_CACHE_DIR             = "RCB_COMPILER_CACHE_DIR"
+RCB__ENV_VAR__COMPILER_CACHE_MAX_SIZE        = "RCB_COMPILER_CACHE_MAX_SIZE"
+RCB__ENV_VAR__COMPILER_CACHE_STATS_FILE      = "RCB_COMPILER_CACHE_STATS_FILE"
+RCB__ENV_VAR__GIT_MIRROR_DIR                 = "RCB_GIT_MIRROR_DIR"
+RCB__ENV_VAR__FETCH_JOBS                     = "RCB_FETCH_JOBS"
+RCB__ENV_VAR__LS_REMOTE_CACHE_TTL            = "RCB_LS_REMOTE_CACHE_TTL"
+RCB__ENV_VAR__GIT_JOBS                       = "RCB_GIT_JOBS"
+RCB__ENV_VAR__FAST_MODE                      = "RCB_FAST_MODE"
+# gzip compress the phase log files
+RCB__ENV_VAR__PHASE_LOG_COMPRESS             = "RCB_PHASE_LOG_COMPRESS"
+# number of last output lines printed when the phase command fails
+RCB__ENV_VAR__PHASE_LOG_TAIL_LINES           = "RCB_PHASE_LOG_TAIL_LINES"
+# phase resource usage records are appended to this file by all app builds of the run
+RCB__ENV_VAR__BUILD_REPORT_RECORD_FILE       = "RCB_BUILD_REPORT_RECORD_FILE"
+# trace events are appended to this file by all app builds of the run when --trace is used
+RCB__ENV_VAR__TRACE_EVENT_FILE               = "RCB_TRACE_EVENT_FILE"
+# python wheels whose install is done at the end of the run are appended to this file with --batch-wheel-install
+RCB__ENV_VAR__WHEEL_INSTALL_QUEUE_FILE       = "RCB_WHEEL_INSTALL_QUEUE_FILE"
+# apps whose python wheels are not used by the other apps of the run with --batch-wheel-install
+RCB__ENV_VAR__WHEEL_INSTALL_DEFERRED_APPS    = "RCB_WHEEL_INSTALL_DEFERRED_APPS"
 
 RCB__APP_CFG_DEFAULT_BASE_DIR                = "apps"
 RCB__APP_SRC_BASE_DIR                        = "src_apps"
@@ -46,9 +75,70 @@ RCB__APP_LIST_CFG_FILE_SUFFIX                = ".apps"
 RCB__CFG__BASE_FILE_NAME                     = "rockbuilder.cfg"
 RCB__CFG__FILE_NAME                          = RCB__ROOT_DIR / RCB__CFG__BASE_FILE_NAME
 RCB__CFG__STAMP_FILE_NAME                    = RCB__ROOT_DIR / "rocm_sdk_wheels.done"
+# serializes the python wheel installs done by parallel app builds
+RCB__PYTHON_WHEEL_INSTALL_LOCK_FILE_NAME     = RCB__APP_BUILD_ROOT_DIR / "python_wheel_install.lock"
+# python wheel installed last by the app, saved to the build dir of the app
+RCB__PYTHON_WHEEL_INSTALL_STATE_FILE_NAME    = "python_wheel_install.json"
+# locations of the bitcode, hipcc and clang found from the rocm sdk directories
+RCB__ROCM_SDK_TOOL_PATH_CACHE_FILE_NAME      = RCB__APP_BUILD_ROOT_DIR / "rocm_sdk_tool_paths.json"
+# parsed app and app list config files, see app_cfg_index.py
+RCB__APP_CFG_INDEX_FILE_NAME                 = RCB__APP_BUILD_ROOT_DIR / "app_cfg_index.json"
+RCB__APP_CFG_INDEX_FORMAT_VERSION            = 1
+RCB__BUILD_CACHE_METADATA_FILE_NAME          = "metadata.json"
+RCB__BUILD_CACHE_SHA256_HEADER               = "X-RCB-Content-SHA256"
+RCB__BUILD_CACHE_S3_AUTO_BUCKET              = "auto"
+RCB__BUILD_CACHE_TRANSFER_CNT                = 4
+RCB__BUILD_CACHE_CHUNK_SIZE                  = 1024 * 1024
+RCB__BUILD_CACHE_MULTIPART_SIZE              = 64 * 1024 * 1024
+RCB__BUILD_CACHE_HTTP_TIMEOUT                = 300
+RCB__BUILD_CACHE_SERVER_DEF_PORT             = 8765
+# snapshots of the patched and hipified source trees stored to build cache
+RCB__SRC_SNAPSHOT_BASE_FILE_NAME             = "src_snapshot"
+RCB__SRC_SNAPSHOT_STATE_FILE_NAME            = "src_snapshot.json"
+RCB__SRC_SNAPSHOT_STATE_RESTORED             = "restored"
+RCB__SRC_SNAPSHOT_STATE_PENDING              = "pending"
+# environment variables of each phase are saved to this directory under the app build dir
+RCB__ENV_SNAPSHOT_BASE_DIR                   = "env"
+# output of the phase commands is saved to this directory under the app build dir
+RCB__PHASE_LOG_BASE_DIR                      = "logs"
+RCB__PHASE_LOG_DEFAULT_TAIL_LINES            = 50
+# build reports of the rockbuilder runs are saved to this directory under the build dir
+RCB__BUILD_REPORT_BASE_DIR                   = "reports"
+RCB__BUILD_REPORT_FORMAT_VERSION             = 1
+RCB__COMPILER_CACHE_TYPE_CCACHE              = "ccache"
+RCB__COMPILER_CACHE_TYPE_SCCACHE             = "sccache"
+RCB__COMPILER_CACHE_TYPE_NONE                = "none"
+RCB__COMPILER_CACHE_DEF_MAX_SIZE             = "50G"
+RCB__COMPILER_CACHE_WRAPPER_BASE_DIR         = "compiler_cache_wrappers"
+# submodule fetch job count is auto-tuned with value "auto"
+RCB__FETCH_JOBS_AUTO                         = "auto"
+RCB__FETCH_JOBS_AUTO_MAX                     = 8
+RCB__FETCH_RETRY_CNT                         = 3
+RCB__FETCH_RETRY_DELAY                       = 5
+# max number of threads running git commands in the submodules of the app
+RCB__GIT_JOBS_MAX                            = 16
+# seconds the app version resolved with git ls-remote is reused, 0 disables the cache
+RCB__LS_REMOTE_CACHE_TTL                     = 600
+RCB__LS_REMOTE_CACHE_FILE_NAME               = "ls_remote_cache.json"
+# checkout state saved to the git directory of the app repository
+RCB__CHECKOUT_STATE_FILE_NAME                = "rcb_checkout_state.json"
+# commits created by the hipify saved to the git directory of the app repository
+RCB__HIPIFY_STATE_FILE_NAME                  = "rcb_hipify_state.json"
+# PROP_FETCH_REPO_TAGS value for fetching only the history needed to reach the nearest tag
+RCB__FETCH_REPO_TAGS_NEAREST                 = "nearest"
+# release tags searched by the nearest tag fetch, other tags are ignored
+RCB__FETCH_NEAREST_TAG_PATTERN               = "v*"
+# shallow history is deepened at most to this depth before the full history is fetched
+RCB__FETCH_NEAREST_TAG_MAX_DEPTH             = 8192
+# PROP_CLONE_FILTER value for fetching all objects
+RCB__CLONE_FILTER_NONE                       = "none"
 
 RCB__CFG__SECTION__ROCM_SDK                  = "rocm_sdk"
 RCB__CFG__SECTION__BUILD_TARGETS             = "build_targets"
+RCB__CFG__SECTION__BUILD_CACHE               = "build_cache"
+RCB__CFG__SECTION__COMPILER_CACHE            = "compiler_cache"
+RCB__CFG__SECTION__GIT_MIRROR                = "git_mirror"
+RCB__CFG__SECTION__FETCH                     = "fetch"
 
 RCB__CFG__KEY__ROCM_SDK_FROM_ROCM_HOME       = "rocm_sdk_home"
 RCB__CFG__KEY__ROCM_SDK_FROM_BUILD           = "rocm_sdk_build"
@@ -57,9 +147,20 @@ RCB__CFG__KEY__ROCM_SDK_PYTHON_WHEEL_SERVER_DEPRECATED  = "rocm_sdk_whl"
 RCB__CFG__KEY__ROCM_SDK_PYTHON_WHEEL_VERSION = "rocm_sdk_whl_version"
 RCB__CFG__DEF__ROCM_SDK_PYTHON_WHEEL_VERSION = "7.12.0a20260228"
 RCB__CFG__KEY__GPUS                          = "gpus"
+RCB__CFG__KEY__BUILD_CACHE_DIR               = "dir"
+RCB__CFG__KEY__BUILD_CACHE_URL               = "url"
+RCB__CFG__KEY__BUILD_CACHE_SRC_SNAPSHOTS     = "src_snapshots"
+RCB__CFG__KEY__COMPILER_CACHE_TYPE           = "type"
+RCB__CFG__KEY__COMPILER_CACHE_DIR            = "dir"
+RCB__CFG__KEY__COMPILER_CACHE_MAX_SIZE       = "max_size"
+RCB__CFG__KEY__GIT_MIRROR_DIR                = "dir"
+RCB__CFG__KEY__FETCH_JOBS                    = "jobs"
+RCB__CFG__KEY__FETCH_LS_REMOTE_CACHE_TTL     = "ls_remote_cache_ttl"
 
 RCB__APPS_CFG__SECTION_APPS                  = "apps"
 RCB__APPS_CFG__KEY__APP_LIST                 = "app_list"
+# optional section in app list file: "app_cfg_name = dependency1 dependency2"
+RCB__APPS_CFG__SECTION_DEPENDENCIES          = "dependencies"
 
 RCB__THEROCK_CFG_NAME                        = "therock.cfg"
 
@@ -69,7 +170,14 @@ RCB__APP_CFG__KEY__APP_NAME                  = "APP_NAME"
 RCB__APP_CFG__KEY__APP_VERSION               = "APP_VERSION"
 RCB__APP_CFG__KEY__REPO_URL                  = "REPO_URL"
 RCB__APP_CFG__KEY__PROP_FETCH_REPO_TAGS      = "PROP_FETCH_REPO_TAGS"
+RCB__APP_CFG__KEY__PROP_FETCH_JOBS           = "PROP_FETCH_JOBS"
+# partial clone filter for app repository and its submodules (blob:none, tree:0)
+RCB__APP_CFG__KEY__PROP_CLONE_FILTER         = "PROP_CLONE_FILTER"
+# directories of app repository checked out, others are left out with sparse-checkout
+RCB__APP_CFG__KEY__PROP_SPARSE_CHECKOUT      = "PROP_SPARSE_CHECKOUT"
 RCB__APP_CFG__KEY__PATCH_DIR                 = "PATCH_DIR"
+# apps (cfg base names or APP_NAMEs) that needs to be build before this app
+RCB__APP_CFG__KEY__DEPENDS                   = "DEPENDS"
 
 RCB__APP_CFG__KEY__CMD_EXEC_DIR              = "CMD_EXEC_DIR"
 
@@ -92,6 +200,29 @@ RCB__APP_CFG__KEY__CMD_CMAKE_INSTALL         = "CMD_CMAKE_INSTALL"
 RCB__APP_CFG__KEY__CMD_INSTALL               = "CMD_INSTALL"
 RCB__APP_CFG__KEY__CMD_POST_INSTALL          = "CMD_POST_INSTALL"
 
+# commands that can have os specific _LINUX and _WINDOWS versions in the app config
+RCB__APP_CFG__CMD_KEY_LIST                   = [RCB__APP_CFG__KEY__CMD_INIT,
+                                                RCB__APP_CFG__KEY__CMD_CLEAN,
+                                                RCB__APP_CFG__KEY__CMD_HIPIFY,
+                                                RCB__APP_CFG__KEY__CMD_PRE_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_POST_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_BUILD,
+                                                RCB__APP_CFG__KEY__CMD_CMAKE_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_INSTALL,
+                                                RCB__APP_CFG__KEY__CMD_POST_INSTALL]
+
+# phases for which the compiler cache hits and misses are reported
+RCB__COMPILER_CACHE_PHASE_LIST               = [RCB__APP_CFG__KEY__CMD_PRE_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_CMAKE_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_POST_CONFIG,
+                                                RCB__APP_CFG__KEY__CMD_CMAKE_BUILD,
+                                                RCB__APP_CFG__KEY__CMD_BUILD,
+                                                RCB__APP_CFG__KEY__CMD_CMAKE_INSTALL,
+                                                RCB__APP_CFG__KEY__CMD_INSTALL,
+                                                RCB__APP_CFG__KEY__CMD_POST_INSTALL]
+
 # both windows and linux or only linux or only windows
 RCB__APP_CFG__KEY__PROP_BUILD_DISABLE            = "PROP_DISABLE"
 RCB__APP_CFG__KEY__PROP_BUILD_DISABLE_LINUX      = "PROP_DISABLE_LINUX"
@@ -1,10 +1,12 @@
 import argparse
+import json
 import shlex
 import shutil
 import subprocess
 import sys
 import os
 import glob
+import hashlib
 import platform
 import time
 from pathlib import Path, PurePosixPath
@@ -12,11 +14,29 @@ from urllib.parse import urlparse, urlunparse, quote
 import subprocess
 import lib_python.rcb_constants as rcb_const
 from lib_python.utils import truncate_string
+from lib_python.utils import RockFileLock
+from lib_python.utils import get_dir_content_sha256
+from lib_python.utils import is_fast_mode
+from lib_python.utils import write_env_snapshot
+from lib_python.utils import get_file_sha256
 
 TAG_UPSTREAM_DIFFBASE = "THEROCK_UPSTREAM_DIFFBASE"
 TAG_HIPIFY_DIFFBASE = "THEROCK_HIPIFY_DIFFBASE"
 HIPIFY_COMMIT_MESSAGE = "DO NOT SUBMIT: HIPIFY"
 
+# Returns True if the repository path is inside of the sparse checkout directories
+# or it is a parent directory of them
+def is_path_in_sparse_checkout(path: str, sparse_path_list: list[str]):
+    ret = False
+    path = path.strip("/")
+    for sparse_path in sparse_path_list:
+        if (path == sparse_path or path.startswith(sparse_path + "/")
+                or sparse_path.startswith(path + "/")):
+            ret = True
+            break
+    return ret
+
+
 class RockProjectRepo:
     def __init__(
         self,
@@ -43,26 +63,54 @@ class RockProjectRepo:
         self.app_patch_dir_base_name = app_patch_dir_base_name
         self.patch_dir_root_arr = patch_dir_root_arr
         self.orig_env_variables_hashtable = dict()
+        # compiler cache env variables are not part of the app env used in the phase fingerprints
+        self.orig_compiler_cache_env_variables_hashtable = dict()
         self.is_posix = not any(platform.win32_ver())
-        os.environ[rcb_const.RCB__ENV_VAR__APP_SRC_DIR] = app_src_dir.as_posix()
-        os.environ[rcb_const.RCB__ENV_VAR__APP_BUILD_DIR] = app_build_dir.as_posix()
-        if app_version_hashtag:
-            os.environ[rcb_const.RCB__ENV_VAR__APP_VERSION] = truncate_string(app_version_hashtag, 8)
-        else:
-            os.environ[rcb_const.RCB__ENV_VAR__APP_VERSION] = ""
+        # if set, git command output is written to this file instead of stdout
+        self.exec_log_file = None
+        # python wheel copied to wheel install dir by the last install
+        self.last_installed_wheel = None
+        # with --batch-wheel-install the wheel install is done at the end of the run
+        # and the install stamp is removed if it fails (set by the app builder)
+        self.is_wheel_install_deferred = False
+        self.wheel_install_stamp_fname = None
+        # log of the phase executed, commands are logged to it while it is open
+        self.phase_log = None
+        self.is_phase_log_open = False
+        # log of the phase whose command failed last
+        self.failed_phase_log = None
+        # resource usage of the commands executed by the current phase
+        self.cmd_resource_usage = None
 
     # private methods
     def _exec_subprocess_cmd(self, exec_cmd, exec_dir):
+        from lib_python.jobserver import get_job_server_pass_fds
+        from lib_python.trace_events import trace_span
+        from lib_python.trace_events import TRACE_CAT_CMD
         ret = True
         if exec_cmd is not None:
             exec_dir = self._replace_env_variables(exec_dir)
             print("exec_cmd: " + exec_cmd + ", exec_dir: " + exec_dir)
+            if self.is_phase_log_open:
+                # output is shown during the build time and saved to the phase log
+                with trace_span(exec_cmd, TRACE_CAT_CMD, {"cmd": exec_cmd, "cwd": exec_dir}):
+                    returncode = self.phase_log.exec(exec_cmd,
+                                                     exec_dir,
+                                                     get_job_server_pass_fds(),
+                                                     self.cmd_resource_usage)
+                if returncode != 0:
+                    ret = False
+                    self.failed_phase_log = self.phase_log
+                    print("Operation failed, exit code: " + str(returncode))
+                return ret
             # capture_output=True --> can print output after process exist, not possible to see the output during the build time
             # capture_output=False --> can print output only during build time
             # result = subprocess.run(exec_cmd, shell=True, capture_output=True, text=True)
-            result = subprocess.run(
-                exec_cmd, cwd=exec_dir, shell=True, capture_output=False, text=True
-            )
+            with trace_span(exec_cmd, TRACE_CAT_CMD, {"cmd": exec_cmd, "cwd": exec_dir}):
+                result = subprocess.run(
+                    exec_cmd, cwd=exec_dir, shell=True, capture_output=False, text=True,
+                    pass_fds=get_job_server_pass_fds()
+                )
             if result.returncode == 0:
                 if result.stdout:
                     print(result.stdout)
@@ -75,23 +123,15 @@ class RockProjectRepo:
                     print(f"Error1: {result.stderr}")
         return ret
 
-    def _exec_subprocess_batch_file(self, batch_file):
+    # Batch file is executed like the other phase commands, so its output
+    # is saved to the phase log and the failure is returned to the caller
+    def _exec_subprocess_batch_file(self, batch_file, exec_dir):
         ret = True
         if batch_file is not None:
             print("batch_file: " + batch_file)
-            # capture_output=True --> can print output after process exist, not possible to see the output during the build time
-            # capture_output=False --> can print output only during build time
-            # result = subprocess.run(exec_cmd, shell=True, capture_output=True, text=True)
-            result = subprocess.run(
-                [batch_file], shell=True, capture_output=False, text=True
-            )
-            if result.returncode == 0:
-                if result.stdout:
-                    print(result.stdout)
-            else:
+            ret = self._exec_subprocess_cmd(subprocess.list2cmdline([batch_file]), exec_dir)
+            if not ret:
                 print("Batch file operation failed")
-                if result.stderr:
-                    print(f"Error2: {result.stderr}")
         return ret
 
     def _replace_env_variables(self, cmd_str):
@@ -144,19 +184,27 @@ class RockProjectRepo:
 
 
     def _handle_RCB_CALLBACK__RESET_APP_SRC_REPOSITORY(self, repo_path):
+        from lib_python.git_submodules import exec_in_repositories_by_nesting_level
         ret = True
         print(rcb_const.RCB_CALLBACK__RESET_APP_SRC_REPOSITORY + ": " + str(repo_path))
         if os.path.isdir(repo_path):
             cmd_arr = [
 			    "git reset --hard",
 			    "git clean -xfd",
-			    "git submodule foreach --recursive 'git reset --hard'",
-			    "git submodule foreach --recursive 'git clean -xfd'"
 			]
-            for cmd in cmd_arr:
-                ret = self._handle_subprocess_exec_RCB_CALLBACK__RESET_APP_SRC_REPOSITORY(repo_path, cmd)
-                if not ret:
-                    break
+            def reset_repo(cur_repo_path):
+                ret = True
+                for cmd in cmd_arr:
+                    ret = self._handle_subprocess_exec_RCB_CALLBACK__RESET_APP_SRC_REPOSITORY(cur_repo_path, cmd)
+                    if not ret:
+                        break
+                return ret
+            ret = reset_repo(repo_path)
+            if ret:
+                # submodules are reset in parallel, nested submodules after their parent submodule
+                res_list = exec_in_repositories_by_nesting_level(self.list_submodules(Path(repo_path), populated_only=True),
+                                                                 reset_repo)
+                ret = all(res_list)
         else:
             print(f"Error: Repository path not found: '{repo_path}'")
             ret = False
@@ -188,8 +236,12 @@ class RockProjectRepo:
     # 1) search the latest wheel file from certain directory
     # 2) copy wheel to packages/wheel directory
     # 3) install wheel to current python environment
-    def _handle_RCB_CALLBACK__INSTALL_PYTHON_WHEEL(self, CMD_INSTALL):
+    def _handle_RCB_CALLBACK__INSTALL_PYTHON_WHEEL(self, CMD_INSTALL, exec_dir=None):
+        from lib_python.wheel_install import is_python_wheel_batch_install_used
+        from lib_python.wheel_install import save_python_wheel_install_state
         ret = True
+        if exec_dir is None:
+            exec_dir = self.app_exec_dir
         CMD_INSTALL_arr = CMD_INSTALL.split()
         # wheels will be installed to appname specific subfolder under base install dir
         wheel_install_target_dir = self.wheel_install_base_dir / self.app_name
@@ -212,18 +264,28 @@ class RockProjectRepo:
                     ret = wheel_install_target_dir.is_dir()
                     if ret:
                         shutil.copy2(latest_whl, wheel_install_target_dir)
+                        self.last_installed_wheel = wheel_install_target_dir / Path(latest_whl).name
                     # 3) install wheel
                     os.environ["PIP_BREAK_SYSTEM_PACKAGES"] = "1"
-                    # res = subprocess.call([ "pip", "install", latest_whl])
-                    inst_cmd = "pip uninstall -y " + latest_whl
-                    # we do not check the uninstall fails by purpose because the
-                    # reason for failure is most likely that the previous version of wheel
-                    # is not installed. But in cases that we do multiple builds for same
-                    # wheel version with little changes, we need to do the uninstall first
-                    # before we do the install for the package with same wheel version.
-                    self._exec_subprocess_cmd(inst_cmd, self.app_exec_dir)
-                    inst_cmd = "pip install " + latest_whl
-                    ret = self._exec_subprocess_cmd(inst_cmd, self.app_exec_dir)
+                    if ret and is_python_wheel_batch_install_used():
+                        ret = self._install_python_wheel_in_batch_mode(self.last_installed_wheel, exec_dir)
+                    else:
+                        # apps build in parallel share the same python environment
+                        with RockFileLock(rcb_const.RCB__PYTHON_WHEEL_INSTALL_LOCK_FILE_NAME):
+                            # res = subprocess.call([ "pip", "install", latest_whl])
+                            inst_cmd = "pip uninstall -y " + latest_whl
+                            # we do not check the uninstall fails by purpose because the
+                            # reason for failure is most likely that the previous version of wheel
+                            # is not installed. But in cases that we do multiple builds for same
+                            # wheel version with little changes, we need to do the uninstall first
+                            # before we do the install for the package with same wheel version.
+                            self._exec_subprocess_cmd(inst_cmd, exec_dir)
+                            inst_cmd = "pip install " + latest_whl
+                            ret = self._exec_subprocess_cmd(inst_cmd, exec_dir)
+                        if ret:
+                            save_python_wheel_install_state(self.last_installed_wheel,
+                                                            get_file_sha256(self.last_installed_wheel),
+                                                            self._get_wheel_install_state_filename())
                     if not ret:
                         print("Install failed for " + self.app_cfg_name)
                         print("Failed command: " + CMD_INSTALL)
@@ -238,11 +300,94 @@ class RockProjectRepo:
                 ret = False
         return ret
 
+    def _get_wheel_install_state_filename(self):
+        ret = Path(self.app_build_dir) / rcb_const.RCB__PYTHON_WHEEL_INSTALL_STATE_FILE_NAME
+        return ret
+
+    # Install the wheel with --batch-wheel-install.
+    # Install is skipped if the same wheel is already installed. Wheels of the apps
+    # used by the other apps of the run are reinstalled without resolving the dependencies
+    # again and the wheels of the other apps are queued to be installed at the end of the run.
+    def _install_python_wheel_in_batch_mode(self, wheel_fname: Path, exec_dir):
+        from lib_python.wheel_install import is_python_wheel_installed
+        from lib_python.wheel_install import save_python_wheel_install_state
+        from lib_python.wheel_install import queue_python_wheel_install
+        from lib_python.wheel_install import get_python_wheel_dist_name_and_version
+        from lib_python.wheel_install import get_installed_python_dist_version
+        ret = True
+        wheel_sha256 = get_file_sha256(wheel_fname)
+        state_fname = self._get_wheel_install_state_filename()
+        if is_python_wheel_installed(wheel_fname, wheel_sha256, state_fname):
+            print("Python wheel already installed: " + wheel_fname.name)
+        elif self.is_wheel_install_deferred:
+            queue_python_wheel_install({"app": self.app_cfg_name,
+                                        "wheel": wheel_fname.as_posix(),
+                                        "sha256": wheel_sha256,
+                                        "state_file": state_fname.as_posix(),
+                                        "stamp_file": (self.wheel_install_stamp_fname.as_posix()
+                                                       if self.wheel_install_stamp_fname else None)})
+            print("Python wheel install queued to the end of the run: " + wheel_fname.name)
+        else:
+            dist_name, dist_version = get_python_wheel_dist_name_and_version(wheel_fname)
+            with RockFileLock(rcb_const.RCB__PYTHON_WHEEL_INSTALL_LOCK_FILE_NAME):
+                if get_installed_python_dist_version(dist_name) is None:
+                    # dependencies are installed with the first install of the package
+                    inst_cmd = "pip install " + wheel_fname.as_posix()
+                else:
+                    inst_cmd = "pip install --no-deps --force-reinstall " + wheel_fname.as_posix()
+                ret = self._exec_subprocess_cmd(inst_cmd, exec_dir)
+            if ret:
+                save_python_wheel_install_state(wheel_fname, wheel_sha256, state_fname)
+        return ret
+
+    # install the latest python wheel from the directory
+    def install_python_wheel_from_dir(self, wheel_dir: Path):
+        # app source dir used as exec dir may not exist
+        ret = self._handle_RCB_CALLBACK__INSTALL_PYTHON_WHEEL(
+            rcb_const.RCB_CALLBACK__INSTALL_PYTHON_WHEEL + " " + Path(wheel_dir).as_posix(),
+            Path(wheel_dir).as_posix())
+        return ret
+
+    # Start saving the output of the phase commands to the build/<app>/logs/<phase>.log
+    def _open_phase_log(self, exec_phase_name):
+        from lib_python.phase_log import RockPhaseLog
+        from lib_python.phase_log import get_phase_log_file_name
+        from lib_python.phase_log import get_phase_log_tail_line_cnt
+        self._close_phase_log()
+        self.failed_phase_log = None
+        self.phase_log = RockPhaseLog(get_phase_log_file_name(self.app_build_dir, exec_phase_name),
+                                      get_phase_log_tail_line_cnt())
+        self.is_phase_log_open = True
+
+    def _close_phase_log(self):
+        if self.is_phase_log_open:
+            self.phase_log.close()
+            self.is_phase_log_open = False
+
+    # Printout the last lines of output of the failed phase command
+    def printout_phase_log_tail(self):
+        if self.failed_phase_log:
+            self._close_phase_log()
+            self.failed_phase_log.printout_tail()
+
     def _handle_command_exec(self,
                              exec_phase_name,
                              exec_cmd,
                              cmd_exec_dir):
         ret = True
+        if exec_cmd:
+            self._open_phase_log(exec_phase_name)
+        try:
+            ret = self._handle_command_exec_with_log(exec_phase_name, exec_cmd, cmd_exec_dir)
+        finally:
+            self._close_phase_log()
+        return ret
+
+    def _handle_command_exec_with_log(self,
+                                      exec_phase_name,
+                                      exec_cmd,
+                                      cmd_exec_dir):
+        ret = True
         if exec_cmd:
             exec_cmd = os.path.expandvars(exec_cmd)
             cmd_exec_dir = Path(os.path.expandvars(str(cmd_exec_dir)))
@@ -294,33 +439,63 @@ class RockProjectRepo:
                     )
                     with open(CMD_BUILD_file, "w") as file:
                         file.write(exec_cmd)
-                    ret = self._exec_subprocess_batch_file(str(CMD_BUILD_file))
+                    ret = self._exec_subprocess_batch_file(str(CMD_BUILD_file), cmd_exec_dir)
                 else:
                     # bash can execute multiple commands in same subprocess.run process
-                    print("------ " + exec_phase_name + " start ----------")
-                    self._exec_subprocess_cmd("env", cmd_exec_dir)
-                    print("------ " + exec_phase_name + " end ----------")
-                    time.sleep(1)
+                    self._printout_env(exec_phase_name, cmd_exec_dir)
                     ret = self._exec_subprocess_cmd(exec_cmd, cmd_exec_dir)
             else:
                 # execute just a single command
-                print("------ " + exec_phase_name + " start ----------")
-                self._exec_subprocess_cmd("env", cmd_exec_dir)
-                print("------ " + exec_phase_name + " end ----------")
-                time.sleep(1)
+                self._printout_env(exec_phase_name, cmd_exec_dir)
                 ret = self._exec_subprocess_cmd(exec_cmd, cmd_exec_dir)
         return ret
 
+    # Print the environment variables used for the phase and pause the build.
+    # In fast mode the environment is instead saved to the app build dir.
+    def _printout_env(self, exec_phase_name, cmd_exec_dir):
+        from lib_python.trace_events import sleep_with_trace
+        if is_fast_mode():
+            fname = Path(self.app_build_dir) / rcb_const.RCB__ENV_SNAPSHOT_BASE_DIR / (exec_phase_name + ".env")
+            write_env_snapshot(fname)
+            print("------ " + exec_phase_name + " env: " + fname.as_posix())
+        else:
+            print("------ " + exec_phase_name + " start ----------")
+            self._exec_subprocess_cmd("env", cmd_exec_dir)
+            print("------ " + exec_phase_name + " end ----------")
+            sleep_with_trace(1)
+
     # public methods
     def exec(self, args: list[str | Path], cwd: Path, *, stdout_devnull: bool = False):
+        from lib_python.trace_events import trace_span
+        from lib_python.trace_events import TRACE_CAT_GIT
+        from lib_python.trace_events import TRACE_CAT_CMD
         args = [str(arg) for arg in args]
-        print(f"++ Exec [{cwd}]$ {shlex.join(args)}")
-        subprocess.check_call(
-            args,
-            cwd=str(cwd),
-            stdin=subprocess.DEVNULL,
-            stdout=subprocess.DEVNULL if stdout_devnull else None,
-        )
+        if args[0] == "git":
+            trace_cat = TRACE_CAT_GIT
+        else:
+            trace_cat = TRACE_CAT_CMD
+        with trace_span(shlex.join(args), trace_cat, {"cwd": str(cwd)}):
+            self._exec_command(args, cwd, stdout_devnull)
+
+    def _exec_command(self, args: list[str], cwd: Path, stdout_devnull: bool):
+        if self.exec_log_file:
+            self.exec_log_file.write(f"++ Exec [{cwd}]$ {shlex.join(args)}\n")
+            self.exec_log_file.flush()
+            subprocess.check_call(
+                args,
+                cwd=str(cwd),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL if stdout_devnull else self.exec_log_file,
+                stderr=self.exec_log_file,
+            )
+        else:
+            print(f"++ Exec [{cwd}]$ {shlex.join(args)}")
+            subprocess.check_call(
+                args,
+                cwd=str(cwd),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL if stdout_devnull else None,
+            )
 
     def rev_parse(repo_path: Path, rev: str) -> str | None:
         """Parses a revision to a commit hash, returning None if not found."""
@@ -339,16 +514,21 @@ class RockProjectRepo:
         return raw_output.decode().splitlines()
 
     def list_submodules(
-        self, repo_path: Path, *, relative: bool = False, recursive: bool = True
+        self,
+        repo_path: Path,
+        *,
+        relative: bool = False,
+        recursive: bool = True,
+        populated_only: bool = False,
     ) -> list[Path]:
-        """Gets paths of all submodules (recursively) in the repository."""
-        recursive_args = ["--recursive"] if recursive else []
-        raw_output = subprocess.check_output(
-            ["git", "submodule", "status"] + recursive_args,
-            cwd=str(repo_path),
-        )
-        lines = raw_output.decode().splitlines()
-        relative_paths = [PurePosixPath(line.strip().split()[1]) for line in lines]
+        """Gets paths of all submodules (recursively) in the repository.
+        With populated_only the submodules which have not been checked out
+        (for example the ones outside of the sparse checkout) are left out."""
+        from lib_python.git_submodules import get_submodule_list
+        relative_paths = []
+        for submodule_info in get_submodule_list(repo_path):
+            if (recursive or not submodule_info.is_nested) and (submodule_info.is_populated or not populated_only):
+                relative_paths.append(submodule_info.rel_path)
         if relative:
             return relative_paths
         return [repo_path / p for p in relative_paths]
@@ -362,10 +542,18 @@ class RockProjectRepo:
         lines = raw_output.decode().splitlines()
         return [tuple(line.strip().split()) for line in lines]
 
+    def list_status_tracked(self, repo_path: Path) -> list[str]:
+        """Gets the status lines of the modified tracked files."""
+        raw_output = subprocess.check_output(
+            ["git", "status", "--porcelain", "-uno", "--ignore-submodules"],
+            cwd=str(repo_path),
+        )
+        return raw_output.decode().splitlines()
+
     def get_all_repositories(self, root_path: Path) -> list[Path]:
         """Gets all repository paths, starting with the root and then including all
         recursive submodules."""
-        all_paths = self.list_submodules(root_path)
+        all_paths = self.list_submodules(root_path, populated_only=True)
         all_paths.insert(0, root_path)
         return all_paths
 
@@ -481,12 +669,14 @@ class RockProjectRepo:
     def apply_submodule_patches(
         self, root_repo_path: Path, patches_path: Path, repo_name: str, patchset_name: str
     ):
-        relative_sm_paths = self.list_submodules(root_repo_path, relative=True)
-        for relative_sm_path in relative_sm_paths:
-            self.apply_repo_patches(
-                root_repo_path / relative_sm_path,
-                patches_path / relative_sm_path / patchset_name,
-            )
+        from lib_python.git_submodules import exec_in_repositories_by_nesting_level
+        relative_sm_paths = self.list_submodules(root_repo_path, relative=True, populated_only=True)
+        # submodule patches are applied in parallel, nested submodules after their parent submodule
+        exec_in_repositories_by_nesting_level(relative_sm_paths,
+                                              lambda relative_sm_path: self.apply_repo_patches(
+                                                  root_repo_path / relative_sm_path,
+                                                  patches_path / relative_sm_path / patchset_name,
+                                              ))
 
 
     def apply_all_patches(
@@ -517,7 +707,274 @@ class RockProjectRepo:
         app_patch_dir_name = self.repo_hashtag_to_patches_dir_name(app_patch_dir_name)
         return Path(patch_dir_root / app_name / app_patch_dir_name)
 
+    def _set_app_base_env_variables(self):
+        # app base env variables are set only when the app build is started
+        # because multiple app repositories can exist at the same time
+        if self.app_version_hashtag:
+            app_version = truncate_string(self.app_version_hashtag, 8)
+        else:
+            app_version = ""
+        base_env_dict = {
+            rcb_const.RCB__ENV_VAR__APP_SRC_DIR: self.app_src_dir.as_posix(),
+            rcb_const.RCB__ENV_VAR__APP_BUILD_DIR: self.app_build_dir.as_posix(),
+            rcb_const.RCB__ENV_VAR__APP_VERSION: app_version,
+        }
+        for env_var_key, env_var_new_value in base_env_dict.items():
+            if env_var_key not in self.orig_env_variables_hashtable:
+                self.orig_env_variables_hashtable[env_var_key] = os.environ.get(env_var_key)
+            os.environ[env_var_key] = env_var_new_value
+
+    def _set_compiler_cache_env_variables(self):
+        from lib_python.compiler_cache import get_compiler_cache
+        compiler_cache = get_compiler_cache()
+        if compiler_cache:
+            if compiler_cache.is_available():
+                # wrappers are not stored to app build dir because clean phase deletes it
+                wrapper_dir = rcb_const.RCB__APP_BUILD_ROOT_DIR / rcb_const.RCB__COMPILER_CACHE_WRAPPER_BASE_DIR / self.app_name
+                cache_env_dict = compiler_cache.get_env_variables(wrapper_dir)
+                for env_var_key, env_var_new_value in cache_env_dict.items():
+                    if env_var_key not in self.orig_compiler_cache_env_variables_hashtable:
+                        self.orig_compiler_cache_env_variables_hashtable[env_var_key] = os.environ.get(env_var_key)
+                    os.environ[env_var_key] = env_var_new_value
+            else:
+                print("Warning, compiler cache not found: " + compiler_cache.cache_type)
+
+    # Resolve the commit sha of the app version from the remote repository
+    # without fetching it. Returns None if the version can not be resolved.
+    def get_remote_version_sha(self):
+        ret = None
+        version = self.app_version_hashtag
+        if not self.app_repo_url or not version:
+            return ret
+        if len(version) == 40 and all(c in "0123456789abcdef" for c in version.lower()):
+            ret = version.lower()
+            return ret
+        # tags fetched by the earlier checkouts are resolved without network access
+        if (self.app_src_dir / ".git").exists():
+            ret = self._get_commit_sha(self.app_src_dir, "refs/tags/" + version)
+            if ret:
+                return ret
+        ret = self._get_cached_version_sha(version)
+        if ret:
+            return ret
+        try:
+            raw_output = subprocess.check_output(
+                ["git", "ls-remote", self.app_repo_url, version, version + "^{}"],
+                stdin=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=120,
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            return ret
+        ref_dict = {}
+        for line in raw_output.decode().splitlines():
+            line_arr = line.split()
+            if len(line_arr) == 2:
+                ref_dict[line_arr[1]] = line_arr[0]
+        # peeled annotated tag first, then tag and branch
+        for ref_name in ["refs/tags/" + version + "^{}",
+                         "refs/tags/" + version,
+                         "refs/heads/" + version,
+                         version]:
+            if ref_name in ref_dict:
+                ret = ref_dict[ref_name]
+                break
+        if ret:
+            self._set_cached_version_sha(version, ret)
+        return ret
+
+    # Seconds the versions resolved with git ls-remote are cached. 0 = cache disabled
+    def _get_ls_remote_cache_ttl(self):
+        ret = rcb_const.RCB__LS_REMOTE_CACHE_TTL
+        value = os.environ.get(rcb_const.RCB__ENV_VAR__LS_REMOTE_CACHE_TTL)
+        if value:
+            try:
+                ret = max(0, int(value))
+            except ValueError:
+                print("Warning, invalid " + rcb_const.RCB__ENV_VAR__LS_REMOTE_CACHE_TTL + " value: " + value)
+        return ret
+
+    def _read_ls_remote_cache(self):
+        ret = {}
+        try:
+            with open(self.app_build_dir / rcb_const.RCB__LS_REMOTE_CACHE_FILE_NAME, "r") as cache_file:
+                ret = json.load(cache_file)
+        except (OSError, ValueError):
+            ret = {}
+        return ret
+
+    # Returns the commit sha cached for the app version or None if it is not cached or has expired
+    def _get_cached_version_sha(self, version: str):
+        ret = None
+        ttl = self._get_ls_remote_cache_ttl()
+        if ttl > 0:
+            entry = self._read_ls_remote_cache().get(self.app_repo_url + " " + version)
+            if entry and (0 <= time.time() - entry.get("time", 0) < ttl):
+                ret = entry.get("sha")
+        return ret
+
+    def _set_cached_version_sha(self, version: str, version_sha: str):
+        import tempfile
+        if self._get_ls_remote_cache_ttl() > 0:
+            cache_dict = self._read_ls_remote_cache()
+            cache_dict[self.app_repo_url + " " + version] = {"sha": version_sha, "time": time.time()}
+            # checkout can run on background thread, so the file is replaced atomically
+            try:
+                self.app_build_dir.mkdir(parents=True, exist_ok=True)
+                fd, tmp_fname = tempfile.mkstemp(prefix=rcb_const.RCB__LS_REMOTE_CACHE_FILE_NAME + ".",
+                                                 dir=self.app_build_dir)
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump(cache_dict, tmp_file, indent=4, sort_keys=True)
+                os.replace(tmp_fname, self.app_build_dir / rcb_const.RCB__LS_REMOTE_CACHE_FILE_NAME)
+            except OSError:
+                pass
+
+    # Returns the commit sha of the revision in the repository or None
+    def _get_commit_sha(self, repo_dir: Path, rev: str):
+        ret = None
+        try:
+            ret = subprocess.check_output(["git", "rev-parse", "--verify", "--quiet", rev + "^{commit}"],
+                                          cwd=str(repo_dir),
+                                          stderr=subprocess.DEVNULL,
+                                          text=True).strip()
+        except subprocess.CalledProcessError:
+            ret = None
+        return ret or None
+
+    def _get_checkout_state_filename(self):
+        return self.app_src_dir / ".git" / rcb_const.RCB__CHECKOUT_STATE_FILE_NAME
+
+    # Save the checkout inputs and the commits of the main repository and the
+    # submodules after the checkout so that the next checkout can be skipped
+    # if nothing has changed.
+    def _save_checkout_state(self, checkout_inputs: dict):
+        from lib_python.git_submodules import exec_in_repositories
+        repo_dict = {}
+        repo_dir_list = self.get_all_repositories(self.app_src_dir)
+        repo_state_list = exec_in_repositories(repo_dir_list,
+                                               lambda repo_dir: {
+                                                   "head": self._get_commit_sha(repo_dir, "HEAD"),
+                                                   "diffbase": self._get_commit_sha(repo_dir, TAG_UPSTREAM_DIFFBASE),
+                                               })
+        for repo_dir, repo_state in zip(repo_dir_list, repo_state_list):
+            repo_dict[Path(repo_dir).relative_to(self.app_src_dir).as_posix()] = repo_state
+        with open(self._get_checkout_state_filename(), "w") as state_file:
+            json.dump({"inputs": checkout_inputs, "repositories": repo_dict}, state_file, indent=4, sort_keys=True)
+
+    # Returns True if the source tree is already checked out with the same inputs.
+    # Repositories whose HEAD has moved (for example by the hipify commits) or
+    # which have local changes are reset to the commit saved after the checkout.
+    def _restore_checkout_state(self, checkout_inputs: dict):
+        from lib_python.git_submodules import exec_in_repositories
+        ret = False
+        try:
+            with open(self._get_checkout_state_filename(), "r") as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return ret
+        if not checkout_inputs["version_sha"] or state.get("inputs") != checkout_inputs:
+            return ret
+        repo_state_dict = state.get("repositories", {})
+        # empty submodule directory would resolve to the commits of the parent repository
+        if not all((self.app_src_dir / rel_path / ".git").exists() for rel_path in repo_state_dict):
+            return ret
+
+        # Returns "ok", "reset" or "changed"
+        def check_repo(rel_path):
+            ret = "ok"
+            repo_dir = self.app_src_dir / rel_path
+            repo_state = repo_state_dict[rel_path]
+            if self._get_commit_sha(repo_dir, TAG_UPSTREAM_DIFFBASE) != repo_state["diffbase"]:
+                ret = "changed"
+            elif self._get_commit_sha(repo_dir, "HEAD") != repo_state["head"] or self.list_status_tracked(repo_dir):
+                if self._get_commit_sha(repo_dir, repo_state["head"]) is None:
+                    ret = "changed"
+                else:
+                    ret = "reset"
+            return ret
+
+        rel_path_list = list(repo_state_dict.keys())
+        res_list = exec_in_repositories(rel_path_list, check_repo)
+        if "changed" in res_list:
+            return ret
+        reset_list = [rel_path for rel_path, res in zip(rel_path_list, res_list) if res == "reset"]
+        exec_in_repositories(reset_list,
+                             lambda rel_path: self.exec(["git", "reset", "--hard", "--quiet",
+                                                         repo_state_dict[rel_path]["head"]],
+                                                        cwd=self.app_src_dir / rel_path))
+        ret = True
+        return ret
+
+    # patch directory used for the app or None if app does not have patches
+    def get_app_patch_dir(self):
+        ret = None
+        if not self.app_patch_dir_base_name:
+            return ret
+        for cur_patch_dir_root in self.patch_dir_root_arr:
+            full_patch_dir = self.get_app_patch_dir_root(cur_patch_dir_root,
+                                                        self.app_name,
+                                                        self.app_patch_dir_base_name)
+            if full_patch_dir.is_dir():
+                # patches are applied only from the first directory that exist
+                ret = full_patch_dir
+                break
+        return ret
+
+    # hash of the base and hipified patches applied to the app
+    def get_patch_set_hash(self):
+        ret = ""
+        patch_dir = self.get_app_patch_dir()
+        if patch_dir:
+            ret = get_dir_content_sha256(patch_dir)
+        return ret
+
+    # Upstream commit of the app version. Resolved from the remote repository so that the
+    # moved branches and tags are noticed, or from the current checkout if it can not be resolved.
+    def get_src_commit_sha(self):
+        ret = self.get_remote_version_sha()
+        if not ret and (self.app_src_dir / ".git").exists():
+            ret = self._get_commit_sha(self.app_src_dir, TAG_UPSTREAM_DIFFBASE)
+        return ret
+
+    # Hash of the source tree of the app and of its submodules.
+    # (tree of the app repository if it does not have submodules)
+    def get_src_tree_hash(self):
+        from lib_python.git_submodules import exec_in_repositories
+        ret = None
+        if (self.app_src_dir / ".git").exists():
+            def get_tree_sha(repo_dir):
+                try:
+                    ret = subprocess.check_output(
+                        ["git", "rev-parse", "HEAD^{tree}"],
+                        cwd=str(repo_dir),
+                        stderr=subprocess.DEVNULL,
+                    ).decode().strip()
+                except subprocess.CalledProcessError:
+                    ret = None
+                return ret
+            ret = get_tree_sha(self.app_src_dir)
+            try:
+                rel_path_list = self.list_submodules(self.app_src_dir, relative=True, populated_only=True)
+            except subprocess.CalledProcessError:
+                rel_path_list = []
+            if ret and rel_path_list:
+                tree_sha_list = exec_in_repositories([self.app_src_dir / rel_path for rel_path in rel_path_list],
+                                                     get_tree_sha)
+                tree_hash = hashlib.sha256((". " + ret + "\n").encode())
+                for rel_path, tree_sha in zip(rel_path_list, tree_sha_list):
+                    tree_hash.update((rel_path.as_posix() + " " + str(tree_sha) + "\n").encode())
+                ret = tree_hash.hexdigest()
+        return ret
+
+    # env variables set for the app and their current values
+    def get_app_env_variables(self):
+        ret = {}
+        for env_var_key in sorted(self.orig_env_variables_hashtable.keys()):
+            ret[env_var_key] = os.environ.get(env_var_key)
+        return ret
+
     def do_env_setup(self, rocm_sdk_setup_cmd_list, prj_env_setup_cmd_list):
+        self._set_app_base_env_variables()
         env_setup_cmd_list = []
         if rocm_sdk_setup_cmd_list:
             env_setup_cmd_list = rocm_sdk_setup_cmd_list
@@ -551,22 +1008,30 @@ class RockProjectRepo:
                     sys.exit(1)
         else:
             print("No environment settings specified")
-        print("------ env-settings start ----------")
-        self._exec_subprocess_cmd("env", ".")
-        print("------ env-settings end ----------")
-
+        # compiler cache wraps the compilers set by the app env settings
+        self._set_compiler_cache_env_variables()
         # create build dir
         cur_p = Path(self.app_build_dir)
         cur_p.mkdir(parents=True, exist_ok=True)
         ret = cur_p.is_dir()
+        if is_fast_mode():
+            fname = cur_p / rcb_const.RCB__ENV_SNAPSHOT_BASE_DIR / "env_setup.env"
+            write_env_snapshot(fname)
+            print("------ env-settings: " + fname.as_posix())
+        else:
+            print("------ env-settings start ----------")
+            self._exec_subprocess_cmd("env", ".")
+            print("------ env-settings end ----------")
         return ret
 
     def undo_env_setup(self):
         #print("undo_env_setup")
+        orig_env_dict = dict(self.orig_compiler_cache_env_variables_hashtable)
+        orig_env_dict.update(self.orig_env_variables_hashtable)
         for (
             env_var_key,
             orig_env_var_value,
-        ) in self.orig_env_variables_hashtable.items():
+        ) in orig_env_dict.items():
             # print("stored restore key: " + env_var_key)
             if orig_env_var_value is None:
                 # print("delete: " + env_var_key)
@@ -600,17 +1065,37 @@ class RockProjectRepo:
         self,
         repo_fetch_depth=1,
         repo_fetch_tags=False,
-        repo_fetch_job_cnt=1,
+        repo_fetch_job_cnt=0,
+        repo_clone_filter=None,
+        repo_sparse_path_list=None,
         apply_patches_enabled=1,
         hipify_enabled=1,
         repo_remote_name="origin",
     ):
+        from lib_python.git_mirror import get_git_mirror
+        from lib_python.git_submodules import exec_in_repositories
         ret = True
         print("do_checkout started")
+        checkout_inputs = {
+            "repo_url": self.app_repo_url,
+            "version": self.app_version_hashtag,
+            "version_sha": None,
+            "repo_fetch_depth": repo_fetch_depth,
+            "repo_fetch_tags": repo_fetch_tags or False,
+            "repo_clone_filter": repo_clone_filter,
+            "repo_sparse_path_list": repo_sparse_path_list or [],
+            "patch_set": self.get_patch_set_hash() if apply_patches_enabled else None,
+        }
         dot_git_subdir = self.app_src_dir / ".git"
         if dot_git_subdir.exists():
-            # print(f"Not cloning repository ({dot_git_subdir} exists)")
-            pass
+            # no-op checkout if the source tree is already at the requested version
+            checkout_inputs["version_sha"] = self.get_remote_version_sha()
+            if self._restore_checkout_state(checkout_inputs):
+                print("Source code is already checked out at " + self.app_version_hashtag +
+                      " (" + checkout_inputs["version_sha"] + ")")
+                return ret
+            # remove old state so that the interrupted checkout is not used later
+            self._get_checkout_state_filename().unlink(missing_ok=True)
         else:
             print(f"Cloning repository at {self.app_version_hashtag}")
             self.app_src_dir.mkdir(parents=True, exist_ok=True)
@@ -626,24 +1111,52 @@ class RockProjectRepo:
                 cwd=self.app_src_dir,
             )
 
+        # with sparse checkout only the listed directories are written to the
+        # work tree and with partial clone only their blobs are downloaded
+        self.set_sparse_checkout(self.app_src_dir, repo_sparse_path_list)
+        # with git mirror the objects are fetched first to mirror and
+        # then the app repository borrows them from the mirror
+        git_mirror = get_git_mirror()
+        is_nearest_tag_fetch = (repo_fetch_tags == rcb_const.RCB__FETCH_REPO_TAGS_NEAREST)
+        if is_nearest_tag_fetch and git_mirror:
+            # objects are shared from the mirror, so the full history is fetched only once
+            is_nearest_tag_fetch = False
+            repo_fetch_depth = 0
+            repo_fetch_tags = True
+
         # fetch and checkout
         fetch_args = []
         fetch_args_main_prj_only = []
         if repo_fetch_depth:
             fetch_args.extend(["--depth", str(repo_fetch_depth)])
-        if repo_fetch_tags:
+        if repo_clone_filter:
+            if git_mirror:
+                # mirrors are used as reference repositories and need all objects
+                print("Partial clone filter " + repo_clone_filter + " is not used with git mirror")
+            else:
+                # partial clone filter is applied also to the submodules
+                fetch_args.extend(["--filter=" + repo_clone_filter])
+        if repo_fetch_tags is True:
             # can not go to submodule fetch
             # fetch also tags when full fetch is wanted because
             # full fetch may be wanted for apps which will checkout tags
             fetch_args_main_prj_only.extend(["--tags"])
-        if repo_fetch_job_cnt:
-            fetch_args.extend(["-j", str(repo_fetch_job_cnt)])
         self.exec(["git", "reset", "--hard"], cwd=self.app_src_dir)
+        fetch_remote = "origin"
+        # ref fetched from the remote, used also to deepen the history
+        fetch_ref_args = ["tag", self.app_version_hashtag]
+        if git_mirror:
+            git_mirror.add_alternates(self.exec, self.app_src_dir, self.app_repo_url)
+            fetch_remote = git_mirror.get_mirror_url(self.app_repo_url)
         try:
+            if git_mirror:
+                git_mirror.fetch(self.exec,
+                                 self.app_repo_url,
+                                 fetch_args + fetch_args_main_prj_only + ["origin", "tag", self.app_version_hashtag])
             self.exec(
                 ["git", "fetch", "--force"]
                 + fetch_args + fetch_args_main_prj_only
-                + ["origin", "tag", self.app_version_hashtag],
+                + [fetch_remote, "tag", self.app_version_hashtag],
                 cwd=self.app_src_dir,
             )
             self.exec(
@@ -653,16 +1166,33 @@ class RockProjectRepo:
         except:
             try:
                 # no git tag available, fetch and checkout other way
+                fetch_version = self.app_version_hashtag
+                if git_mirror:
+                    fetch_version = git_mirror.get_mirror_ref_name(self.app_version_hashtag)
+                    git_mirror.fetch(self.exec,
+                                     self.app_repo_url,
+                                     fetch_args + fetch_args_main_prj_only
+                                     + ["origin", "+" + self.app_version_hashtag + ":" + fetch_version])
+                fetch_ref_args = [fetch_version]
                 self.exec(
                     ["git", "fetch", "--force"]
                     + fetch_args + fetch_args_main_prj_only
-                    + ["origin", self.app_version_hashtag],
+                    + [fetch_remote] + fetch_ref_args,
                     cwd=self.app_src_dir,
                 )
                 self.exec(["git", "checkout", "FETCH_HEAD"], cwd=self.app_src_dir)
             except:
                 print("Failed to checkout source code.")
                 sys.exit(1)
+        if is_nearest_tag_fetch:
+            try:
+                self.fetch_nearest_tags(self.app_src_dir, fetch_remote, fetch_ref_args, fetch_args)
+            except subprocess.CalledProcessError:
+                print("Failed to fetch the nearest tag of the version: " + self.app_version_hashtag)
+                sys.exit(1)
+        # commit of the version checked out before the patches are applied
+        checkout_inputs["version_sha"] = self._get_commit_sha(self.app_src_dir, "HEAD")
+        self._set_cached_version_sha(self.app_version_hashtag, checkout_inputs["version_sha"])
         if apply_patches_enabled:
             # Apply base patches to main repository. Patches to
             # submodules will be applied later. This enables patches
@@ -689,24 +1219,17 @@ class RockProjectRepo:
             cwd=self.app_src_dir,
         )
         try:
-            self.exec(
-                ["git", "submodule", "update", "--init", "--recursive"] + fetch_args,
-                cwd=self.app_src_dir,
-            )
+            self.update_submodules(git_mirror, self.app_src_dir, fetch_args, repo_fetch_job_cnt,
+                                   repo_sparse_path_list)
         except subprocess.CalledProcessError:
             print("Failed to fetch git submodules")
             sys.exit(1)
-        self.exec(
-            [
-                "git",
-                "submodule",
-                "foreach",
-                "--recursive",
-                f"git tag -f {TAG_UPSTREAM_DIFFBASE} --no-sign",
-            ],
-            cwd=self.app_src_dir,
-            stdout_devnull=True,
-        )
+        exec_in_repositories(self.list_submodules(self.app_src_dir, populated_only=True),
+                             lambda submodule_dir: self.exec(
+                                 ["git", "tag", "-f", TAG_UPSTREAM_DIFFBASE, "--no-sign"],
+                                 cwd=submodule_dir,
+                                 stdout_devnull=True,
+                             ))
 
         self.git_config_ignore_submodules(self.app_src_dir)
 
@@ -727,32 +1250,370 @@ class RockProjectRepo:
                     )
                     # apply patches only from the first directory that exist
                     break
+        self._save_checkout_state(checkout_inputs)
+        return ret
+
+    # Returns dictionary from commit sha to the names of the release tags pointing to it in the remote repository.
+    # Other tags, like the thousands of ci tags in the pytorch repository, are not listed.
+    def _get_remote_tag_dict(self, repo_dir: Path, fetch_remote: str):
+        ret = {}
+        raw_output = subprocess.check_output(["git", "ls-remote", "--tags", fetch_remote,
+                                              "refs/tags/" + rcb_const.RCB__FETCH_NEAREST_TAG_PATTERN],
+                                             cwd=str(repo_dir),
+                                             stdin=subprocess.DEVNULL,
+                                             text=True)
+        tag_sha_dict = {}
+        for line in raw_output.splitlines():
+            line_arr = line.split()
+            if len(line_arr) == 2 and line_arr[1].startswith("refs/tags/"):
+                tag_sha_dict[line_arr[1][len("refs/tags/"):]] = line_arr[0]
+        for tag_name, tag_sha in tag_sha_dict.items():
+            if not tag_name.endswith("^{}"):
+                # annotated tags are peeled to the commit
+                commit_sha = tag_sha_dict.get(tag_name + "^{}", tag_sha)
+                ret.setdefault(commit_sha, []).append(tag_name)
+        return ret
+
+    # Returns the number of commits in the history of the HEAD, the tags pointing to them
+    # and whether the history is shallow
+    def _get_history_tag_list(self, repo_dir: Path, tag_dict: dict):
+        commit_list = subprocess.check_output(["git", "rev-list", "HEAD"],
+                                              cwd=str(repo_dir),
+                                              text=True).split()
+        found_tag_list = []
+        for commit_sha in commit_list:
+            found_tag_list.extend(tag_dict.get(commit_sha, []))
+        is_shallow = subprocess.check_output(["git", "rev-parse", "--is-shallow-repository"],
+                                             cwd=str(repo_dir),
+                                             text=True).strip() == "true"
+        return len(commit_list), found_tag_list, is_shallow
+
+    # Deepen the shallow history of the repository until it contains a tagged commit
+    # and fetch the tags pointing to the commits of the history. After this "git describe --tags"
+    # gives the same result as with the full history, which is read by the version scripts
+    # of the apps, while only the commits after the nearest tag are downloaded.
+    def fetch_nearest_tags(self, repo_dir: Path, fetch_remote: str, fetch_ref_args: list[str], fetch_args: list[str]):
+        tag_dict = self._get_remote_tag_dict(repo_dir, fetch_remote)
+        if not tag_dict:
+            print("No " + rcb_const.RCB__FETCH_NEAREST_TAG_PATTERN + " tags found from the repository: " + fetch_remote)
+            return
+        if "--depth" in fetch_args:
+            ii = fetch_args.index("--depth")
+            fetch_args = fetch_args[:ii] + fetch_args[ii + 2:]
+        depth, found_tag_list, is_shallow = self._get_history_tag_list(repo_dir, tag_dict)
+        if not found_tag_list and is_shallow:
+            # history is fetched until the tagged commits and then deepened
+            # by one commit to get the tagged commits themselves
+            tag_name_list = sorted(tag_name for tag_list in tag_dict.values() for tag_name in tag_list)
+            try:
+                self.exec(["git", "fetch"] + ["--shallow-exclude=" + tag_name for tag_name in tag_name_list]
+                          + fetch_args + [fetch_remote] + fetch_ref_args,
+                          cwd=repo_dir)
+                self.exec(["git", "fetch", "--deepen=1"] + fetch_args + [fetch_remote] + fetch_ref_args,
+                          cwd=repo_dir)
+            except subprocess.CalledProcessError:
+                print("Failed to fetch the history until the tags, deepening the history until a tag is found")
+            depth, found_tag_list, is_shallow = self._get_history_tag_list(repo_dir, tag_dict)
+        prev_depth = 0
+        while not found_tag_list and is_shallow:
+            # remote does not support the --shallow-exclude
+            if depth >= rcb_const.RCB__FETCH_NEAREST_TAG_MAX_DEPTH or depth == prev_depth:
+                print("No tag found within " + str(depth) + " commits, fetching the full history")
+                self.exec(["git", "fetch", "--unshallow"] + fetch_args + [fetch_remote] + fetch_ref_args, cwd=repo_dir)
+            else:
+                # history depth is doubled on each round
+                self.exec(["git", "fetch", "--deepen=" + str(depth)] + fetch_args + [fetch_remote] + fetch_ref_args,
+                          cwd=repo_dir)
+            prev_depth = depth
+            depth, found_tag_list, is_shallow = self._get_history_tag_list(repo_dir, tag_dict)
+        if found_tag_list:
+            self.exec(["git", "fetch", "--no-tags", "--force"] + fetch_args + [fetch_remote]
+                      + ["+refs/tags/" + tag_name + ":refs/tags/" + tag_name for tag_name in found_tag_list],
+                      cwd=repo_dir)
+            res = subprocess.run(["git", "describe", "--tags", "--match", rcb_const.RCB__FETCH_NEAREST_TAG_PATTERN],
+                                 cwd=str(repo_dir),
+                                 capture_output=True,
+                                 text=True)
+            print("Nearest tag found within " + str(depth) + " commits: " + res.stdout.strip())
+        else:
+            print("No tags found from the history of the version: " + self.app_version_hashtag)
+
+    # Set the directories checked out from the repository with cone mode sparse checkout.
+    # Files in the repository root are always checked out. Sparse checkout is
+    # disabled if the path list is empty and it has been enabled earlier.
+    def set_sparse_checkout(self, repo_dir: Path, sparse_path_list):
+        if sparse_path_list:
+            print("Sparse checkout: " + " ".join(sparse_path_list))
+            self.exec(["git", "sparse-checkout", "set", "--cone"] + sparse_path_list, cwd=repo_dir)
+        elif self._get_git_config_value(repo_dir, "core.sparseCheckout") == "true":
+            self.exec(["git", "sparse-checkout", "disable"], cwd=repo_dir)
+
+    # Returns list of (name, path) tuples of the submodules of the repository
+    def _get_submodule_name_and_path_list(self, repo_dir: Path):
+        ret = []
+        if (repo_dir / ".gitmodules").exists():
+            try:
+                output = subprocess.check_output(
+                    ["git", "config", "-f", ".gitmodules", "--get-regexp", r"^submodule\..*\.path$"],
+                    cwd=str(repo_dir),
+                    text=True,
+                )
+            except subprocess.CalledProcessError:
+                output = ""
+            for cur_line in output.splitlines():
+                key, path = cur_line.split(" ", 1)
+                ret.append((key[len("submodule."):-len(".path")], path))
+        return ret
+
+    def _get_git_config_value(self, repo_dir: Path, key: str):
+        ret = None
+        try:
+            ret = subprocess.check_output(["git", "config", "--get", key],
+                                          cwd=str(repo_dir),
+                                          text=True).strip()
+        except subprocess.CalledProcessError:
+            ret = None
+        return ret
+
+    # Returns the auto-tuned submodule fetch job count.
+    # Fetches are network bound, so the job count is not limited by the cpu count.
+    def _get_auto_fetch_job_cnt(self, submodule_cnt: int):
+        ret = max(1, min(submodule_cnt, rcb_const.RCB__FETCH_JOBS_AUTO_MAX))
+        return ret
+
+    # Remove the partially cloned submodule before it is fetched again
+    def _clean_failed_submodule(self, repo_dir: Path, name: str, path: str):
+        git_dir = Path(subprocess.check_output(["git", "rev-parse", "--absolute-git-dir"],
+                                               cwd=str(repo_dir),
+                                               text=True).strip())
+        module_git_dir = git_dir / "modules" / name
+        if module_git_dir.exists():
+            shutil.rmtree(module_git_dir, ignore_errors=True)
+        submodule_dir = repo_dir / path
+        if submodule_dir.exists():
+            shutil.rmtree(submodule_dir, ignore_errors=True)
+            submodule_dir.mkdir(parents=True, exist_ok=True)
+
+    # Fetch and checkout a single submodule.
+    # With git mirror the submodule commit is fetched first to the git mirror of
+    # the submodule url and the submodule is cloned from the mirror with the mirror
+    # as a reference repository. Submodule remote url is set to the original url after the clone.
+    # Returns the repository dir of the submodule.
+    def _update_submodule(self, git_mirror, repo_dir: Path, name: str, path: str, fetch_args: list[str]):
+        # partial clone filter can only be used when the submodule is initialized by the update
+        if any(cur_arg.startswith("--filter=") for cur_arg in fetch_args):
+            fetch_args = ["--init"] + fetch_args
+        url = self._get_git_config_value(repo_dir, "submodule." + name + ".url")
+        is_mirror_used = False
+        if git_mirror:
+            ls_files_output = subprocess.check_output(["git", "ls-files", "-s", "--", path],
+                                                      cwd=str(repo_dir),
+                                                      text=True).split()
+            if len(ls_files_output) >= 2:
+                is_mirror_used = git_mirror.fetch_commit(self.exec, url, ls_files_output[1], fetch_args)
+            if not is_mirror_used:
+                print("Could not fetch submodule commit to git mirror, fetching it from: " + url)
+        if is_mirror_used:
+            mirror_dir = git_mirror.get_mirror_dir(url).resolve().as_posix()
+            # url is overridden only for this command because the submodules
+            # are updated in parallel and they would compete from the config file lock.
+            # file protocol is disabled by default for submodules.
+            self.exec(["git",
+                       "-c", "protocol.file.allow=always",
+                       "-c", "submodule." + name + ".url=" + git_mirror.get_mirror_url(url),
+                       "submodule", "update", "--reference", mirror_dir]
+                      + fetch_args + ["--", path],
+                      cwd=repo_dir)
+            self.exec(["git", "remote", "set-url", "origin", url], cwd=repo_dir / path)
+        else:
+            self.exec(["git", "submodule", "update"] + fetch_args + ["--", path],
+                      cwd=repo_dir)
+        return repo_dir / path
+
+    # Returns list of (repo_dir, name, path) of the submodules to update in the repository.
+    # Submodules outside of the sparse checkout directories are not updated.
+    def _init_submodules(self, repo_dir: Path, sparse_path_list=None):
+        ret = []
+        self.exec(["git", "submodule", "init"], cwd=repo_dir)
+        for name, path in self._get_submodule_name_and_path_list(repo_dir):
+            if sparse_path_list and not is_path_in_sparse_checkout(path, sparse_path_list):
+                continue
+            url = self._get_git_config_value(repo_dir, "submodule." + name + ".url")
+            if url and (self._get_git_config_value(repo_dir, "submodule." + name + ".update") != "none"):
+                ret.append((repo_dir, name, path))
+        return ret
+
+    # Same as "git submodule update --init --recursive" but the submodules are fetched
+    # in parallel by using fetch_job_cnt threads. (0 = auto-tuned job count)
+    #
+    # Each failed submodule fetch is retried separately with a smaller job count
+    # after a delay. Nested submodules are fetched when their parent submodule is ready.
+    # Time used for fetching each submodule is printed in the end.
+    def update_submodules(self, git_mirror, repo_dir: Path, fetch_args: list[str], fetch_job_cnt: int,
+                          sparse_path_list=None):
+        import concurrent.futures
+        from lib_python.trace_events import sleep_with_trace
+        from lib_python.git_submodules import invalidate_submodule_list
+        # submodules populated by the update are not in the cached inventory
+        invalidate_submodule_list(repo_dir)
+        pending_list = self._init_submodules(repo_dir, sparse_path_list)
+        if not pending_list:
+            return
+        if not fetch_job_cnt:
+            fetch_job_cnt = self._get_auto_fetch_job_cnt(len(pending_list))
+        time_dict = {}
+        start_time = time.monotonic()
+
+        def update_submodule_task(task):
+            task_start_time = time.monotonic()
+            submodule_dir = self._update_submodule(git_mirror, task[0], task[1], task[2], fetch_args)
+            return (submodule_dir, time.monotonic() - task_start_time)
+
+        for retry_cnt in range(rcb_const.RCB__FETCH_RETRY_CNT + 1):
+            if retry_cnt > 0:
+                # server may limit the number of connections, slow down
+                fetch_job_cnt = max(1, fetch_job_cnt // 2)
+                delay = rcb_const.RCB__FETCH_RETRY_DELAY * retry_cnt
+                print("Retrying " + str(len(pending_list)) + " failed submodule fetches in " +
+                      str(delay) + " sec with " + str(fetch_job_cnt) + " jobs")
+                sleep_with_trace(delay)
+                for task in pending_list:
+                    self._clean_failed_submodule(task[0], task[1], task[2])
+            print("Fetching submodules with " + str(fetch_job_cnt) + " jobs")
+            failed_list = []
+            with concurrent.futures.ThreadPoolExecutor(max_workers=fetch_job_cnt) as executor:
+                future_dict = {}
+                for task in pending_list:
+                    future_dict[executor.submit(update_submodule_task, task)] = task
+                while future_dict:
+                    done_set, _ = concurrent.futures.wait(future_dict,
+                                                          return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done_set:
+                        task = future_dict.pop(future)
+                        try:
+                            submodule_dir, elapsed = future.result()
+                        except subprocess.CalledProcessError:
+                            failed_list.append(task)
+                            continue
+                        time_dict[submodule_dir] = time_dict.get(submodule_dir, 0) + elapsed
+                        # nested submodules
+                        for nested_task in self._init_submodules(submodule_dir):
+                            future_dict[executor.submit(update_submodule_task, nested_task)] = nested_task
+            pending_list = failed_list
+            if not pending_list:
+                break
+        invalidate_submodule_list(repo_dir)
+        print("Submodule fetch times:")
+        for submodule_dir, elapsed in sorted(time_dict.items(), key=lambda item: item[1], reverse=True):
+            print("    " + str(round(elapsed, 1)).rjust(8) + " sec  " + submodule_dir.relative_to(repo_dir).as_posix())
+        print("    " + str(round(time.monotonic() - start_time, 1)).rjust(8) + " sec  total")
+        if pending_list:
+            for task in pending_list:
+                print("Failed to fetch submodule: " + (task[0] / task[2]).as_posix())
+            raise subprocess.CalledProcessError(1, "git submodule update")
+
+    def _get_hipify_state_filename(self):
+        return self.app_src_dir / ".git" / rcb_const.RCB__HIPIFY_STATE_FILE_NAME
+
+    # Fingerprint of the hipify inputs: the commits of the main repository and the
+    # submodules before the hipify, hipify command and the hipified patches.
+    # Returns None if any repository has local changes which are not part of the commits.
+    def _get_hipify_fingerprint(self, CMD_HIPIFY, repo_dir_list: list):
+        from lib_python.git_submodules import exec_in_repositories
+        ret = None
+        repo_state_list = exec_in_repositories(repo_dir_list,
+                                               lambda repo_dir: (self._get_commit_sha(repo_dir, "HEAD"),
+                                                                 self.list_status(repo_dir)))
+        if any(head is None or status for head, status in repo_state_list):
+            return ret
+        inputs = {
+            "cmd": os.path.expandvars(str(CMD_HIPIFY)) if CMD_HIPIFY else None,
+            "patch_set": self.get_patch_set_hash(),
+            "heads": {},
+        }
+        for repo_dir, repo_state in zip(repo_dir_list, repo_state_list):
+            inputs["heads"][Path(repo_dir).relative_to(self.app_src_dir).as_posix()] = repo_state[0]
+        ret = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+        return ret
+
+    # Save the commits created by the hipify and by the hipified patches
+    def _save_hipify_state(self, fingerprint: str):
+        from lib_python.git_submodules import exec_in_repositories
+        repo_dict = {}
+        repo_dir_list = self.get_all_repositories(self.app_src_dir)
+        repo_state_list = exec_in_repositories(repo_dir_list,
+                                               lambda repo_dir: {
+                                                   "head": self._get_commit_sha(repo_dir, "HEAD"),
+                                                   "hipify_diffbase": self._get_commit_sha(repo_dir, TAG_HIPIFY_DIFFBASE),
+                                               })
+        for repo_dir, repo_state in zip(repo_dir_list, repo_state_list):
+            repo_dict[Path(repo_dir).relative_to(self.app_src_dir).as_posix()] = repo_state
+        with open(self._get_hipify_state_filename(), "w") as state_file:
+            json.dump({"fingerprint": fingerprint, "repositories": repo_dict}, state_file, indent=4, sort_keys=True)
+
+    # Move the repositories to the commits created by the earlier hipify with same inputs.
+    # Returns False if the hipify needs to be executed.
+    def _restore_hipify_state(self, fingerprint: str, repo_dir_list: list):
+        from lib_python.git_submodules import exec_in_repositories
+        ret = False
+        try:
+            with open(self._get_hipify_state_filename(), "r") as state_file:
+                state = json.load(state_file)
+        except (OSError, ValueError):
+            return ret
+        if state.get("fingerprint") != fingerprint:
+            return ret
+        repo_state_dict = state.get("repositories", {})
+        rel_path_list = [Path(repo_dir).relative_to(self.app_src_dir).as_posix() for repo_dir in repo_dir_list]
+        if sorted(rel_path_list) != sorted(repo_state_dict.keys()):
+            return ret
+        # commits can be missing if the repository has been garbage collected
+        res_list = exec_in_repositories(rel_path_list,
+                                        lambda rel_path: self._get_commit_sha(self.app_src_dir / rel_path,
+                                                                              repo_state_dict[rel_path]["head"]))
+        if None in res_list:
+            return ret
+
+        def restore_repo(rel_path):
+            repo_dir = self.app_src_dir / rel_path
+            repo_state = repo_state_dict[rel_path]
+            self.exec(["git", "reset", "--hard", "--quiet", repo_state["head"]], cwd=repo_dir)
+            if repo_state["hipify_diffbase"]:
+                self.exec(["git", "tag", "-f", TAG_HIPIFY_DIFFBASE, repo_state["hipify_diffbase"], "--no-sign"],
+                          cwd=repo_dir)
+
+        exec_in_repositories(rel_path_list, restore_repo)
+        ret = True
         return ret
 
     def do_hipify(self, CMD_HIPIFY):
+        from lib_python.git_submodules import exec_in_repositories_by_nesting_level
         ret = True
         print("do_hipify started")
+        # hipify is skipped if the source tree and hipify inputs are same than on earlier hipify
+        hipify_fingerprint = None
+        if (self.app_src_dir / ".git").is_dir():
+            repo_dir_list = self.get_all_repositories(self.app_src_dir)
+            hipify_fingerprint = self._get_hipify_fingerprint(CMD_HIPIFY, repo_dir_list)
+            if hipify_fingerprint and self._restore_hipify_state(hipify_fingerprint, repo_dir_list):
+                print("Hipify inputs have not changed, commits of the earlier hipify restored")
+                return ret
+            state_fname = self._get_hipify_state_filename()
+            if state_fname.exists():
+                state_fname.unlink()
         if CMD_HIPIFY:
-            ret = self._exec_subprocess_cmd(CMD_HIPIFY, self.app_exec_dir)
+            self._open_phase_log("hipify")
+            try:
+                ret = self._exec_subprocess_cmd(CMD_HIPIFY, self.app_exec_dir)
+            finally:
+                self._close_phase_log()
             # Iterate over the base repository and all submodules. Because we process
             # the root repo first, it will not add submodule changes.
             repo_dir: Path = self.app_src_dir
             all_paths = self.get_all_repositories(repo_dir)
-            for module_path in all_paths:
-                status = self.list_status(module_path)
-                if not status:
-                    # if no changes in repo, do not try to add and commit
-                    continue
-                print(f"HIPIFY made changes to {module_path}: Committing")
-                self.exec(["git", "add", "-A"], cwd=module_path)
-                self.exec(
-                    ["git", "commit", "-m", HIPIFY_COMMIT_MESSAGE, "--no-gpg-sign"],
-                    cwd=module_path,
-                )
-                self.exec(
-                    ["git", "tag", "-f", TAG_HIPIFY_DIFFBASE, "--no-sign"],
-                    cwd=module_path,
-                )
+            # submodules are committed in parallel after the root repository
+            self._commit_hipify_changes(all_paths[0])
+            exec_in_repositories_by_nesting_level(all_paths[1:], self._commit_hipify_changes)
             print("do_hipify, hipified files committed")
         # always apply the patches from hipified directory. (even if CMD_HIPIFY was not specified in config file for project)
 
@@ -772,9 +1633,26 @@ class RockProjectRepo:
                 print("do_hipify, hipified patches applied")
                 # apply patches only from the first directory that exist
                 break
-
+        if ret and hipify_fingerprint:
+            self._save_hipify_state(hipify_fingerprint)
         return ret
 
+    def _commit_hipify_changes(self, module_path: Path):
+        status = self.list_status(module_path)
+        if not status:
+            # if no changes in repo, do not try to add and commit
+            return
+        print(f"HIPIFY made changes to {module_path}: Committing")
+        self.exec(["git", "add", "-A"], cwd=module_path)
+        self.exec(
+            ["git", "commit", "-m", HIPIFY_COMMIT_MESSAGE, "--no-gpg-sign"],
+            cwd=module_path,
+        )
+        self.exec(
+            ["git", "tag", "-f", TAG_HIPIFY_DIFFBASE, "--no-sign"],
+            cwd=module_path,
+        )
+
     def do_pre_config(self, CMD_PRE_CONFIG):
         return self._handle_command_exec("pre_config", CMD_PRE_CONFIG, self.app_exec_dir)
 
@@ -786,6 +1664,13 @@ class RockProjectRepo:
         if CMD_CMAKE_CONFIG:
             CMD_CMAKE_CONFIG = os.path.expandvars(str(CMD_CMAKE_CONFIG))
             CMD_CMAKE_CONFIG = "cmake -GNinja " + CMD_CMAKE_CONFIG
+            # older cmake versions do not read the compiler launchers from environment variables
+            for lang in ["C", "CXX", "HIP"]:
+                launcher_env_var = "CMAKE_" + lang + "_COMPILER_LAUNCHER"
+                if (launcher_env_var in self.orig_compiler_cache_env_variables_hashtable and
+                        os.environ.get(launcher_env_var) and
+                        launcher_env_var not in CMD_CMAKE_CONFIG):
+                    CMD_CMAKE_CONFIG = CMD_CMAKE_CONFIG + " -D" + launcher_env_var + "=" + os.environ[launcher_env_var]
             ret = self._handle_command_exec(
                 "CMD_CMAKE_CONFIG", CMD_CMAKE_CONFIG, self.app_build_dir
             )
@@ -796,10 +1681,31 @@ class RockProjectRepo:
             "post_config", CMD_POST_CONFIG, self.app_exec_dir
         )
 
+    # Returns the generator used for the cmake build directory or None if it is not configured
+    def _get_cmake_generator(self, cmake_build_dir: Path):
+        ret = None
+        try:
+            with open(Path(cmake_build_dir) / "CMakeCache.txt", "r") as cache_file:
+                for line in cache_file:
+                    if line.startswith("CMAKE_GENERATOR:"):
+                        ret = line.split("=", 1)[1].strip()
+                        break
+        except (OSError, IndexError):
+            ret = None
+        return ret
+
     def do_cmake_build(self, CMD_CMAKE_CONFIG):
         ret = True
         if CMD_CMAKE_CONFIG:
             CMD_BUILD = "cmake --build " + self.app_build_dir.as_posix()
+            # job count is read by make from the job server in MAKEFLAGS.
+            # Load limit is passed to the build tool only for the make and ninja generators,
+            # Visual Studio and Xcode build tools do not support the -l parameter.
+            load_average = os.environ.get(rcb_const.RCB__ENV_VAR__LOAD_AVERAGE)
+            if load_average:
+                generator = self._get_cmake_generator(self.app_build_dir)
+                if generator and ("Makefiles" in generator or generator.startswith("Ninja")):
+                    CMD_BUILD = CMD_BUILD + " -- -l " + load_average
             ret = self._handle_command_exec(
                 "cmake build", CMD_BUILD, self.app_build_dir
             )
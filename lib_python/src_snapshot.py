@@ -0,0 +1,101 @@
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+
+# zstandard is optional, zstd command or gzip is used if it is not installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Snapshots of the patched and hipified app source trees.
+#
+# Snapshot is a tar file of the whole source directory, including the
+# git directories of the app repository and its submodules, so that the
+# restored source tree can be used like the one created by the checkout.
+# Snapshots are compressed with zstd if the zstandard python module or the zstd
+# command is available and with gzip otherwise. Snapshots are stored to the build
+# cache backends, so they can be shared between the hosts like the python wheels.
+
+
+# Returns the file name used for the snapshot. Compression is selected from the name.
+def get_src_snapshot_file_name():
+    if zstandard or shutil.which("zstd"):
+        ret = rcb_const.RCB__SRC_SNAPSHOT_BASE_FILE_NAME + ".tar.zst"
+    else:
+        ret = rcb_const.RCB__SRC_SNAPSHOT_BASE_FILE_NAME + ".tar.gz"
+    return ret
+
+
+def is_src_snapshot_cache_enabled():
+    ret = os.environ.get(rcb_const.RCB__ENV_VAR__SRC_SNAPSHOT_CACHE, "").strip().lower() in ("1", "yes", "true", "on")
+    return ret
+
+
+# Write the source directory to the snapshot file
+def create_src_snapshot(src_dir: Path, snapshot_fname: Path):
+    snapshot_fname.parent.mkdir(parents=True, exist_ok=True)
+    with open(snapshot_fname, "wb") as snapshot_file:
+        if snapshot_fname.name.endswith(".tar.gz"):
+            with tarfile.open(fileobj=snapshot_file, mode="w|gz") as tar:
+                tar.add(src_dir, arcname=".")
+        elif zstandard:
+            # threads=-1: compress with all cpu cores
+            with zstandard.ZstdCompressor(threads=-1).stream_writer(snapshot_file, closefd=False) as zstd_writer:
+                with tarfile.open(fileobj=zstd_writer, mode="w|") as tar:
+                    tar.add(src_dir, arcname=".")
+        else:
+            proc = subprocess.Popen(["zstd", "-q", "-T0", "-c"], stdin=subprocess.PIPE, stdout=snapshot_file)
+            try:
+                with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                    tar.add(src_dir, arcname=".")
+            finally:
+                proc.stdin.close()
+                proc.wait()
+            if proc.returncode != 0:
+                raise OSError("zstd failed with return code " + str(proc.returncode))
+
+
+def _extract_tar_stream(tar_stream, mode: str, target_dir: Path):
+    with tarfile.open(fileobj=tar_stream, mode=mode) as tar:
+        if hasattr(tarfile, "tar_filter"):
+            # do not allow absolute paths or paths outside of the target dir
+            tar.extractall(target_dir, filter="tar")
+        else:
+            tar.extractall(target_dir)
+
+
+# Extract the snapshot to the source directory with a single streaming pass.
+# Snapshot is extracted first to temporary directory which is renamed
+# to source directory only after the extract has succeeded.
+def extract_src_snapshot(snapshot_fname: Path, src_dir: Path):
+    src_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=src_dir.name + ".", dir=src_dir.parent))
+    try:
+        with open(snapshot_fname, "rb") as snapshot_file:
+            if snapshot_fname.name.endswith(".tar.gz"):
+                _extract_tar_stream(snapshot_file, "r|gz", tmp_dir)
+            elif zstandard:
+                with zstandard.ZstdDecompressor().stream_reader(snapshot_file) as zstd_reader:
+                    _extract_tar_stream(zstd_reader, "r|", tmp_dir)
+            else:
+                proc = subprocess.Popen(["zstd", "-q", "-d", "-c"], stdin=snapshot_file, stdout=subprocess.PIPE)
+                try:
+                    _extract_tar_stream(proc.stdout, "r|", tmp_dir)
+                finally:
+                    proc.stdout.close()
+                    proc.wait()
+                if proc.returncode != 0:
+                    raise OSError("zstd failed with return code " + str(proc.returncode))
+        if src_dir.exists():
+            # empty directory created earlier
+            src_dir.rmdir()
+        os.replace(tmp_dir, src_dir)
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
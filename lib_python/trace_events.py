@@ -0,0 +1,108 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+
+
+# Timeline of the rockbuilder run in the Chrome Trace Event format.
+#
+# Apps, phases, git commands, shell commands and sleeps are recorded as complete
+# ("X") events. Events are appended to the event file shared by all rockbuilder
+# processes of the run and written to the trace file when the run ends.
+# Trace file can be opened with the Perfetto UI (https://ui.perfetto.dev) or chrome://tracing.
+
+# Category names of the events
+TRACE_CAT_RUN = "run"
+TRACE_CAT_APP = "app"
+TRACE_CAT_PHASE = "phase"
+TRACE_CAT_GIT = "git"
+TRACE_CAT_CMD = "cmd"
+TRACE_CAT_SLEEP = "sleep"
+
+# long commands are truncated in the event names, full command is in the event args
+_MAX_EVENT_NAME_LEN = 80
+
+
+def is_trace_enabled():
+    ret = rcb_const.RCB__ENV_VAR__TRACE_EVENT_FILE in os.environ
+    return ret
+
+
+def _append_trace_event(event: dict):
+    fname = os.environ.get(rcb_const.RCB__ENV_VAR__TRACE_EVENT_FILE)
+    if fname:
+        line = json.dumps(event) + "\n"
+        # single append write, so parallel app builds do not mix the events
+        fd = os.open(fname, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+
+# Add complete event which started at start_time and ended now. (times from time.time())
+def add_trace_complete_event(name: str, cat: str, start_time: float, args: dict = None):
+    if is_trace_enabled():
+        end_time = time.time()
+        if len(name) > _MAX_EVENT_NAME_LEN:
+            name = name[:_MAX_EVENT_NAME_LEN - 3] + "..."
+        event = {"name": name,
+                 "cat": cat,
+                 "ph": "X",
+                 "ts": int(start_time * 1000000),
+                 "dur": int((end_time - start_time) * 1000000),
+                 "pid": os.getpid(),
+                 "tid": threading.get_native_id()}
+        if args:
+            event["args"] = args
+        _append_trace_event(event)
+
+
+# Name the process of the current rockbuilder in the trace viewer
+def set_trace_process_name(name: str):
+    if is_trace_enabled():
+        _append_trace_event({"name": "process_name",
+                             "ph": "M",
+                             "pid": os.getpid(),
+                             "args": {"name": name}})
+
+
+# Record the code executed inside the with statement as a complete event
+@contextlib.contextmanager
+def trace_span(name: str, cat: str, args: dict = None):
+    start_time = time.time()
+    try:
+        yield
+    finally:
+        add_trace_complete_event(name, cat, start_time, args)
+
+
+# time.sleep that is shown in the trace
+def sleep_with_trace(seconds: float):
+    with trace_span("sleep " + str(seconds) + " s", TRACE_CAT_SLEEP):
+        time.sleep(seconds)
+
+
+# Write the events of the run to the trace file in the Chrome Trace Event format.
+# Event times are made relative to the first event.
+def write_chrome_trace(event_fname: Path, trace_fname: Path):
+    event_list = []
+    if event_fname.exists():
+        with open(event_fname, "r") as event_file:
+            for cur_line in event_file:
+                try:
+                    event_list.append(json.loads(cur_line))
+                except ValueError:
+                    continue
+    ts_list = [event["ts"] for event in event_list if "ts" in event]
+    if ts_list:
+        start_ts = min(ts_list)
+        for event in event_list:
+            if "ts" in event:
+                event["ts"] = event["ts"] - start_ts
+    trace_fname.parent.mkdir(parents=True, exist_ok=True)
+    with open(trace_fname, "w") as trace_file:
+        json.dump({"traceEvents": event_list, "displayTimeUnit": "ms"}, trace_file)
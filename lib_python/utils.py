@@ -1,9 +1,10 @@
 import sys
 import os
 import platform
-import ast
 import subprocess
 import configparser
+import hashlib
+import json
 import lib_python.rcb_constants as rcb_const
 from pathlib import Path, PurePosixPath
 
@@ -129,6 +130,109 @@ def exec_subprocess_cmd(exec_cmd, exec_dir):
             print(f"Error: {result.stderr}")
     return ret
 
+# Inter-process lock based on a lock file. Used to serialize operations
+# that are not safe to run concurrently from multiple rockbuilder processes,
+# for example the pip install of wheels to the same python environment.
+class RockFileLock:
+    def __init__(self, lock_fname: Path):
+        self.lock_fname = Path(lock_fname)
+        self._lock_file = None
+
+    def acquire(self):
+        self.lock_fname.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.lock_fname, "a+")
+        if _is_posix():
+            import fcntl
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            import msvcrt
+            self._lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds, keep trying
+                    pass
+
+    def release(self):
+        if self._lock_file:
+            if _is_posix():
+                import fcntl
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                import msvcrt
+                self._lock_file.seek(0)
+                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+# sha256 hash of the file content
+def get_file_sha256(fname: Path) -> str:
+    ret = None
+    hash_obj = hashlib.sha256()
+    with open(fname, "rb") as cur_file:
+        for chunk in iter(lambda: cur_file.read(1024 * 1024), b""):
+            hash_obj.update(chunk)
+    ret = hash_obj.hexdigest()
+    return ret
+
+# sha256 hash of the relative file names and file contents in the directory tree.
+# Returns empty string if the directory does not exist.
+def get_dir_content_sha256(dir_path: Path) -> str:
+    ret = ""
+    dir_path = Path(dir_path)
+    if dir_path.is_dir():
+        hash_obj = hashlib.sha256()
+        fname_list = sorted(p for p in dir_path.rglob("*") if p.is_file())
+        for fname in fname_list:
+            hash_obj.update(fname.relative_to(dir_path).as_posix().encode())
+            hash_obj.update(get_file_sha256(fname).encode())
+        ret = hash_obj.hexdigest()
+    return ret
+
+# Version information of the rocm sdk used for the build.
+# Read from the version files in the ROCM_HOME/.info directory.
+def get_rocm_sdk_version_str(rocm_home_root_path: Path) -> str:
+    ret = ""
+    info_dir = Path(rocm_home_root_path) / ".info"
+    if info_dir.is_dir():
+        for fname in sorted(info_dir.glob("*version*")):
+            if fname.is_file():
+                try:
+                    ret = ret + fname.name + "=" + fname.read_text().strip() + ";"
+                except OSError:
+                    pass
+    if not ret:
+        ret = Path(rocm_home_root_path).as_posix()
+    return ret
+
+# In fast mode the environment variables are not printed and the build does not
+# pause to show the printouts. Enabled by default when the output is not a terminal.
+def is_fast_mode():
+    ret = os.environ.get(rcb_const.RCB__ENV_VAR__FAST_MODE, "").strip().lower() in ("1", "yes", "true", "on")
+    return ret
+
+# Write the environment variables of the current process to file.
+# File is not rewritten if the environment has not changed.
+def write_env_snapshot(fname: Path):
+    content = "".join(key + "=" + value + "\n" for key, value in sorted(os.environ.items()))
+    try:
+        if fname.read_text() == content:
+            return
+    except (OSError, ValueError):
+        pass
+    fname.parent.mkdir(parents=True, exist_ok=True)
+    fname.write_text(content)
+
 def printout_list_items(item_list):
     print("-----------------")
     for item in item_list:
@@ -201,6 +305,8 @@ def get_config_value(rcb_cfg, section_name, key_name):
 
 
 def get_config_list_value_as_python_list(rcb_cfg, section_name, key_name):
+    import ast
+
     ret = None
     # we get values as a string reporesenting a list of strings
     if rcb_cfg.has_option(section_name, key_name):
@@ -401,6 +507,99 @@ def install_rocm_sdk_from_python_wheels(rcb_cfg) -> str:
             print("Error, could not find ROCM_HOME from ROCM_SDK python wheel install.")
     return ret
 
+# rocm sdk tool locations found from the rocm sdk directories, key = resolved rocm sdk directory
+_rocm_sdk_tool_path_dict = {}
+
+# Install stamp of the rocm sdk. Changes when the rocm sdk is re-installed or updated.
+def _get_rocm_sdk_install_stamp(rocm_home_root_path: Path) -> list:
+    ret = [get_rocm_sdk_version_str(rocm_home_root_path)]
+    for cur_path in [rocm_home_root_path, rocm_home_root_path / "bin", rocm_home_root_path / "lib"]:
+        try:
+            ret.append(cur_path.stat().st_mtime_ns)
+        except OSError:
+            ret.append(None)
+    return ret
+
+def _get_rocm_sdk_tool_names():
+    if _is_posix():
+        ret = {"hipcc": "hipcc", "clang_cc": "clang", "clang_cxx": "clang++"}
+    else:
+        ret = {"hipcc": "hipcc.bat", "clang_cc": "clang.exe", "clang_cxx": "clang++.exe"}
+    return ret
+
+# Find the bitcode directory, hipcc and clang++ from the rocm sdk.
+# Known install layouts are checked first and the directory tree is walked
+# only once for the tools not found from them. Walk stops when all tools have been found.
+def _find_rocm_sdk_tool_paths(rocm_home_root_path: Path) -> dict:
+    ret = {"bitcode": None, "hipcc": None, "clang_cxx": None}
+    tool_names = _get_rocm_sdk_tool_names()
+    for cur_path in [rocm_home_root_path / "lib" / "llvm" / "amdgcn" / "bitcode",
+                     rocm_home_root_path / "amdgcn" / "bitcode"]:
+        if cur_path.is_dir():
+            ret["bitcode"] = cur_path.as_posix()
+            break
+    cur_path = rocm_home_root_path / "bin" / tool_names["hipcc"]
+    if cur_path.is_file():
+        ret["hipcc"] = cur_path.as_posix()
+    for cur_path in [rocm_home_root_path / "lib" / "llvm" / "bin",
+                     rocm_home_root_path / "llvm" / "bin"]:
+        if (cur_path / tool_names["clang_cxx"]).is_file() and (cur_path / tool_names["clang_cc"]).is_file():
+            ret["clang_cxx"] = (cur_path / tool_names["clang_cxx"]).as_posix()
+            break
+    if None in ret.values():
+        for dir_name, subdir_list, file_list in os.walk(rocm_home_root_path):
+            # header directories are large and do not contain the tools
+            subdir_list[:] = sorted(subdir for subdir in subdir_list if subdir != "include")
+            cur_dir = Path(dir_name)
+            if not ret["bitcode"] and "bitcode" in subdir_list:
+                ret["bitcode"] = (cur_dir / "bitcode").as_posix()
+            if cur_dir.name.lower() == "bin":
+                if not ret["hipcc"] and tool_names["hipcc"] in file_list:
+                    ret["hipcc"] = (cur_dir / tool_names["hipcc"]).as_posix()
+                if (not ret["clang_cxx"] and
+                        tool_names["clang_cxx"] in file_list and
+                        tool_names["clang_cc"] in file_list):
+                    ret["clang_cxx"] = (cur_dir / tool_names["clang_cxx"]).as_posix()
+            if None not in ret.values():
+                break
+    return ret
+
+# Returns the rocm sdk tool locations. Result is cached in memory and in a file in the build
+# directory, so the rocm sdk directory needs to be searched only after the rocm sdk has changed.
+def get_rocm_sdk_tool_paths(rocm_home_root_path: Path) -> dict:
+    import tempfile
+    root_key = Path(rocm_home_root_path).resolve().as_posix()
+    stamp = _get_rocm_sdk_install_stamp(Path(rocm_home_root_path))
+    entry = _rocm_sdk_tool_path_dict.get(root_key)
+    if entry and entry["stamp"] == stamp:
+        return entry["paths"]
+    cache_fname = rcb_const.RCB__ROCM_SDK_TOOL_PATH_CACHE_FILE_NAME
+    cache = {}
+    try:
+        with open(cache_fname, "r") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(root_key)
+    if (entry and entry.get("stamp") == stamp and
+            all(value is None or os.path.exists(value) for value in entry.get("paths", {}).values())):
+        ret = entry["paths"]
+    else:
+        ret = _find_rocm_sdk_tool_paths(Path(rocm_home_root_path))
+        cache[root_key] = {"stamp": stamp, "paths": ret}
+        # other rockbuilder processes can read the file at the same time
+        try:
+            cache_fname.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_fname = tempfile.mkstemp(prefix=cache_fname.name + ".", dir=cache_fname.parent)
+            with os.fdopen(fd, "w") as cache_file:
+                json.dump(cache, cache_file, indent=4, sort_keys=True)
+            os.replace(tmp_fname, cache_fname)
+        except OSError as e:
+            print("Warning, failed to write rocm sdk tool path cache: " + str(cache_fname))
+            print("    " + str(e))
+    _rocm_sdk_tool_path_dict[root_key] = {"stamp": stamp, "paths": ret}
+    return ret
+
 # check_rcb_rocm_sdk_version_file is checked if we want to use rocm_sdk
 # build by therock itself, which will create this file to ensure that everything has been build.
 # Otherwise we will assume that rocm_sdk is fully installed.
@@ -450,13 +649,13 @@ def get_rocm_sdk_env_variables(rocm_home_root_path:Path,
                         + os.pathsep
                         + os.environ.get(ENV_VARIABLE_NAME__LIB, "")))
                 # find bitcode and put it to path
+                tool_paths = get_rocm_sdk_tool_paths(rocm_home_root_path)
                 folder_path = None
-                for folder_path in Path(rocm_home_root_path).glob("**/bitcode"):
-                    folder_path = folder_path.resolve()
+                if tool_paths["bitcode"]:
+                    folder_path = Path(tool_paths["bitcode"]).resolve()
                     ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_DEVICE_LIB_PATH + "=" + folder_path.as_posix())
                     ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_HIP_DEVICE_LIB_PATH + "=" + folder_path.as_posix())
                     print(rcb_const.RCB__ENV_VAR__ROCM_SDK_DEVICE_LIB_PATH + "=" + str(folder_path))
-                    break
                 if not folder_path:
                     err_happened = True
                     print("")
@@ -466,11 +665,8 @@ def get_rocm_sdk_env_variables(rocm_home_root_path:Path,
                     if exit_on_error:
                         sys.exit(1)
                 # find hipcc
-                if is_posix:
-                    hipcc_exec_name = "hipcc"
-                else:
-                    hipcc_exec_name = "hipcc.bat"
-                for exec_path in Path(rocm_home_root_path).glob("**/" + hipcc_exec_name):
+                if tool_paths["hipcc"]:
+                    exec_path = Path(tool_paths["hipcc"])
                     hipcc_home = exec_path.parent
                     # make sure that we found bin/clang and not clang folder
                     if hipcc_home.name.lower() == "bin":
@@ -490,7 +686,6 @@ def get_rocm_sdk_env_variables(rocm_home_root_path:Path,
                                 if hipcc_libdir.is_dir():
                                     ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_HIPCC_LIB_DIR + "=" + hipcc_libdir.as_posix())
                             print(rcb_const.RCB__ENV_VAR__ROCM_SDK_HIPCC_HOME_DIR + "=" + hipcc_home.as_posix())
-                            break
                 # find clang
                 if is_posix:
                     clang_cc_exec_name = "clang"
@@ -502,7 +697,8 @@ def get_rocm_sdk_env_variables(rocm_home_root_path:Path,
                     # clang-cl exist on windows to provide a clang style wrapper for microsoft's own msvc compiler
                     clang_cl_exec_name = "clang-cl.exe"
                 res = False
-                for exec_path in Path(rocm_home_root_path).glob("**/" + clang_cxx_exec_name):
+                if tool_paths["clang_cxx"]:
+                    exec_path = Path(tool_paths["clang_cxx"])
                     clang_home = exec_path.parent
                     # make sure that we found bin/clang++ and not clang++ folder
                     if clang_home.name.lower() == "bin":
@@ -514,6 +710,7 @@ def get_rocm_sdk_env_variables(rocm_home_root_path:Path,
                             #clang++
                             ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CXX_EXEC + "=" + exec_path.as_posix())
                             #clang-cl on windows
+                            clang_cl_found = True
                             clang_cl_exec = None
                             if clang_cl_exec_name:
                                 clang_cl_exec = clang_home / clang_cl_exec_name
@@ -521,28 +718,26 @@ def get_rocm_sdk_env_variables(rocm_home_root_path:Path,
                                     ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CL_EXEC + "=" + clang_cl_exec.as_posix())
                                 else:
                                     print("Error, could not find: " + clang_cl_exec_name)
-                                    break
-                            else:
-                                clang_cl_exec = None
-                            print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_BIN_DIR + "=" + clang_home.as_posix())
-                            print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CC_EXEC + "=" + clang_cc_exec.as_posix())
-                            print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CXX_EXEC + "=" + exec_path.as_posix())
-                            if clang_cl_exec:
-                                print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CL_EXEC + "=" + clang_cl_exec.as_posix())
-                            clang_home = clang_home.parent
-                            if clang_home.is_dir():
-                                res = True
-                                clang_home = clang_home.resolve()
-                                ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_HOME_DIR + "=" + clang_home.as_posix())
-                                clang_libdir = clang_home / "lib64"
-                                if clang_libdir.is_dir():
-                                    ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_LIB_DIR + "=" + clang_libdir.as_posix())
-                                else:
-                                    clang_libdir = clang_home / "lib"
+                                    clang_cl_found = False
+                            if clang_cl_found:
+                                print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_BIN_DIR + "=" + clang_home.as_posix())
+                                print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CC_EXEC + "=" + clang_cc_exec.as_posix())
+                                print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CXX_EXEC + "=" + exec_path.as_posix())
+                                if clang_cl_exec:
+                                    print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_CL_EXEC + "=" + clang_cl_exec.as_posix())
+                                clang_home = clang_home.parent
+                                if clang_home.is_dir():
+                                    res = True
+                                    clang_home = clang_home.resolve()
+                                    ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_HOME_DIR + "=" + clang_home.as_posix())
+                                    clang_libdir = clang_home / "lib64"
                                     if clang_libdir.is_dir():
                                         ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_LIB_DIR + "=" + clang_libdir.as_posix())
-                                print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_HOME_DIR + "=" + str(clang_home))
-                                break
+                                    else:
+                                        clang_libdir = clang_home / "lib"
+                                        if clang_libdir.is_dir():
+                                            ret.append(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_LIB_DIR + "=" + clang_libdir.as_posix())
+                                    print(rcb_const.RCB__ENV_VAR__ROCM_SDK_CLANG_HOME_DIR + "=" + str(clang_home))
                 if not res:
                     err_happened = True
                     print("")
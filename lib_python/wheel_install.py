@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+from lib_python.utils import RockFileLock
+from lib_python.trace_events import trace_span
+from lib_python.trace_events import TRACE_CAT_CMD
+
+
+# Batched python wheel install used with --batch-wheel-install.
+#
+# Install of the wheel is skipped if the wheel with the same sha256 hash has
+# already been installed by the app. Wheels of the apps used by the other apps
+# of the run are installed immediately with "pip install --no-deps --force-reinstall"
+# when the earlier version of the package is installed. Wheels of the apps
+# not used by the other apps of the run are appended to the queue file of the
+# run and installed with a single pip install command when the run ends.
+
+
+def is_python_wheel_batch_install_used():
+    ret = rcb_const.RCB__ENV_VAR__WHEEL_INSTALL_QUEUE_FILE in os.environ
+    return ret
+
+
+# Install of the app wheel can be done at the end of the run
+def is_python_wheel_install_deferred(app_cfg_base_name: str):
+    ret = False
+    if is_python_wheel_batch_install_used():
+        deferred_app_list = os.environ.get(rcb_const.RCB__ENV_VAR__WHEEL_INSTALL_DEFERRED_APPS, "").split()
+        ret = app_cfg_base_name in deferred_app_list
+    return ret
+
+
+# Returns the distribution name and version from the wheel file name.
+# (<name>-<version>[-<build tag>]-<python tag>-<abi tag>-<platform tag>.whl)
+def get_python_wheel_dist_name_and_version(wheel_fname: Path):
+    name_part_list = Path(wheel_fname).name.split("-")
+    ret = (name_part_list[0], name_part_list[1])
+    return ret
+
+
+# Returns the version of the installed distribution or None if it is not installed
+def get_installed_python_dist_version(dist_name: str):
+    # importlib.metadata is slow to import, so it is imported only when the wheels are installed
+    import importlib.metadata
+
+    try:
+        ret = importlib.metadata.version(dist_name)
+    except importlib.metadata.PackageNotFoundError:
+        ret = None
+    return ret
+
+
+# Wheel with the same hash has been installed by the app and its version is still installed
+def is_python_wheel_installed(wheel_fname: Path, wheel_sha256: str, state_fname: Path):
+    ret = False
+    try:
+        with open(state_fname, "r") as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        return ret
+    if (state.get("wheel") == Path(wheel_fname).name and
+            state.get("sha256") == wheel_sha256 and
+            state.get("python") == sys.prefix):
+        dist_name, dist_version = get_python_wheel_dist_name_and_version(wheel_fname)
+        ret = get_installed_python_dist_version(dist_name) == dist_version
+    return ret
+
+
+def save_python_wheel_install_state(wheel_fname: Path, wheel_sha256: str, state_fname: Path):
+    state = {"wheel": Path(wheel_fname).name,
+             "sha256": wheel_sha256,
+             "python": sys.prefix}
+    Path(state_fname).parent.mkdir(parents=True, exist_ok=True)
+    with open(state_fname, "w") as state_file:
+        json.dump(state, state_file, indent=4)
+
+
+# Append the wheel to the install queue of the run
+def queue_python_wheel_install(record: dict):
+    fname = os.environ[rcb_const.RCB__ENV_VAR__WHEEL_INSTALL_QUEUE_FILE]
+    line = json.dumps(record) + "\n"
+    # single append write, so parallel app builds do not mix the records
+    fd = os.open(fname, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+def _read_python_wheel_install_queue(queue_fname: Path):
+    record_dict = {}
+    if queue_fname.exists():
+        with open(queue_fname, "r") as queue_file:
+            for cur_line in queue_file:
+                try:
+                    record = json.loads(cur_line)
+                except ValueError:
+                    continue
+                # latest wheel of the app is installed
+                record_dict[record["app"]] = record
+    ret = list(record_dict.values())
+    return ret
+
+
+# Install the wheels queued by the app builds of the run with a single pip install command.
+# If the install fails, install stamps of the apps are removed so that the install
+# is done again on the next build. Returns False if the install failed.
+def install_queued_python_wheels(queue_fname: Path):
+    ret = True
+    record_list = _read_python_wheel_install_queue(queue_fname)
+    if queue_fname.exists():
+        queue_fname.unlink()
+    if not record_list:
+        return ret
+    wheel_list = [record["wheel"] for record in record_list]
+    # rebuilds of the installed version are removed first, other versions are upgraded by the install
+    uninstall_list = []
+    for record in record_list:
+        dist_name, dist_version = get_python_wheel_dist_name_and_version(record["wheel"])
+        if get_installed_python_dist_version(dist_name) == dist_version:
+            uninstall_list.append(dist_name)
+    print("Installing " + str(len(wheel_list)) + " queued python wheels:")
+    for wheel_fname in wheel_list:
+        print("    " + wheel_fname)
+    env = os.environ.copy()
+    env["PIP_BREAK_SYSTEM_PACKAGES"] = "1"
+    with RockFileLock(rcb_const.RCB__PYTHON_WHEEL_INSTALL_LOCK_FILE_NAME):
+        with trace_span("pip install " + str(len(wheel_list)) + " queued wheels", TRACE_CAT_CMD, {"wheels": wheel_list}):
+            if uninstall_list:
+                # uninstall failures are not checked, like with the install of the single wheel
+                subprocess.run(["pip", "uninstall", "-y"] + uninstall_list, env=env)
+            result = subprocess.run(["pip", "install"] + wheel_list, env=env)
+    if result.returncode == 0:
+        for record in record_list:
+            save_python_wheel_install_state(record["wheel"], record["sha256"], record["state_file"])
+    else:
+        ret = False
+        print("Error, failed to install the queued python wheels")
+        for record in record_list:
+            if record["stamp_file"] and Path(record["stamp_file"]).exists():
+                Path(record["stamp_file"]).unlink()
+    return ret
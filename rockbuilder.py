@@ -1,14 +1,13 @@
 #!/usr/bin/env python
 
 import argparse
+import atexit
 import configparser
 import sys
 import os
 import time
 import platform
 import subprocess
-import lib_python.app_builder as app_builder
-import rockbuilder_cfg as rcb_cfg_writer
 import lib_python.rcb_cfg_reader as rcb_cfg_reader
 import lib_python.rcb_constants as rcb_const
 from lib_python.utils import get_rocm_home_from_python_wheel_rocm_sdk
@@ -16,9 +15,45 @@ from lib_python.utils import set_rocm_home_to_env_variables
 from lib_python.utils import install_rocm_sdk_from_python_wheels
 from lib_python.utils import get_rocm_sdk_env_variables
 from lib_python.utils import verify_env__python
+from lib_python.utils import is_fast_mode
 from lib_python.utils import get_python_wheel_rocm_sdk_gpu_list_str
 from pathlib import Path, PurePosixPath
 
+# command phase arguments which forces the execution of phases
+CMD_PHASE_ARG_LIST = [
+    "--checkout",
+    "--clean",
+    "--init",
+    "--hipify",
+    "--pre_config",
+    "--config",
+    "--post_config",
+    "--build",
+    "--install",
+    "--post_install",
+]
+
+# build steps in the order they are executed by the do_therock
+BUILD_STEP_LIST = [
+    "init",
+    "checkout",
+    "hipify",
+    "pre_config",
+    "config",
+    "post_config",
+    "build",
+    "install",
+    "post_install",
+]
+
+# Arguments for the verify_rocm_sdk_install. Rocm sdk is verified only
+# when the first app using it is build, None if verify is not pending.
+_rocm_sdk_verify_arg_list = None
+
+# Queue file of the python wheels installed at the end of the run with --batch-wheel-install,
+# None if the run does not install the queued wheels.
+_wheel_install_queue_fname = None
+
 
 def printout_rock_builder_info():
     print("RockBuilder " + rcb_const.RCB__VERSION)
@@ -43,7 +78,9 @@ def printout_build_env_info():
         print("RCB_PYTHON_PATH: not defined")
     print("PATH: " + os.environ["PATH"])
     print("-----------------------------")
-    time.sleep(1)
+    if not is_fast_mode():
+        from lib_python.trace_events import sleep_with_trace
+        sleep_with_trace(1)
 
 
 # if the app_name is full path to cfg file, return it
@@ -83,6 +120,8 @@ def get_app_list_cfg_path(rock_builder_home_dir: Path, fname: str):
 
 
 def get_app_or_app_list_config(rock_builder_home_dir: Path, fname: str):
+    import lib_python.app_builder as app_builder
+
     ret = None
 
     cfg_path = get_app_cfg_path(rock_builder_home_dir, fname)
@@ -95,7 +134,8 @@ def get_app_or_app_list_config(rock_builder_home_dir: Path, fname: str):
 def create_argument_parser_with_basic_options(rock_builder_home_dir,
                                               default_src_base_dir: Path):
     # create an argument parser object
-    parser = argparse.ArgumentParser(description="ROCKBuilder")
+    parser = argparse.ArgumentParser(description="ROCKBuilder",
+                                     epilog="Version of each app in the app list can be overridden with the --<app>-version argument. For example: --pytorch_audio-version=v2.6.0")
 
     # add non-positional arguments requiring a "--flag"
     parser.add_argument(
@@ -167,23 +207,137 @@ def create_argument_parser_with_basic_options(rock_builder_home_dir,
         help="Directory to copy built wheels to",
         default=rock_builder_home_dir / "packages" / "wheels",
     )
+    parser.add_argument(
+        "--max-parallel-apps",
+        type=int,
+        help="Maximum number of apps from the app list that are build in parallel when their dependencies allow it. Default is 1.",
+        default=1,
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Maximum number of parallel compile jobs shared by all apps build. Default is the number of CPUs when apps are build in parallel, otherwise each app uses its own default.",
+        default=None,
+    )
+    parser.add_argument(
+        "--load-average",
+        type=float,
+        help="Do not start new compile jobs if the system load average is higher than the given value.",
+        default=None,
+    )
+    parser.add_argument(
+        "--build-cache-dir",
+        type=Path,
+        help="Directory for the build cache used to reuse the python wheels build earlier with identical inputs.",
+        default=None,
+    )
+    parser.add_argument(
+        "--build-cache-url",
+        type=str,
+        help="Remote build cache shared between build hosts. Supported url formats: http(s)://<host>/<path>, s3://<bucket>/<prefix> and s3://auto/<prefix>",
+        default=None,
+    )
+    parser.add_argument(
+        "--no-build-cache",
+        action="store_true",
+        help="Do not use the build cache",
+        default=False,
+    )
+    parser.add_argument(
+        "--src-snapshot-cache",
+        action="store_true",
+        help="Store the patched and hipified source code of the apps to the build cache and restore it from there instead of doing the checkout and hipify again.",
+        default=False,
+    )
+    parser.add_argument(
+        "--compiler-cache",
+        type=str,
+        choices=[rcb_const.RCB__COMPILER_CACHE_TYPE_CCACHE,
+                 rcb_const.RCB__COMPILER_CACHE_TYPE_SCCACHE,
+                 rcb_const.RCB__COMPILER_CACHE_TYPE_NONE],
+        help="Compiler cache used for the C, C++ and HIP compiles. Overrides the compiler_cache section of rockbuilder.cfg",
+        default=None,
+    )
+    parser.add_argument(
+        "--git-mirror-dir",
+        type=Path,
+        help="Directory for the bare git mirrors shared by the app source checkouts. Overrides the git_mirror section of rockbuilder.cfg",
+        default=None,
+    )
+    parser.add_argument(
+        "--fetch-jobs",
+        type=str,
+        help="Number of submodules fetched in parallel or 'auto'. Overrides the fetch section of rockbuilder.cfg but not the PROP_FETCH_JOBS of the apps",
+        default=None,
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Save the environment variables of each build phase to the app build directory instead of printing them and do not pause between the printouts. Default when the output is not a terminal.",
+        default=False,
+    )
+    parser.add_argument(
+        "--no-fast",
+        action="store_true",
+        help="Print the environment variables of each build phase and pause to show them. Default when the output is a terminal.",
+        default=False,
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Print the done and pending command phases of the apps without building them",
+        default=False,
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the command phases that the build of the apps would execute without executing them",
+        default=False,
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help="Print the critical path, slack of each app and simulated build times with different --max-parallel-apps and --jobs values based on the phase durations of the earlier builds, without building the apps",
+        default=False,
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        help="Write the timeline of the apps, phases and commands executed to the given file in Chrome Trace Event format. Can be opened with the Perfetto UI or chrome://tracing",
+        default=None,
+    )
+    parser.add_argument(
+        "--batch-wheel-install",
+        action="store_true",
+        help="Skip the install of the python wheels already installed with the same hash and install the wheels of the apps not used by the other apps with a single pip install at the end of the run",
+        default=False,
+    )
+    parser.add_argument(
+        "--fetch-only",
+        action="store_true",
+        help="Checkout and patch the source code of all apps concurrently without building them",
+        default=False,
+    )
+    parser.add_argument(
+        "--prefetch-apps",
+        type=int,
+        help="Number of upcoming apps whose source code is fetched on background while the current app is build. Also the number of concurrent checkouts with --fetch-only. Default is 2, 0 disables the background fetch.",
+        default=2,
+    )
     # add positional arguments not requiring a "--flag"
     parser.add_argument("config_file", type=str, help="Specify path to a app or app_list config file that specify which apps are build. For example: apps/pytorch.apps ")
     return parser
 
 
-# This argument parser is used to parse the project list.
-# This is needed to do first before parsing other arguments
-# because we need to add the --<project-name>-version arguments for the second parser that
-# is used to parse all possible parameters.
-def get_app_list_manager(rock_builder_home_dir: Path, default_src_base_dir: Path):
+# Read the app list from the app or app list config given as an argument.
+def get_app_list_manager(rock_builder_home_dir: Path, config_file):
+    import lib_python.app_builder as app_builder
+
     ret = None
 
-    parser = create_argument_parser_with_basic_options(rock_builder_home_dir, default_src_base_dir)
-    args, unknown = parser.parse_known_args()
-    if not args.config_file:
-	    args.config_file = rcb_const.RCB__APP_CFG_DEFAULT_BASE_DIR / "core.apps"
-    cfg_info = get_app_or_app_list_config(rock_builder_home_dir, args.config_file)
+    if not config_file:
+        config_file = rcb_const.RCB__APP_CFG_DEFAULT_BASE_DIR / "core.apps"
+    cfg_info = get_app_or_app_list_config(rock_builder_home_dir, config_file)
     ret = app_builder.RockExternalProjectListManager(rock_builder_home_dir,
                                                      cfg_info)
     return ret
@@ -193,39 +347,34 @@ def get_app_cfg_base_name_without_extension(fname: str):
     ret = os.path.splitext(ret)[0]
     return ret
 
-# create user parameter parser
-def create_build_argument_parser(
-    rock_builder_home_dir, default_src_base_dir: Path, app_list
-):
-    parser = create_argument_parser_with_basic_options(rock_builder_home_dir, default_src_base_dir)
-    # add application version arguments 
+# Parse the --<app>-version arguments left unknown by the parse_build_arguments.
+# The version arguments depend on the apps in the app list, so they can not
+# be added to the parser before the app list config has been read.
+def parse_app_version_arguments(args, unknown_arg_list, app_list):
+    parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]),
+                                     add_help=False)
+    # add application version arguments
     for ii, prj_item in enumerate(app_list):
         base_name = get_app_cfg_base_name_without_extension(prj_item)
-        arg_name = "--" + base_name + "-version"
-        # print("arg_name: " + arg_name)
         parser.add_argument(
             "--" + base_name + "-version",
             help = base_name + " version used for the operations",
             default=None,
         )
-    return parser
+    version_args, unknown_arg_list = parser.parse_known_args(unknown_arg_list)
+    if unknown_arg_list:
+        print("Error, unrecognized arguments: " + " ".join(unknown_arg_list))
+        print("Use --help to list the available arguments")
+        sys.exit(2)
+    args.__dict__.update(version_args.__dict__)
 
 
-def parse_build_arguments(parser):
-    # parse command line parameters
-    args = parser.parse_args()
-    if (
-        ("--checkout" in sys.argv)
-        or ("--clean" in sys.argv)
-        or ("--init" in sys.argv)
-        or ("--hipify" in sys.argv)
-        or ("--pre_config" in sys.argv)
-        or ("--config" in sys.argv)
-        or ("--post_config" in sys.argv)
-        or ("--build" in sys.argv)
-        or ("--install" in sys.argv)
-        or ("--post_install" in sys.argv)
-    ):
+# Parse the command line parameters once. Returns the parsed arguments and the list of
+# --<app>-version arguments that are parsed later with the parse_app_version_arguments.
+def parse_build_arguments(rock_builder_home_dir: Path, default_src_base_dir: Path):
+    parser = create_argument_parser_with_basic_options(rock_builder_home_dir, default_src_base_dir)
+    args, unknown_arg_list = parser.parse_known_args()
+    if any(phase_arg in sys.argv for phase_arg in CMD_PHASE_ARG_LIST):
         # If cmd_phase argument is specified:
         #
         # 1) we will execute the command even if the stamp file exist.
@@ -237,7 +386,8 @@ def parse_build_arguments(parser):
         else:
             args.cmd_init_force_exec = False
         args.cmd_any_force_exec = True
-        print("checkout/init/clean/hipify/pre_config/config/post_config/build/install/post_install argument specified")
+        if not args.status and not args.dry_run:
+            print("checkout/init/clean/hipify/pre_config/config/post_config/build/install/post_install argument specified")
     else:
         args.cmd_init_force_exec = False
         args.cmd_any_force_exec = False
@@ -258,7 +408,7 @@ def parse_build_arguments(parser):
     if args.checkout:
         args.hipify = True
 
-    return args
+    return args, unknown_arg_list
 
 
 def printout_build_arguments(args):
@@ -292,12 +442,31 @@ def get_config_reader(rock_builder_home_dir: Path,
 
 # do all build steps for given process
 def do_therock(prj_builder, args):
+    from lib_python.trace_events import trace_span
+    from lib_python.trace_events import TRACE_CAT_APP
+
+    ret = False
+    if prj_builder is not None:
+        with trace_span(prj_builder.app_cfg_base_name, TRACE_CAT_APP):
+            ret = do_therock_app_phases(prj_builder, args)
+    return ret
+
+
+def do_therock_app_phases(prj_builder, args):
+    from lib_python.build_report import add_build_report_record
+    from lib_python.trace_events import trace_span
+    from lib_python.trace_events import TRACE_CAT_PHASE
+
     ret = False
     if prj_builder is not None:
         if prj_builder.is_build_enabled_on_current_os():
+            app_start_time = time.monotonic()
+            if prj_builder.use_rocm_sdk:
+                verify_rocm_sdk_install_if_pending()
             # setup first the project specific environment variables
             prj_builder.printout("start")
-            prj_builder.do_env_setup()
+            with trace_span("env_setup", TRACE_CAT_PHASE, {"app": prj_builder.app_cfg_base_name}):
+                prj_builder.do_env_setup()
             exec_next_phase = False
             # print("do_env_setup done")
 
@@ -314,37 +483,42 @@ def do_therock(prj_builder, args):
             if args.clean:
                 prj_builder.printout("clean")
                 prj_builder.clean(args.cmd_init_force_exec, args.cmd_any_force_exec)
-            if args.checkout or exec_next_phase:
-                prj_builder.printout("checkout")
-                prj_builder.checkout(args.cmd_init_force_exec, args.cmd_any_force_exec)
-                # enable hipify always when doing the code checkout
-                # even if it is not requested explicitly to be it's own command
-                args.hipify = True
-                #if args.cmd_any_force_exec: exec_next_phase = True
-            if args.hipify or exec_next_phase:
-                prj_builder.printout("hipify")
-                prj_builder.hipify(args.cmd_init_force_exec, args.cmd_any_force_exec)
-                #if args.cmd_any_force_exec: exec_next_phase = True
-            if args.pre_config or exec_next_phase:
-                prj_builder.printout("pre_config")
-                prj_builder.pre_config(args.cmd_init_force_exec, args.cmd_any_force_exec)
-                if args.cmd_any_force_exec: exec_next_phase = True
-            if args.config or exec_next_phase:
-                prj_builder.printout("config")
-                prj_builder.config(args.cmd_init_force_exec, args.cmd_any_force_exec)
-                if args.cmd_any_force_exec: exec_next_phase = True
-            if args.post_config or exec_next_phase:
-                prj_builder.printout("post_config")
-                prj_builder.post_config(args.cmd_init_force_exec, args.cmd_any_force_exec)
-                if args.cmd_any_force_exec: exec_next_phase = True
-            if args.build or exec_next_phase:
-                prj_builder.printout("build")
-                prj_builder.build(args.cmd_init_force_exec, args.cmd_any_force_exec)
-                if args.cmd_any_force_exec: exec_next_phase = True
-            if args.install or exec_next_phase:
-                prj_builder.printout("install")
-                prj_builder.install(args.cmd_init_force_exec, args.cmd_any_force_exec)
-                if args.cmd_any_force_exec: exec_next_phase = True
+            # install from the build cache replaces the phases from checkout to install
+            is_build_cache_hit = False
+            if not args.cmd_any_force_exec:
+                is_build_cache_hit = prj_builder.install_from_build_cache()
+            if not is_build_cache_hit:
+                if args.checkout or exec_next_phase:
+                    prj_builder.printout("checkout")
+                    prj_builder.checkout(args.cmd_init_force_exec, args.cmd_any_force_exec)
+                    # enable hipify always when doing the code checkout
+                    # even if it is not requested explicitly to be it's own command
+                    args.hipify = True
+                    #if args.cmd_any_force_exec: exec_next_phase = True
+                if args.hipify or exec_next_phase:
+                    prj_builder.printout("hipify")
+                    prj_builder.hipify(args.cmd_init_force_exec, args.cmd_any_force_exec)
+                    #if args.cmd_any_force_exec: exec_next_phase = True
+                if args.pre_config or exec_next_phase:
+                    prj_builder.printout("pre_config")
+                    prj_builder.pre_config(args.cmd_init_force_exec, args.cmd_any_force_exec)
+                    if args.cmd_any_force_exec: exec_next_phase = True
+                if args.config or exec_next_phase:
+                    prj_builder.printout("config")
+                    prj_builder.config(args.cmd_init_force_exec, args.cmd_any_force_exec)
+                    if args.cmd_any_force_exec: exec_next_phase = True
+                if args.post_config or exec_next_phase:
+                    prj_builder.printout("post_config")
+                    prj_builder.post_config(args.cmd_init_force_exec, args.cmd_any_force_exec)
+                    if args.cmd_any_force_exec: exec_next_phase = True
+                if args.build or exec_next_phase:
+                    prj_builder.printout("build")
+                    prj_builder.build(args.cmd_init_force_exec, args.cmd_any_force_exec)
+                    if args.cmd_any_force_exec: exec_next_phase = True
+                if args.install or exec_next_phase:
+                    prj_builder.printout("install")
+                    prj_builder.install(args.cmd_init_force_exec, args.cmd_any_force_exec)
+                    if args.cmd_any_force_exec: exec_next_phase = True
             if args.post_install or exec_next_phase:
                 prj_builder.printout("post_install")
                 prj_builder.post_install(args.cmd_init_force_exec, args.cmd_any_force_exec)
@@ -353,6 +527,9 @@ def do_therock(prj_builder, args):
             # so that they do not cause problem for next possible project handled
             prj_builder.undo_env_setup()
             #prj_builder.printout("done")
+            add_build_report_record({"app": prj_builder.app_cfg_base_name,
+                                     "success": True,
+                                     "wall_time": round(time.monotonic() - app_start_time, 3)})
             print("Success: " + prj_builder.app_cfg_base_name)
             ret = True
         else:
@@ -366,6 +543,463 @@ def do_therock(prj_builder, args):
     return ret
 
 
+# read the dependencies between apps from the app list file
+# and from the app config files
+def get_app_dependency_graph(rock_builder_home_dir: Path, app_manager):
+    import lib_python.app_builder as app_builder
+    from lib_python.app_scheduler import RockAppDependencyGraph
+
+    app_list = app_manager.get_external_app_list()
+    declared_deps = app_manager.get_declared_app_dependencies()
+    app_dep_dict = {}
+    app_name_dict = {}
+    for prj_item in app_list:
+        prj_cfg_file = get_app_cfg_path(rock_builder_home_dir, prj_item)
+        prj_cfg_base_name = get_app_cfg_base_name_without_extension(prj_cfg_file)
+        deps = list(declared_deps.get(prj_item.lower(), []))
+        if prj_cfg_base_name.lower() != prj_item.lower():
+            deps.extend(declared_deps.get(prj_cfg_base_name.lower(), []))
+        try:
+            cfg_info = app_builder.ConfigReader(prj_cfg_file)
+            app_name_dict[prj_item] = cfg_info.get_app_name()
+            deps.extend(cfg_info.get_app_dependencies())
+        except ValueError as e:
+            # error is reported later when the app build is started
+            print(str(e))
+        app_dep_dict[prj_item] = deps
+    try:
+        ret = RockAppDependencyGraph(app_list, app_dep_dict, app_name_dict)
+    except ValueError as e:
+        print("Error, " + str(e))
+        sys.exit(1)
+    return ret
+
+
+# Returns the command for building the app list item on a child rockbuilder process.
+def get_child_rockbuilder_cmd(rock_builder_home_dir: Path,
+                              app_manager,
+                              args,
+                              args_dict,
+                              prj_item):
+    prj_cfg_file = get_app_cfg_path(rock_builder_home_dir, str(prj_item))
+    prj_cfg_base_name = get_app_cfg_base_name_without_extension(prj_cfg_file)
+    prj_version_keyword = prj_cfg_base_name + "_version"
+    prj_version_keyword = prj_version_keyword.replace("-", "_")
+    version_override = args_dict[prj_version_keyword]
+    ret = [sys.executable,
+           (Path(rock_builder_home_dir) / "rockbuilder.py").as_posix(),
+           prj_cfg_file.as_posix()]
+    for phase_arg in CMD_PHASE_ARG_LIST:
+        if phase_arg in sys.argv:
+            ret.append(phase_arg)
+    if args.src_dir and app_manager.config_info.is_app_config():
+        ret.extend(["--src-dir", args.src_dir.as_posix()])
+    else:
+        ret.extend(["--src-base-dir", args.src_base_dir.as_posix()])
+    ret.extend(["--output-dir", args.output_dir.as_posix()])
+    if version_override:
+        ret.append("--" + prj_cfg_base_name + "-version=" + version_override)
+    return ret
+
+
+# Build each app in the list on its own rockbuilder process.
+# Phase arguments are passed to the child processes as they were given.
+def do_therock_app_list_in_parallel(rock_builder_home_dir: Path,
+                                    app_manager,
+                                    args,
+                                    args_dict):
+    import lib_python.app_builder as app_builder
+    from lib_python.app_scheduler import RockAppScheduler
+    from lib_python.jobserver import get_job_server_pass_fds
+
+    dep_graph = get_app_dependency_graph(rock_builder_home_dir, app_manager)
+    dep_graph.printout()
+    # child processes do not verify the rocm sdk,
+    # so it is verified here if any of the apps is using it
+    for prj_item in app_manager.get_external_app_list():
+        try:
+            cfg_info = app_builder.ConfigReader(get_app_cfg_path(rock_builder_home_dir, prj_item))
+        except ValueError:
+            continue
+        if cfg_info.is_rocm_sdk_used():
+            verify_rocm_sdk_install_if_pending()
+            break
+    # rocm sdk has been already verified and configured to env variables
+    child_env = os.environ.copy()
+    child_env[rcb_const.RCB__ENV_VAR_DISABLE_ROCM_SDK_CHECK] = "1"
+    child_env["PYTHONUNBUFFERED"] = "1"
+
+    def launch_app_build(prj_item):
+        exec_cmd = get_child_rockbuilder_cmd(rock_builder_home_dir, app_manager, args, args_dict, prj_item)
+        ret = subprocess.Popen(exec_cmd,
+                               cwd=rock_builder_home_dir,
+                               env=child_env,
+                               stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT,
+                               text=True,
+                               errors="replace",
+                               pass_fds=get_job_server_pass_fds())
+        return ret
+
+    scheduler = RockAppScheduler(dep_graph, args.max_parallel_apps, launch_app_build)
+    ret = scheduler.run()
+    return ret
+
+
+# Get app builder for the app list item.
+# Source dir is selected in a same way than when the app is build.
+def get_app_builder_for_app_list_item(rock_builder_home_dir: Path,
+                                      app_manager,
+                                      args,
+                                      args_dict,
+                                      prj_item,
+                                      printout_err: bool):
+    # argparser --> Keyword for parameter "--my-project-version=xyz" = "my_app_version"
+    # (app list of single app config contains the path of the config file)
+    prj_cfg_file = get_app_cfg_path(rock_builder_home_dir, str(prj_item))
+    prj_cfg_base_name = get_app_cfg_base_name_without_extension(prj_cfg_file)
+    prj_version_keyword = prj_cfg_base_name + "_version"
+    prj_version_keyword = prj_version_keyword.replace("-", "_")
+    version_override = args_dict[prj_version_keyword]
+    if args.src_dir and app_manager.config_info.is_app_config():
+        app_src_dir = args.src_dir
+    else:
+        app_src_dir = args.src_base_dir / prj_cfg_base_name
+    ret = app_manager.get_rock_app_builder(
+        app_src_dir,
+        prj_cfg_base_name,
+        prj_cfg_file,
+        args.output_dir,
+        version_override,
+        printout_err
+    )
+    return ret
+
+
+# Create source prefetcher for fetching the sources of the apps on background.
+# Returns None if background fetch is not used.
+def create_app_source_prefetcher(rock_builder_home_dir: Path,
+                                 app_manager,
+                                 args,
+                                 args_dict):
+    from lib_python.app_prefetcher import RockAppSourcePrefetcher
+
+    ret = None
+    if args.fetch_only:
+        prefetch_app_cnt = max(1, args.prefetch_apps)
+    elif (args.prefetch_apps > 0 and
+          args.checkout and
+          not args.cmd_any_force_exec and
+          args.max_parallel_apps <= 1):
+        # when phase arguments are given, checkout is done always
+        # when the app build is started, so there is no benefit of fetching it earlier.
+        prefetch_app_cnt = args.prefetch_apps
+    else:
+        return ret
+    prj_builder_list = []
+    for prj_item in app_manager.get_external_app_list():
+        prj_builder = get_app_builder_for_app_list_item(rock_builder_home_dir,
+                                                        app_manager,
+                                                        args,
+                                                        args_dict,
+                                                        prj_item,
+                                                        args.fetch_only)
+        if prj_builder is None:
+            if args.fetch_only:
+                print("Error, could not get a project builder: " + str(prj_item))
+                sys.exit(1)
+        elif not prj_builder.repo_url or not prj_builder.is_build_enabled_on_current_os():
+            prj_builder = None
+        elif not args.fetch_only and prj_builder.is_build_cache_used():
+            # sources are not needed if the app is installed from the build cache
+            prj_builder = None
+        prj_builder_list.append(prj_builder)
+    launch_app_fetch = None
+    if not args.fetch_only or not app_manager.config_info.is_app_config():
+        # Apps are fetched on child rockbuilder processes with the environment variables
+        # of the run, so that the environment of the app build done meanwhile
+        # is not used and the output of the fetch is written to the log file.
+        # (fetch of a single app is done on the current process)
+        prj_item_list = app_manager.get_external_app_list()
+        child_env = os.environ.copy()
+        child_env["PYTHONUNBUFFERED"] = "1"
+
+        def launch_app_fetch(app_index, log_file):
+            exec_cmd = get_child_rockbuilder_cmd(rock_builder_home_dir,
+                                                 app_manager,
+                                                 args,
+                                                 args_dict,
+                                                 prj_item_list[app_index])
+            exec_cmd.append("--fetch-only")
+            ret = subprocess.Popen(exec_cmd,
+                                   cwd=rock_builder_home_dir,
+                                   env=child_env,
+                                   stdin=subprocess.DEVNULL,
+                                   stdout=log_file,
+                                   stderr=subprocess.STDOUT)
+            return ret
+    ret = RockAppSourcePrefetcher(prj_builder_list,
+                                  prefetch_app_cnt,
+                                  args.cmd_init_force_exec,
+                                  args.cmd_any_force_exec,
+                                  launch_app_fetch)
+    return ret
+
+
+# Build cache locations are passed to app builds with environment variables.
+# Priority: --no-build-cache, command line parameter, environment variable, rockbuilder.cfg
+def setup_build_cache(args, rcb_cfg_reader):
+    from lib_python.src_snapshot import is_src_snapshot_cache_enabled
+
+    if args.no_build_cache:
+        for env_var in [rcb_const.RCB__ENV_VAR__BUILD_CACHE_DIR,
+                        rcb_const.RCB__ENV_VAR__BUILD_CACHE_URL,
+                        rcb_const.RCB__ENV_VAR__SRC_SNAPSHOT_CACHE]:
+            if env_var in os.environ:
+                del os.environ[env_var]
+        return
+    if args.build_cache_dir:
+        os.environ[rcb_const.RCB__ENV_VAR__BUILD_CACHE_DIR] = args.build_cache_dir.resolve().as_posix()
+    elif rcb_const.RCB__ENV_VAR__BUILD_CACHE_DIR not in os.environ:
+        if rcb_cfg_reader and rcb_cfg_reader.get_build_cache_dir():
+            os.environ[rcb_const.RCB__ENV_VAR__BUILD_CACHE_DIR] = rcb_cfg_reader.get_build_cache_dir()
+    if args.build_cache_url:
+        os.environ[rcb_const.RCB__ENV_VAR__BUILD_CACHE_URL] = args.build_cache_url
+    elif rcb_const.RCB__ENV_VAR__BUILD_CACHE_URL not in os.environ:
+        if rcb_cfg_reader and rcb_cfg_reader.get_build_cache_url():
+            os.environ[rcb_const.RCB__ENV_VAR__BUILD_CACHE_URL] = rcb_cfg_reader.get_build_cache_url()
+    # source snapshots are stored to the same cache than the python wheels
+    if args.src_snapshot_cache:
+        os.environ[rcb_const.RCB__ENV_VAR__SRC_SNAPSHOT_CACHE] = "1"
+    elif rcb_const.RCB__ENV_VAR__SRC_SNAPSHOT_CACHE not in os.environ:
+        if rcb_cfg_reader and rcb_cfg_reader.get_build_cache_src_snapshots():
+            os.environ[rcb_const.RCB__ENV_VAR__SRC_SNAPSHOT_CACHE] = rcb_cfg_reader.get_build_cache_src_snapshots()
+    if rcb_const.RCB__ENV_VAR__BUILD_CACHE_DIR in os.environ:
+        print("Build cache: " + os.environ[rcb_const.RCB__ENV_VAR__BUILD_CACHE_DIR])
+    if rcb_const.RCB__ENV_VAR__BUILD_CACHE_URL in os.environ:
+        print("Remote build cache: " + os.environ[rcb_const.RCB__ENV_VAR__BUILD_CACHE_URL])
+    if is_src_snapshot_cache_enabled():
+        print("Source snapshot cache enabled")
+
+
+# Compiler cache settings are passed to app builds with environment variables.
+# Priority: command line parameter, environment variable, rockbuilder.cfg
+# Compiler cache stats of all apps are printed when the rockbuilder exits.
+def setup_compiler_cache(args, rcb_cfg_reader, rock_builder_build_dir: Path):
+    from lib_python.compiler_cache import printout_compiler_cache_stats
+
+    cache_type = args.compiler_cache
+    if not cache_type:
+        cache_type = os.environ.get(rcb_const.RCB__ENV_VAR__COMPILER_CACHE)
+    if not cache_type and rcb_cfg_reader:
+        cache_type = rcb_cfg_reader.get_compiler_cache_type()
+    if not cache_type or cache_type == rcb_const.RCB__COMPILER_CACHE_TYPE_NONE:
+        if rcb_const.RCB__ENV_VAR__COMPILER_CACHE in os.environ:
+            del os.environ[rcb_const.RCB__ENV_VAR__COMPILER_CACHE]
+        return
+    if cache_type not in [rcb_const.RCB__COMPILER_CACHE_TYPE_CCACHE, rcb_const.RCB__COMPILER_CACHE_TYPE_SCCACHE]:
+        print("Error, unsupported compiler cache: " + cache_type)
+        sys.exit(1)
+    os.environ[rcb_const.RCB__ENV_VAR__COMPILER_CACHE] = cache_type
+    if rcb_const.RCB__ENV_VAR__COMPILER_CACHE_DIR not in os.environ:
+        cache_dir = None
+        if rcb_cfg_reader:
+            cache_dir = rcb_cfg_reader.get_compiler_cache_dir()
+        if not cache_dir:
+            cache_dir = rock_builder_build_dir / cache_type
+        os.environ[rcb_const.RCB__ENV_VAR__COMPILER_CACHE_DIR] = Path(cache_dir).resolve().as_posix()
+    if rcb_const.RCB__ENV_VAR__COMPILER_CACHE_MAX_SIZE not in os.environ:
+        max_size = None
+        if rcb_cfg_reader:
+            max_size = rcb_cfg_reader.get_compiler_cache_max_size()
+        if not max_size:
+            max_size = rcb_const.RCB__COMPILER_CACHE_DEF_MAX_SIZE
+        os.environ[rcb_const.RCB__ENV_VAR__COMPILER_CACHE_MAX_SIZE] = max_size
+    print("Compiler cache: " + cache_type)
+    print("    dir: " + os.environ[rcb_const.RCB__ENV_VAR__COMPILER_CACHE_DIR])
+    print("    max size: " + os.environ[rcb_const.RCB__ENV_VAR__COMPILER_CACHE_MAX_SIZE])
+    if rcb_const.RCB__ENV_VAR__COMPILER_CACHE_STATS_FILE not in os.environ:
+        # child rockbuilder processes append their stats to file of the parent process
+        rock_builder_build_dir.mkdir(parents=True, exist_ok=True)
+        stats_fname = rock_builder_build_dir / ("compiler_cache_stats_" + str(os.getpid()) + ".jsonl")
+        if stats_fname.exists():
+            stats_fname.unlink()
+        os.environ[rcb_const.RCB__ENV_VAR__COMPILER_CACHE_STATS_FILE] = stats_fname.as_posix()
+
+        def printout_stats_on_exit():
+            printout_compiler_cache_stats(stats_fname)
+            if stats_fname.exists():
+                stats_fname.unlink()
+        atexit.register(printout_stats_on_exit)
+
+
+# Trace events of all rockbuilder processes of the run are collected to the --trace file.
+# Child rockbuilder processes append their events to the event file of the parent process.
+def setup_trace(args, rock_builder_build_dir: Path):
+    from lib_python.trace_events import add_trace_complete_event
+    from lib_python.trace_events import is_trace_enabled
+    from lib_python.trace_events import set_trace_process_name
+    from lib_python.trace_events import write_chrome_trace
+    from lib_python.trace_events import TRACE_CAT_RUN
+
+    start_time = time.time()
+    if args.trace and not is_trace_enabled():
+        rock_builder_build_dir.mkdir(parents=True, exist_ok=True)
+        event_fname = rock_builder_build_dir / ("trace_events_" + str(os.getpid()) + ".jsonl")
+        if event_fname.exists():
+            event_fname.unlink()
+        os.environ[rcb_const.RCB__ENV_VAR__TRACE_EVENT_FILE] = event_fname.as_posix()
+        trace_fname = args.trace.resolve()
+
+        def write_trace_on_exit():
+            add_trace_complete_event("rockbuilder", TRACE_CAT_RUN, start_time, {"argv": sys.argv})
+            write_chrome_trace(event_fname, trace_fname)
+            print("Trace: " + trace_fname.as_posix())
+            if event_fname.exists():
+                event_fname.unlink()
+        atexit.register(write_trace_on_exit)
+    elif is_trace_enabled():
+        # child process of the parallel app build
+        atexit.register(add_trace_complete_event, "rockbuilder", TRACE_CAT_RUN, start_time, {"argv": sys.argv})
+    set_trace_process_name("rockbuilder " + os.path.basename(str(args.config_file)))
+
+
+# Resource usage of the phases of all app builds are collected to the build report of the run.
+# Child rockbuilder processes append their records to the record file of the parent process.
+def setup_build_report(rock_builder_build_dir: Path):
+    from lib_python.build_report import write_build_report
+    from lib_python.build_report import printout_build_report
+
+    if rcb_const.RCB__ENV_VAR__BUILD_REPORT_RECORD_FILE in os.environ:
+        return
+    start_time = time.time()
+    report_dir = rock_builder_build_dir / rcb_const.RCB__BUILD_REPORT_BASE_DIR
+    report_dir.mkdir(parents=True, exist_ok=True)
+    report_base_name = ("build_report_" +
+                        time.strftime("%Y%m%d_%H%M%S", time.localtime(start_time)) +
+                        "_" + str(os.getpid()))
+    record_fname = report_dir / (report_base_name + ".jsonl")
+    report_fname = report_dir / (report_base_name + ".json")
+    os.environ[rcb_const.RCB__ENV_VAR__BUILD_REPORT_RECORD_FILE] = record_fname.as_posix()
+
+    def write_report_on_exit():
+        report = write_build_report(record_fname, report_fname, start_time, sys.argv)
+        if report:
+            printout_build_report(report, report_fname)
+        if record_fname.exists():
+            record_fname.unlink()
+    atexit.register(write_report_on_exit)
+
+
+# Python wheels of the apps not used by the other apps of the run are queued by the app builds
+# and installed at the end of the run. Child rockbuilder processes append their wheels
+# to the queue file of the parent process.
+def setup_batch_wheel_install(args,
+                              rock_builder_home_dir: Path,
+                              rock_builder_build_dir: Path,
+                              app_manager):
+    global _wheel_install_queue_fname
+
+    if not args.batch_wheel_install or rcb_const.RCB__ENV_VAR__WHEEL_INSTALL_QUEUE_FILE in os.environ:
+        return
+    deferred_app_list = []
+    if app_manager.config_info.is_app_config():
+        prj_cfg_file = get_app_cfg_path(rock_builder_home_dir, args.config_file)
+        deferred_app_list.append(get_app_cfg_base_name_without_extension(prj_cfg_file))
+    else:
+        dep_graph = get_app_dependency_graph(rock_builder_home_dir, app_manager)
+        for prj_item in dep_graph.get_app_list():
+            if not dep_graph.get_users(prj_item):
+                prj_cfg_file = get_app_cfg_path(rock_builder_home_dir, prj_item)
+                deferred_app_list.append(get_app_cfg_base_name_without_extension(prj_cfg_file))
+    rock_builder_build_dir.mkdir(parents=True, exist_ok=True)
+    queue_fname = rock_builder_build_dir / ("python_wheel_install_queue_" + str(os.getpid()) + ".jsonl")
+    if queue_fname.exists():
+        queue_fname.unlink()
+    os.environ[rcb_const.RCB__ENV_VAR__WHEEL_INSTALL_QUEUE_FILE] = queue_fname.as_posix()
+    os.environ[rcb_const.RCB__ENV_VAR__WHEEL_INSTALL_DEFERRED_APPS] = " ".join(deferred_app_list)
+    _wheel_install_queue_fname = queue_fname
+    # wheels of the apps build successfully are installed also when the run fails
+    atexit.register(install_queued_python_wheels_of_run, False)
+
+
+# Install the python wheels queued by the app builds of the run
+def install_queued_python_wheels_of_run(exit_on_error=True):
+    global _wheel_install_queue_fname
+
+    from lib_python.wheel_install import install_queued_python_wheels
+
+    if _wheel_install_queue_fname:
+        queue_fname = _wheel_install_queue_fname
+        _wheel_install_queue_fname = None
+        res = install_queued_python_wheels(queue_fname)
+        if not res and exit_on_error:
+            sys.exit(1)
+
+
+# Git mirror location is passed to app builds with environment variable.
+# Priority: --git-mirror-dir, environment variable, rockbuilder.cfg
+def setup_git_mirror(args, rcb_cfg_reader):
+    if args.git_mirror_dir:
+        os.environ[rcb_const.RCB__ENV_VAR__GIT_MIRROR_DIR] = args.git_mirror_dir.resolve().as_posix()
+    elif rcb_const.RCB__ENV_VAR__GIT_MIRROR_DIR not in os.environ:
+        if rcb_cfg_reader and rcb_cfg_reader.get_git_mirror_dir():
+            os.environ[rcb_const.RCB__ENV_VAR__GIT_MIRROR_DIR] = Path(rcb_cfg_reader.get_git_mirror_dir()).resolve().as_posix()
+    if rcb_const.RCB__ENV_VAR__GIT_MIRROR_DIR in os.environ:
+        print("Git mirror: " + os.environ[rcb_const.RCB__ENV_VAR__GIT_MIRROR_DIR])
+
+
+# Submodule fetch job count is passed to app builds with environment variable.
+# Priority: PROP_FETCH_JOBS in app cfg, --fetch-jobs, environment variable, rockbuilder.cfg
+def setup_fetch_jobs(args, rcb_cfg_reader):
+    if args.fetch_jobs:
+        os.environ[rcb_const.RCB__ENV_VAR__FETCH_JOBS] = args.fetch_jobs
+    elif rcb_const.RCB__ENV_VAR__FETCH_JOBS not in os.environ:
+        if rcb_cfg_reader and rcb_cfg_reader.get_fetch_jobs():
+            os.environ[rcb_const.RCB__ENV_VAR__FETCH_JOBS] = rcb_cfg_reader.get_fetch_jobs()
+    # time to live of the app versions resolved with git ls-remote
+    if rcb_const.RCB__ENV_VAR__LS_REMOTE_CACHE_TTL not in os.environ:
+        if rcb_cfg_reader and rcb_cfg_reader.get_ls_remote_cache_ttl():
+            os.environ[rcb_const.RCB__ENV_VAR__LS_REMOTE_CACHE_TTL] = rcb_cfg_reader.get_ls_remote_cache_ttl()
+
+
+# Fast mode is passed to app builds with environment variable.
+# Priority: --fast or --no-fast, environment variable, enabled if the output is not a terminal
+def setup_fast_mode(args):
+    if args.fast:
+        os.environ[rcb_const.RCB__ENV_VAR__FAST_MODE] = "1"
+    elif args.no_fast:
+        os.environ[rcb_const.RCB__ENV_VAR__FAST_MODE] = "0"
+    elif rcb_const.RCB__ENV_VAR__FAST_MODE not in os.environ:
+        if sys.stdout.isatty():
+            os.environ[rcb_const.RCB__ENV_VAR__FAST_MODE] = "0"
+        else:
+            os.environ[rcb_const.RCB__ENV_VAR__FAST_MODE] = "1"
+
+
+# Start the job server shared by all app builds.
+# Child rockbuilder processes use the job server of the parent process.
+def start_job_server(args, rock_builder_build_dir: Path):
+    from lib_python.jobserver import RockJobServer
+    from lib_python.jobserver import is_job_server_started
+
+    ret = None
+    if is_job_server_started():
+        return ret
+    job_cnt = args.jobs
+    if not job_cnt and (args.load_average or args.max_parallel_apps > 1):
+        job_cnt = os.cpu_count() or 1
+    if job_cnt:
+        ret = RockJobServer(job_cnt,
+                            args.load_average,
+                            args.max_parallel_apps,
+                            rock_builder_build_dir)
+        ret.start()
+        atexit.register(ret.stop)
+    return ret
+
+
 def verify_rockbuilder_config(rcb_cfg_reader):
     if rcb_cfg_reader:
         gpu_list = rcb_cfg_reader.get_configured_gpu_list()
@@ -374,6 +1008,8 @@ def verify_rockbuilder_config(rcb_cfg_reader):
             return
         print("Rockbuilder is not yet configured, launching config UI")
         time.sleep(1)
+        # config UI and curses are imported only when the UI is needed
+        import rockbuilder_cfg as rcb_cfg_writer
         saved_cfg = rcb_cfg_writer.show_and_process_selections()
         if saved_cfg:
             print("ROCM SDK and target GPU configured ok.")
@@ -417,11 +1053,9 @@ def check_distro_specific_environment_variables():
 # - rocm_sdk from from the python wheels provied by therock
 # - rocm_sdk from the therock sources
 # - rocm sdk from other location (by specifiying ROCM_HOME before opening rockbuilder_cfg.py)
-def verify_rocm_sdk_install(rcb_cfg_reader, app_manager, rock_builder_home_dir):
-    check_distro_specific_environment_variables()
+def verify_rocm_sdk_install(rcb_cfg_reader, app_manager, rock_builder_home_dir, args):
     if rcb_const.RCB__ENV_VAR_DISABLE_ROCM_SDK_CHECK in os.environ:
         return
-    default_src_base_dir = rcb_const.get_app_src_base_dir()
     rocm_home = rcb_cfg_reader.get_locally_build_rocm_sdk_home()
     if rocm_home:
         print("Rockbuilder is configured to use ROCM_SDK build by the rockbuilder itself")
@@ -443,7 +1077,9 @@ def verify_rocm_sdk_install(rcb_cfg_reader, app_manager, rock_builder_home_dir):
             print("")
             print("ROCM_SDK build by rockbuilder not found")
             print("...building it first... This gonna take a while ...")
-            time.sleep(2)
+            if not is_fast_mode():
+                from lib_python.trace_events import sleep_with_trace
+                sleep_with_trace(2)
             # environment variables not returned
             # --> sdk not found
             # --> build rocm_sdk by using therock
@@ -461,12 +1097,8 @@ def verify_rocm_sdk_install(rcb_cfg_reader, app_manager, rock_builder_home_dir):
                 )
             if prj_builder:
                 # force the building of rocm sdk first
-                app_list = ["therock"]
-                arg_parser = create_build_argument_parser(rock_builder_home_dir,
-                                    default_src_base_dir,
-                                    app_list)
-                args = parse_build_arguments(arg_parser)
-                do_therock(prj_builder, args)
+                # (with a copy of arguments, do_therock modifies them)
+                do_therock(prj_builder, argparse.Namespace(**vars(args)))
                 # set rocm home after building the rocm sdk
                 set_rocm_home_to_env_variables(rocm_home)
     else:
@@ -519,7 +1151,112 @@ def verify_rocm_sdk_install(rcb_cfg_reader, app_manager, rock_builder_home_dir):
                 sys.exit(1)
 
 
+# Verify the rocm sdk install if it has not yet been done.
+def verify_rocm_sdk_install_if_pending():
+    global _rocm_sdk_verify_arg_list
+
+    if _rocm_sdk_verify_arg_list:
+        verify_arg_list = _rocm_sdk_verify_arg_list
+        # cleared before verify, so that the therock build started by the verify does not verify it again
+        _rocm_sdk_verify_arg_list = None
+        verify_rocm_sdk_install(*verify_arg_list)
+
+
+# Command phases that the build of the app would execute with the given arguments.
+# Phase is pending if its stamp file does not exist, phase inputs are not compared.
+def get_dry_run_cmd_phase_list(prj_builder, args):
+    ret = []
+    force_exec = args.cmd_init_force_exec or args.cmd_any_force_exec
+    exec_next_phase = args.cmd_init_force_exec
+    for build_step in BUILD_STEP_LIST:
+        # clean is executed after init and it deletes all phase stamps
+        is_stamp_deleted = args.clean and build_step != "init"
+        if build_step == "init" or getattr(args, build_step) or exec_next_phase:
+            for phase_name in prj_builder.get_build_step_cmd_phase_list(build_step):
+                if force_exec or is_stamp_deleted or not prj_builder.is_cmd_phase_done(phase_name):
+                    ret.append(phase_name)
+            if args.cmd_any_force_exec and build_step not in ("init", "checkout", "hipify"):
+                exec_next_phase = True
+        if build_step == "init" and args.clean:
+            ret.append(rcb_const.RCB__APP_CFG__KEY__CMD_CLEAN)
+    return ret
+
+
+# Printout the phase status of each app in the app list without building them.
+# With --dry-run the phases that the build would execute are printed instead.
+def printout_app_list_status(rock_builder_home_dir: Path,
+                             app_manager,
+                             args,
+                             args_dict):
+    for prj_item in app_manager.get_external_app_list():
+        prj_builder = get_app_builder_for_app_list_item(rock_builder_home_dir,
+                                                        app_manager,
+                                                        args,
+                                                        args_dict,
+                                                        prj_item,
+                                                        True)
+        if prj_builder is None:
+            print("Error, could not get a project builder: " + str(prj_item))
+            sys.exit(1)
+        print(prj_builder.app_cfg_base_name + ":")
+        if not prj_builder.is_build_enabled_on_current_os():
+            print("    build disabled on current os")
+            continue
+        if prj_builder.repo_url:
+            if Path(prj_builder.app_src_dir_path).exists():
+                print("    source:           " + str(prj_builder.app_src_dir_path))
+            else:
+                print("    source:           not checked out")
+        if args.dry_run:
+            phase_list = get_dry_run_cmd_phase_list(prj_builder, args)
+            if phase_list:
+                print("    phases to execute: " + " ".join(phase_list))
+            else:
+                print("    phases to execute: none")
+        else:
+            for build_step in BUILD_STEP_LIST:
+                for phase_name in prj_builder.get_build_step_cmd_phase_list(build_step):
+                    if prj_builder.is_cmd_phase_done(phase_name):
+                        print("    " + phase_name.ljust(18) + "done")
+                    else:
+                        print("    " + phase_name.ljust(18) + "pending")
+
+
+# Print the critical path and the simulated build times of the app list.
+# Durations of the apps are read from the build reports of the earlier builds.
+def printout_app_list_analysis(rock_builder_home_dir: Path,
+                               rock_builder_build_dir: Path,
+                               app_manager,
+                               args):
+    from lib_python.build_analysis import read_app_phase_durations
+    from lib_python.build_analysis import printout_build_analysis
+
+    report_dir = rock_builder_build_dir / rcb_const.RCB__BUILD_REPORT_BASE_DIR
+    phase_dict, report_cnt = read_app_phase_durations(report_dir)
+    if not report_cnt:
+        print("Error, no build reports found from directory: " + report_dir.as_posix())
+        print("Phase durations used in the analysis are read from the build reports of the earlier builds.")
+        sys.exit(1)
+    dep_graph = get_app_dependency_graph(rock_builder_home_dir, app_manager)
+    dep_graph.printout()
+    # build reports use the app cfg base names
+    app_phase_dict = {}
+    for prj_item in dep_graph.get_app_list():
+        prj_cfg_file = get_app_cfg_path(rock_builder_home_dir, prj_item)
+        prj_cfg_base_name = get_app_cfg_base_name_without_extension(prj_cfg_file)
+        if prj_cfg_base_name in phase_dict:
+            app_phase_dict[prj_item] = phase_dict[prj_cfg_base_name]
+    printout_build_analysis(dep_graph,
+                            app_phase_dict,
+                            report_cnt,
+                            report_dir,
+                            args.max_parallel_apps,
+                            args.jobs)
+
+
 def main():
+    global _rocm_sdk_verify_arg_list
+
     is_posix = not any(platform.win32_ver())
     rocm_sdk_local_build_needed = False
     
@@ -531,6 +1268,30 @@ def main():
     
     verify_env__python()
 
+    # arguments are parsed before the configuration is verified,
+    # so that the --help, --status, --dry-run and --analyze do not require the configuration
+    args, unknown_arg_list = parse_build_arguments(rock_builder_home_dir,
+                                                   default_src_base_dir)
+    app_manager = get_app_list_manager(rock_builder_home_dir, args.config_file)
+    app_list = app_manager.get_external_app_list()
+    parse_app_version_arguments(args, unknown_arg_list, app_list)
+    # store the arguments to dictionary to make it easier to get "app_name"-version parameters
+    args_dict = args.__dict__
+    if args.status or args.dry_run:
+        printout_app_list_status(rock_builder_home_dir,
+                                 app_manager,
+                                 args,
+                                 args_dict)
+        return
+    if args.analyze:
+        printout_app_list_analysis(rock_builder_home_dir,
+                                   rock_builder_build_dir,
+                                   app_manager,
+                                   args)
+        return
+
+    # trace is written when the run ends, so it is set up first
+    setup_trace(args, rock_builder_build_dir)
     rcb_cfg_reader = get_config_reader(rock_builder_home_dir,
                               rock_builder_build_dir)
     verify_rockbuilder_config(rcb_cfg_reader)
@@ -538,16 +1299,31 @@ def main():
 		# read the configure again if the configuration was only done above
         rcb_cfg_reader = get_config_reader(rock_builder_home_dir,
                                            rock_builder_build_dir)
-    app_manager = get_app_list_manager(rock_builder_home_dir, default_src_base_dir)
-    verify_rocm_sdk_install(rcb_cfg_reader, app_manager, rock_builder_home_dir)    
-
-    app_list = app_manager.get_external_app_list()
     print(app_list)
 
-    arg_parser = create_build_argument_parser(rock_builder_home_dir,
-                                    default_src_base_dir,
-                                    app_list)
-    args = parse_build_arguments(arg_parser)
+    setup_build_cache(args, rcb_cfg_reader)
+    setup_compiler_cache(args, rcb_cfg_reader, rock_builder_build_dir)
+    setup_git_mirror(args, rcb_cfg_reader)
+    setup_fetch_jobs(args, rcb_cfg_reader)
+    setup_fast_mode(args)
+    setup_build_report(rock_builder_build_dir)
+    setup_batch_wheel_install(args, rock_builder_home_dir, rock_builder_build_dir, app_manager)
+    # source code fetch does not require rocm sdk,
+    # so it can be started before the rocm sdk install is verified
+    prefetcher = create_app_source_prefetcher(rock_builder_home_dir,
+                                              app_manager,
+                                              args,
+                                              args_dict)
+    if args.fetch_only:
+        res = prefetcher.run_all()
+        if not res:
+            sys.exit(1)
+        return
+    if prefetcher:
+        prefetcher.start(0)
+    check_distro_specific_environment_variables()
+    # rocm sdk install is verified when the first app using it is build
+    _rocm_sdk_verify_arg_list = [rcb_cfg_reader, app_manager, rock_builder_home_dir, args]
 
     # add output dir to environment variables
     if args.src_dir:
@@ -562,8 +1338,6 @@ def main():
         os.environ["RCB_SRC_DIR"] = args.src_base_dir.as_posix()
     os.environ["RCB_ARTIFACT_EXPORT_DIR"] = args.output_dir.as_posix()
 
-    # store the arguments to dictionary to make it easier to get "app_name"-version parameters
-    args_dict = args.__dict__
     printout_build_arguments(args)
     #verify_build_env(args, is_posix, rock_builder_home_dir, rock_builder_build_dir)
     printout_build_env_info()
@@ -572,7 +1346,11 @@ def main():
         print(f"    Project [{ii}]: {prj_item}")
 
     # small delay to allow user to see env variable printouts before the build starts
-    time.sleep(1)
+    if not is_fast_mode():
+        from lib_python.trace_events import sleep_with_trace
+        sleep_with_trace(1)
+
+    start_job_server(args, rock_builder_build_dir)
 
     if not app_manager.config_info.is_app_config():
         # process all apps specified in the core_project.pcfg
@@ -581,28 +1359,34 @@ def main():
             print('Alternatively you could use the "--src-base-dir" parameter.')
             print("")
             sys.exit(1)
+        if args.max_parallel_apps > 1:
+            res = do_therock_app_list_in_parallel(rock_builder_home_dir,
+                                                  app_manager,
+                                                  args,
+                                                  args_dict)
+            if not res:
+                sys.exit(1)
+            install_queued_python_wheels_of_run()
+            return
         for ii, prj_item in enumerate(app_list):
             print(f"[{ii}]: {prj_item}")
-            # argparser --> Keyword for parameter "--my-project-version=xyz" = "my_app_version"
-            prj_cfg_file = get_app_cfg_path(rock_builder_home_dir, app_list[ii])
-            prj_cfg_base_name = get_app_cfg_base_name_without_extension(prj_cfg_file)
-            prj_version_keyword = prj_cfg_base_name + "_version"
-            prj_version_keyword = prj_version_keyword.replace("-", "_")
-            version_override = args_dict[prj_version_keyword]
             # when issuing a command for all apps, we assume that the src_base_dir
             # is the base source directory under each project specific directory is checked out.
-            prj_builder = app_manager.get_rock_app_builder(
-                args.src_base_dir / prj_cfg_base_name,
-                prj_cfg_base_name,
-                prj_cfg_file,
-                args.output_dir,
-                version_override,
-                True
-            )
+            prj_builder = get_app_builder_for_app_list_item(rock_builder_home_dir,
+                                                            app_manager,
+                                                            args,
+                                                            args_dict,
+                                                            prj_item,
+                                                            True)
             if prj_builder is None:
                 print("Error, could not get a project builder")
                 sys.exit(1)
             else:
+                if prefetcher:
+                    # wait that background fetch of the app is done and
+                    # start fetching next apps while this app is build
+                    prefetcher.wait(ii)
+                    prefetcher.start(ii + 1)
                 do_therock(prj_builder, args)
     else:
         # process only a single project cfg file
@@ -633,10 +1417,13 @@ def main():
                 True
             )
         if prj_builder:
+            if prefetcher:
+                prefetcher.wait(0)
             do_therock(prj_builder, args)
         else:
             print("Error, failed to find the target project.")
             sys.exit(1)
+    install_queued_python_wheels_of_run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,465 @@
+#!/usr/bin/env python
+
+# Benchmark of the RockBuilder's own orchestration overhead.
+#
+# Generates synthetic app config files and an app list file for the given number
+# of apps, local bare git repositories with submodules and patch sets for them
+# and a fake ROCm SDK directory, then runs the RockBuilder copied from this
+# directory against them:
+#
+#     ./rockbuilder_benchmark.py --app-count 100
+#
+# Build commands of the apps do nothing (or sleep with --cmd-sleep), so the
+# times measured are spent in the config parsing, checkout, patch application,
+# hipify commits, environment setup and phase stamp handling of the RockBuilder.
+# Times of the individual operations are read from the --trace file of each run.
+# Results are saved to a JSON file which can be compared with the results of
+# the earlier commits:
+#
+#     ./rockbuilder_benchmark.py --app-count 100 --compare build/benchmark_results/benchmark_<commit>.json
+#
+# Benchmark does not need a network connection or the ROCm SDK.
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+from lib_python.utils import verify_env__python
+
+RCB_BENCHMARK_FORMAT_VERSION = 1
+RCB_BENCHMARK_APP_VERSION = "main"
+RCB_BENCHMARK_APP_LIST_NAME = "benchmark"
+RCB_BENCHMARK_GIT_ENV = {"GIT_AUTHOR_NAME": "rcb",
+                         "GIT_AUTHOR_EMAIL": "rcb@localhost",
+                         "GIT_COMMITTER_NAME": "rcb",
+                         "GIT_COMMITTER_EMAIL": "rcb@localhost",
+                         # submodules are cloned from the local repositories
+                         "GIT_CONFIG_COUNT": "2",
+                         "GIT_CONFIG_KEY_0": "protocol.file.allow",
+                         "GIT_CONFIG_VALUE_0": "always",
+                         "GIT_CONFIG_KEY_1": "init.defaultBranch",
+                         "GIT_CONFIG_VALUE_1": "main"}
+# build phases executed after the checkout and hipify
+RCB_BENCHMARK_BUILD_PHASE_LIST = [rcb_const.RCB__APP_CFG__KEY__CMD_PRE_CONFIG,
+                                  rcb_const.RCB__APP_CFG__KEY__CMD_CONFIG,
+                                  rcb_const.RCB__APP_CFG__KEY__CMD_POST_CONFIG,
+                                  rcb_const.RCB__APP_CFG__KEY__CMD_BUILD,
+                                  rcb_const.RCB__APP_CFG__KEY__CMD_INSTALL,
+                                  rcb_const.RCB__APP_CFG__KEY__CMD_POST_INSTALL]
+
+
+def get_app_name(app_index: int):
+    ret = "bench_app_" + str(app_index).zfill(3)
+    return ret
+
+
+def exec_git(args: list, cwd: Path):
+    subprocess.run(["git"] + args, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+
+
+def write_repo_files(repo_dir: Path, file_cnt: int):
+    src_dir = repo_dir / "src"
+    src_dir.mkdir(parents=True, exist_ok=True)
+    for ii in range(file_cnt):
+        (src_dir / ("file_" + str(ii) + ".txt")).write_text("line 1\nline 2\nline 3\n")
+
+
+# Create bare repository from the files in the work directory
+def create_bare_repo(work_dir: Path, bare_repo_dir: Path):
+    exec_git(["add", "-A"], work_dir)
+    exec_git(["commit", "-q", "-m", "initial version"], work_dir)
+    exec_git(["clone", "-q", "--bare", work_dir.as_posix(), bare_repo_dir.as_posix()], work_dir.parent)
+
+
+# Create the patch file committing the modify_func changes to the clone of the repository
+def create_patch(bare_repo_dir: Path, tmp_dir: Path, patch_dir: Path, subject: str, modify_func):
+    clone_dir = tmp_dir / "patch_clone"
+    if clone_dir.exists():
+        shutil.rmtree(clone_dir)
+    exec_git(["clone", "-q", bare_repo_dir.as_posix(), clone_dir.as_posix()], tmp_dir)
+    modify_func(clone_dir)
+    exec_git(["add", "-A"], clone_dir)
+    exec_git(["commit", "-q", "-m", subject], clone_dir)
+    exec_git(["format-patch", "-q", "-1", "-o", patch_dir.as_posix()], clone_dir)
+    shutil.rmtree(clone_dir)
+
+
+def append_to_file(fname: Path, text: str):
+    with open(fname, "a") as out_file:
+        out_file.write(text)
+
+
+# Fake ROCm SDK directory that contains the files searched by the get_rocm_sdk_env_variables()
+def create_fake_rocm_sdk(rocm_sdk_dir: Path):
+    for cur_dir in ["bin", "lib/llvm/bin", "lib/llvm/amdgcn/bitcode", "include", ".info"]:
+        (rocm_sdk_dir / cur_dir).mkdir(parents=True, exist_ok=True)
+    for fname in ["bin/hipcc", "lib/llvm/bin/clang", "lib/llvm/bin/clang++"]:
+        (rocm_sdk_dir / fname).write_text("#!/bin/sh\nexit 0\n")
+        (rocm_sdk_dir / fname).chmod(0o755)
+    (rocm_sdk_dir / ".info" / "version").write_text("0.0.0-benchmark\n")
+
+
+# Copy of the rockbuilder to the workspace directory, so that the apps, patches
+# and the build and source directories of the benchmark do not mix with the ones of the user.
+def create_workspace(workspace_dir: Path):
+    workspace_dir.mkdir(parents=True)
+    shutil.copy2(rcb_const.RCB__ROOT_DIR / "rockbuilder.py", workspace_dir / "rockbuilder.py")
+    shutil.copytree(rcb_const.RCB__ROOT_DIR / "lib_python",
+                    workspace_dir / "lib_python",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    (workspace_dir / rcb_const.RCB__APP_CFG_DEFAULT_BASE_DIR).mkdir()
+
+
+def create_app_cfg(cfg_fname: Path, app_name: str, repo_url: Path, cmd: str):
+    cmd_list = []
+    for phase_name in RCB_BENCHMARK_BUILD_PHASE_LIST:
+        cmd_list.append(phase_name + " = " + cmd)
+    cfg_fname.write_text("[app_info]\n" +
+                         "APP_NAME=" + app_name + "\n" +
+                         "REPO_URL=" + repo_url.as_posix() + "\n" +
+                         "APP_VERSION=" + RCB_BENCHMARK_APP_VERSION + "\n" +
+                         "\n" +
+                         "PROP_IS_ROCM_SDK_USED=YES\n" +
+                         "\n" +
+                         "ENV_VAR =\n" +
+                         "       BENCH_APP_NAME=" + app_name + "\n" +
+                         "       BENCH_APP_VAR=${BENCH_APP_NAME}_${ROCM_HOME}\n" +
+                         "\n" +
+                         "CMD_EXEC_DIR=${RCB_APP_SRC_DIR}\n" +
+                         "CMD_HIPIFY = for ff in src/*.txt sub_*/src/*.txt; do echo \"hipified\" >> $ff; done\n" +
+                         "\n".join(cmd_list) + "\n")
+
+
+# Generate the app config files, app list, git repositories, patch sets and rocm sdk used by the benchmark
+def create_fixtures(work_dir: Path, workspace_dir: Path, args):
+    fixture_dir = work_dir / "fixtures"
+    tmp_dir = fixture_dir / "tmp"
+    tmp_dir.mkdir(parents=True)
+    create_fake_rocm_sdk(fixture_dir / "rocm_sdk")
+
+    # submodule repositories are shared by all apps
+    sub_name_list = []
+    for ii in range(args.submodule_count):
+        sub_name = "sub_" + str(ii)
+        sub_work_dir = tmp_dir / sub_name
+        sub_work_dir.mkdir()
+        exec_git(["init", "-q"], sub_work_dir)
+        write_repo_files(sub_work_dir, args.file_count)
+        create_bare_repo(sub_work_dir, fixture_dir / (sub_name + ".git"))
+        sub_name_list.append(sub_name)
+    # app repositories are cloned from the same template repository
+    app_work_dir = tmp_dir / "app"
+    app_work_dir.mkdir()
+    exec_git(["init", "-q"], app_work_dir)
+    write_repo_files(app_work_dir, args.file_count)
+    for sub_name in sub_name_list:
+        exec_git(["submodule", "-q", "add", (fixture_dir / (sub_name + ".git")).as_posix(), sub_name], app_work_dir)
+    app_template_dir = fixture_dir / "app_template.git"
+    create_bare_repo(app_work_dir, app_template_dir)
+
+    # patch sets are same for each app
+    patch_template_dir = tmp_dir / "patches"
+    for ii in range(args.patch_count):
+        create_patch(app_template_dir, tmp_dir, patch_template_dir / "app" / "base", "base patch " + str(ii),
+                     lambda repo_dir: append_to_file(repo_dir / "src" / "file_0.txt", "patched\n"))
+        create_patch(app_template_dir, tmp_dir, patch_template_dir / "app" / "hipified", "hipified patch " + str(ii),
+                     lambda repo_dir: (repo_dir / ("hipified_patch_" + str(ii) + ".txt")).write_text("hipified\n"))
+        for sub_name in sub_name_list:
+            create_patch(fixture_dir / (sub_name + ".git"), tmp_dir, patch_template_dir / sub_name / "base", "base patch " + str(ii),
+                         lambda repo_dir: append_to_file(repo_dir / "src" / "file_0.txt", "patched\n"))
+
+    if args.cmd_sleep > 0:
+        cmd = "sleep " + str(args.cmd_sleep)
+    else:
+        cmd = "true"
+    app_list = []
+    for ii in range(args.app_count):
+        app_name = get_app_name(ii)
+        app_repo_dir = fixture_dir / (app_name + ".git")
+        exec_git(["clone", "-q", "--bare", app_template_dir.as_posix(), app_repo_dir.as_posix()], fixture_dir)
+        app_patch_dir = workspace_dir / rcb_const.RCB__APP_PATCHES_BASE_DIR / app_name / RCB_BENCHMARK_APP_VERSION
+        if args.patch_count > 0:
+            shutil.copytree(patch_template_dir / "app", app_patch_dir / app_name)
+            for sub_name in sub_name_list:
+                shutil.copytree(patch_template_dir / sub_name, app_patch_dir / sub_name)
+        create_app_cfg(workspace_dir / rcb_const.RCB__APP_CFG_DEFAULT_BASE_DIR / (app_name + rcb_const.RCB__APP_CFG_FILE_SUFFIX),
+                       app_name,
+                       app_repo_dir,
+                       cmd)
+        app_list.append(app_name)
+    app_list_fname = (workspace_dir /
+                      rcb_const.RCB__APP_CFG_DEFAULT_BASE_DIR /
+                      (RCB_BENCHMARK_APP_LIST_NAME + rcb_const.RCB__APP_LIST_CFG_FILE_SUFFIX))
+    app_list_fname.write_text("[apps]\napp_list=\n    " + "\n    ".join(app_list) + "\n")
+    shutil.rmtree(tmp_dir)
+
+
+def get_benchmark_env(work_dir: Path):
+    ret = dict(os.environ)
+    ret.update(RCB_BENCHMARK_GIT_ENV)
+    for env_name in [rcb_const.RCB__ENV_VAR__BUILD_REPORT_RECORD_FILE,
+                     rcb_const.RCB__ENV_VAR__TRACE_EVENT_FILE,
+                     "ROCM_PATH"]:
+        ret.pop(env_name, None)
+    ret[rcb_const.RCB__ENV_VAR_DISABLE_ROCM_SDK_CHECK] = "1"
+    ret["ROCM_HOME"] = (work_dir / "fixtures" / "rocm_sdk").as_posix()
+    # gpu list is not queried from the fake rocm sdk
+    ret[rcb_const.RCB__ENV_VAR__AMDGPU_TARGETS] = "gfx1201"
+    return ret
+
+
+# Run the rockbuilder of the workspace and return the wall time and the trace events of the run.
+# (--status and --dry-run runs do not write the trace)
+def exec_rockbuilder(workspace_dir: Path, env: dict, run_name: str, arg_list: list):
+    trace_fname = workspace_dir / rcb_const.RCB__APP_BUILD_BASE_DIR / ("benchmark_" + run_name + ".json")
+    log_fname = workspace_dir / rcb_const.RCB__APP_BUILD_BASE_DIR / ("benchmark_" + run_name + ".log")
+    log_fname.parent.mkdir(parents=True, exist_ok=True)
+    exec_cmd = [sys.executable,
+                "rockbuilder.py",
+                (rcb_const.RCB__APP_CFG_DEFAULT_BASE_DIR + "/" +
+                 RCB_BENCHMARK_APP_LIST_NAME + rcb_const.RCB__APP_LIST_CFG_FILE_SUFFIX),
+                "--trace",
+                trace_fname.as_posix()] + arg_list
+    if trace_fname.exists():
+        trace_fname.unlink()
+    start_time = time.monotonic()
+    with open(log_fname, "w") as log_file:
+        result = subprocess.run(exec_cmd, cwd=workspace_dir, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    wall_time = time.monotonic() - start_time
+    if result.returncode != 0:
+        print(log_fname.read_text()[-5000:])
+        print("Error, benchmark run failed: " + run_name)
+        print("    " + " ".join(exec_cmd))
+        sys.exit(1)
+    event_list = []
+    if trace_fname.exists():
+        with open(trace_fname, "r") as trace_file:
+            event_list = [ev for ev in json.load(trace_file)["traceEvents"] if ev["ph"] == "X"]
+    ret = (wall_time, event_list)
+    return ret
+
+
+# Sum of the durations of the events in seconds
+def get_event_time(event_list: list, cat: str, name_list: list = None, name_prefix: str = None):
+    ret = 0
+    for ev in event_list:
+        if (ev["cat"] == cat and
+                (name_list is None or ev["name"] in name_list) and
+                (name_prefix is None or ev["name"].startswith(name_prefix))):
+            ret = ret + ev["dur"]
+    ret = ret / 1000000
+    return ret
+
+
+# Sum of the durations of the git commands executed during the given phases, except the patch applying
+def get_phase_git_cmd_time(event_list: list, phase_name: str):
+    ret = 0
+    phase_list = [ev for ev in event_list if ev["cat"] == "phase" and ev["name"] == phase_name]
+    for ev in event_list:
+        if ev["cat"] == "git" and not ev["name"].startswith("git am"):
+            for phase in phase_list:
+                if (ev["pid"] == phase["pid"] and
+                        phase["ts"] <= ev["ts"] and
+                        ev["ts"] + ev["dur"] <= phase["ts"] + phase["dur"]):
+                    ret = ret + ev["dur"]
+                    break
+    ret = ret / 1000000
+    return ret
+
+
+# Run all benchmark steps once and return the times measured in seconds
+def exec_benchmark_steps(workspace_dir: Path, env: dict):
+    ret = {}
+    build_dir = workspace_dir / rcb_const.RCB__APP_BUILD_BASE_DIR
+    src_dir = workspace_dir / rcb_const.RCB__APP_SRC_BASE_DIR
+    for cur_dir in [build_dir, src_dir]:
+        if cur_dir.exists():
+            shutil.rmtree(cur_dir)
+
+    # config parsing without and with the config index
+    wall_time, event_list = exec_rockbuilder(workspace_dir, env, "status_cold", ["--status"])
+    ret["cfg_parse_cold"] = wall_time
+    wall_time, event_list = exec_rockbuilder(workspace_dir, env, "status_warm", ["--status"])
+    ret["cfg_parse_warm"] = wall_time
+
+    # checkout is always followed by hipify
+    wall_time, event_list = exec_rockbuilder(workspace_dir, env, "checkout", ["--checkout"])
+    ret["checkout_run"] = wall_time
+    ret["checkout"] = get_event_time(event_list, "phase", [rcb_const.RCB__APP_CFG__KEY__CMD_CHECKOUT])
+    ret["patch_apply"] = get_event_time(event_list, "git", name_prefix="git am")
+    ret["hipify"] = get_event_time(event_list, "phase", [rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY])
+    ret["hipify_commit"] = get_phase_git_cmd_time(event_list, rcb_const.RCB__APP_CFG__KEY__CMD_HIPIFY)
+
+    # all build phases of the apps are executed
+    wall_time, event_list = exec_rockbuilder(workspace_dir, env, "build", [])
+    ret["build_run"] = wall_time
+    ret["env_setup"] = get_event_time(event_list, "phase", ["env_setup"])
+    ret["build_phases"] = get_event_time(event_list, "phase", RCB_BENCHMARK_BUILD_PHASE_LIST)
+
+    # no phases to execute, the phase stamps of the apps are checked
+    wall_time, event_list = exec_rockbuilder(workspace_dir, env, "noop_build", [])
+    ret["stamp_check_run"] = wall_time
+    return ret
+
+
+def get_git_commit():
+    ret = None
+    try:
+        ret = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                      cwd=rcb_const.RCB__ROOT_DIR,
+                                      stderr=subprocess.DEVNULL).decode().strip()
+        if subprocess.check_output(["git", "status", "--porcelain", "-uno"],
+                                   cwd=rcb_const.RCB__ROOT_DIR).strip():
+            ret = ret + "-dirty"
+    except (OSError, subprocess.CalledProcessError):
+        ret = None
+    return ret
+
+
+def printout_benchmark_report(report: dict, compare_report: dict):
+    app_count = report["params"]["app_count"]
+    print("")
+    if compare_report:
+        print("Benchmark results compared to: " + str(compare_report.get("git_commit")))
+        if compare_report.get("params", {}).get("app_count") != app_count:
+            print("Warning, earlier results are for " + str(compare_report.get("params", {}).get("app_count")) +
+                  " apps and current ones for " + str(app_count) + " apps")
+        print(f"{'step':<18}{'time':>12}{'per app':>12}{'earlier':>12}{'change':>10}")
+    else:
+        print("Benchmark results, " + str(app_count) + " apps:")
+        print(f"{'step':<18}{'time':>12}{'per app':>12}")
+    for name, value in report["results"].items():
+        line = f"{name:<18}{value['time']:>11.3f}s{value['per_app_ms']:>10.1f}ms"
+        if compare_report:
+            compare_value = compare_report.get("results", {}).get(name)
+            if compare_value and compare_value["per_app_ms"] > 0:
+                change = (value["per_app_ms"] / compare_value["per_app_ms"] - 1) * 100
+                line = line + f"{compare_value['per_app_ms']:>10.1f}ms{change:>+9.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RockBuilder orchestration benchmark")
+    parser.add_argument(
+        "--app-count",
+        type=int,
+        help="Number of synthetic apps build. Default is 10.",
+        default=10,
+    )
+    parser.add_argument(
+        "--submodule-count",
+        type=int,
+        help="Number of submodules in the repository of each app. Default is 2.",
+        default=2,
+    )
+    parser.add_argument(
+        "--file-count",
+        type=int,
+        help="Number of files in each repository modified by the hipify. Default is 20.",
+        default=20,
+    )
+    parser.add_argument(
+        "--patch-count",
+        type=int,
+        help="Number of base and hipified patches applied to each repository. Default is 1.",
+        default=1,
+    )
+    parser.add_argument(
+        "--cmd-sleep",
+        type=float,
+        help="Seconds slept by each build phase command. Default is 0.",
+        default=0,
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help="Number of times the benchmark is run. Shortest time of each step is reported. Default is 1.",
+        default=1,
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        help="Directory for the generated apps, repositories and builds. Default is build/benchmark.",
+        default=rcb_const.RCB__APP_BUILD_ROOT_DIR / "benchmark",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Result file. Default is build/benchmark_results/benchmark_<git commit>.json.",
+        default=None,
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Result file of an earlier benchmark run that is compared with the results.",
+        default=None,
+    )
+    args = parser.parse_args()
+    # benchmark runs the rockbuilder with the same python
+    verify_env__python()
+    if args.app_count < 1 or args.repeat < 1 or args.submodule_count < 0 or args.file_count < 1 or args.patch_count < 0:
+        print("Error, app, file and repeat counts must be positive and submodule and patch counts not negative")
+        sys.exit(1)
+    compare_report = None
+    if args.compare:
+        with open(args.compare, "r") as compare_file:
+            compare_report = json.load(compare_file)
+
+    work_dir = args.work_dir.resolve()
+    if work_dir.exists():
+        shutil.rmtree(work_dir)
+    workspace_dir = work_dir / "workspace"
+    print("Creating " + str(args.app_count) + " apps to " + work_dir.as_posix())
+    start_time = time.monotonic()
+    create_workspace(workspace_dir)
+    env = get_benchmark_env(work_dir)
+    # git commands of the fixture creation needs the same identity than the benchmark
+    os.environ.update(RCB_BENCHMARK_GIT_ENV)
+    create_fixtures(work_dir, workspace_dir, args)
+    fixture_time = time.monotonic() - start_time
+
+    result_dict = {}
+    for ii in range(args.repeat):
+        print("Benchmark run " + str(ii + 1) + "/" + str(args.repeat))
+        for name, value in exec_benchmark_steps(workspace_dir, env).items():
+            if name not in result_dict or value < result_dict[name]:
+                result_dict[name] = value
+    report = {"format_version": RCB_BENCHMARK_FORMAT_VERSION,
+              "created": datetime.datetime.now().isoformat(timespec="seconds"),
+              "git_commit": get_git_commit(),
+              "python": platform.python_version(),
+              "platform": platform.platform(),
+              "cpu_count": os.cpu_count(),
+              "params": {"app_count": args.app_count,
+                         "submodule_count": args.submodule_count,
+                         "file_count": args.file_count,
+                         "patch_count": args.patch_count,
+                         "cmd_sleep": args.cmd_sleep,
+                         "repeat": args.repeat},
+              "fixture_time": round(fixture_time, 3),
+              "results": {}}
+    for name, value in result_dict.items():
+        report["results"][name] = {"time": round(value, 4),
+                                   "per_app_ms": round(value * 1000 / args.app_count, 2)}
+    if args.output:
+        report_fname = args.output
+    else:
+        report_fname = (rcb_const.RCB__APP_BUILD_ROOT_DIR /
+                        "benchmark_results" /
+                        ("benchmark_" + str(report["git_commit"]) + ".json"))
+    report_fname.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_fname, "w") as report_file:
+        json.dump(report, report_file, indent=4)
+    printout_benchmark_report(report, compare_report)
+    print("")
+    print("Benchmark results: " + report_fname.as_posix())
+
+
+if __name__ == "__main__":
+    main()
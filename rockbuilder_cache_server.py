@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+# Small HTTP server for sharing the RockBuilder build cache between hosts.
+#
+# Serves the entries from the same directory layout that is used by
+# the local build cache, so the cache directory of one build host can be
+# shared directly:
+#
+#     ./rockbuilder_cache_server.py --dir ~/.cache/rockbuilder --port 8765
+#
+# and the other hosts can use it with:
+#
+#     ./rockbuilder.py --build-cache-url http://<host>:8765
+#
+# GET and HEAD requests return the files of the cache entries and
+# PUT requests store new files. Uploaded file is written first to temporary
+# file and renamed only after the sha256 hash sent by the client has been verified.
+import argparse
+import hashlib
+import http.server
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+import lib_python.rcb_constants as rcb_const
+
+# <key[0:2]>/<key>/<file_name>
+RCB_CACHE_SERVER_PATH_RE = re.compile(r"^/([0-9a-f]{2})/([0-9a-f]{64})/([A-Za-z0-9._+-]+)$")
+
+
+class RockBuildCacheRequestHandler(http.server.BaseHTTPRequestHandler):
+    # set by main()
+    cache_dir = None
+    read_only = False
+    auth_token = None
+
+    def _get_file_path(self):
+        ret = None
+        res = RCB_CACHE_SERVER_PATH_RE.match(self.path.split("?")[0])
+        if res and res.group(2).startswith(res.group(1)) and not res.group(3).startswith("."):
+            ret = self.cache_dir / res.group(1) / res.group(2) / res.group(3)
+        return ret
+
+    def _is_authorized(self):
+        ret = True
+        if self.auth_token:
+            ret = self.headers.get("Authorization") == "Bearer " + self.auth_token
+        return ret
+
+    def _send_file(self, send_content: bool):
+        fname = self._get_file_path()
+        if not self._is_authorized():
+            self.send_error(401)
+        elif fname is None:
+            self.send_error(400)
+        elif not fname.is_file():
+            self.send_error(404)
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(fname.stat().st_size))
+            self.end_headers()
+            if send_content:
+                with open(fname, "rb") as data_file:
+                    for chunk in iter(lambda: data_file.read(rcb_const.RCB__BUILD_CACHE_CHUNK_SIZE), b""):
+                        self.wfile.write(chunk)
+
+    def do_HEAD(self):
+        self._send_file(False)
+
+    def do_GET(self):
+        self._send_file(True)
+
+    def do_PUT(self):
+        fname = self._get_file_path()
+        size = int(self.headers.get("Content-Length", "-1"))
+        if not self._is_authorized():
+            self.send_error(401)
+            return
+        if self.read_only:
+            self.send_error(403)
+            return
+        if fname is None or size < 0:
+            self.send_error(400)
+            return
+        fname.parent.mkdir(parents=True, exist_ok=True)
+        hash_obj = hashlib.sha256()
+        fd, tmp_fname = tempfile.mkstemp(prefix=fname.name + ".", dir=fname.parent)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                remaining = size
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, rcb_const.RCB__BUILD_CACHE_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    hash_obj.update(chunk)
+                    tmp_file.write(chunk)
+                    remaining = remaining - len(chunk)
+            sha256 = self.headers.get(rcb_const.RCB__BUILD_CACHE_SHA256_HEADER)
+            if remaining > 0 or (sha256 and sha256 != hash_obj.hexdigest()):
+                self.send_error(400, "Incomplete upload or sha256 mismatch")
+                return
+            os.replace(tmp_fname, fname)
+        finally:
+            if os.path.exists(tmp_fname):
+                os.unlink(tmp_fname)
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RockBuilder build cache server")
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        help="Build cache directory served",
+        required=True,
+    )
+    parser.add_argument(
+        "--bind",
+        type=str,
+        help="Address where the server listens. Default is 127.0.0.1",
+        default="127.0.0.1",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Port where the server listens. 0 selects a free port. Default is " + str(rcb_const.RCB__BUILD_CACHE_SERVER_DEF_PORT),
+        default=rcb_const.RCB__BUILD_CACHE_SERVER_DEF_PORT,
+    )
+    parser.add_argument(
+        "--port-file",
+        type=Path,
+        help="Write the port used by the server to file",
+        default=None,
+    )
+    parser.add_argument(
+        "--read-only",
+        action="store_true",
+        help="Do not allow storing new entries to cache",
+        default=False,
+    )
+    args = parser.parse_args()
+    RockBuildCacheRequestHandler.cache_dir = args.dir.resolve()
+    RockBuildCacheRequestHandler.read_only = args.read_only
+    RockBuildCacheRequestHandler.auth_token = os.environ.get(rcb_const.RCB__ENV_VAR__BUILD_CACHE_TOKEN)
+    RockBuildCacheRequestHandler.cache_dir.mkdir(parents=True, exist_ok=True)
+    server = http.server.ThreadingHTTPServer((args.bind, args.port), RockBuildCacheRequestHandler)
+    port = server.server_address[1]
+    if args.port_file:
+        args.port_file.write_text(str(port))
+    print("Build cache server: http://" + args.bind + ":" + str(port))
+    print("    dir: " + RockBuildCacheRequestHandler.cache_dir.as_posix())
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+# Creates a minimal pure python wheel used by the tests.
+#
+# Usage: create_test_wheel.py <output_dir> <package_name> <version>
+
+import base64
+import hashlib
+import sys
+import zipfile
+from pathlib import Path
+
+
+def get_record_hash(data: bytes):
+    digest = hashlib.sha256(data).digest()
+    return "sha256=" + base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def main():
+    output_dir = Path(sys.argv[1])
+    pkg_name = sys.argv[2]
+    version = sys.argv[3]
+    dist_info = pkg_name + "-" + version + ".dist-info"
+    file_dict = {
+        pkg_name + "/__init__.py": "__version__ = \"" + version + "\"\n",
+        dist_info + "/METADATA": "Metadata-Version: 2.1\nName: " + pkg_name + "\nVersion: " + version + "\n",
+        dist_info + "/WHEEL": "Wheel-Version: 1.0\nGenerator: rockbuilder-tests\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    whl_fname = output_dir / (pkg_name + "-" + version + "-py3-none-any.whl")
+    record = ""
+    with zipfile.ZipFile(whl_fname, "w") as whl_file:
+        for fname, content in file_dict.items():
+            data = content.encode()
+            whl_file.writestr(fname, data)
+            record = record + fname + "," + get_record_hash(data) + "," + str(len(data)) + "\n"
+        record = record + dist_info + "/RECORD,,\n"
+        whl_file.writestr(dist_info + "/RECORD", record)
+    print(whl_fname)
+
+
+if __name__ == "__main__":
+    main()
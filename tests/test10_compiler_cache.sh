@@ -0,0 +1,68 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+# ccache stand-in that records the cache hits and misses to stats log
+export PATH=${PWD}/tests/resources/fake_ccache:${PATH}
+export RCB_COMPILER_CACHE_DIR=${PWD}/build/test_compiler_cache
+
+TEST_APP_CFG="./tests/apps/testapp_ccache.cfg"
+TEST_RES_FILE="build/testapp_ccache.txt"
+TEST_LOG_FILE="build/testapp_ccache.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+if ! command -v gcc &> /dev/null; then
+    echo "test10: skipped, gcc is not installed"
+    exit 0
+fi
+
+rm -rf build/testapp_ccache ${RCB_COMPILER_CACHE_DIR} ${TEST_RES_FILE} ${TEST_LOG_FILE}
+mkdir -p build
+
+run_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} --compiler-cache ccache > ${TEST_LOG_FILE}
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} --compiler-cache ccache'"
+        exit 1
+    fi
+    cat ${TEST_LOG_FILE}
+}
+
+# first build compiles through the compiler cache
+run_rockbuilder
+cat ${TEST_RES_FILE}
+if grep -q "^CC=.*compiler_cache_wrappers/testapp_ccache/gcc$" ${TEST_RES_FILE} &&
+   grep -q "^CMAKE_CXX_COMPILER_LAUNCHER=.*fake_ccache/ccache$" ${TEST_RES_FILE} &&
+   grep -q "^CMAKE_HIP_COMPILER_LAUNCHER=.*fake_ccache/ccache$" ${TEST_RES_FILE} &&
+   grep -Eq "testapp_ccache +CMD_BUILD +0 +1 " ${TEST_LOG_FILE}; then
+    echo "test10_1: OK"
+else
+    echo "test10_1: Failed, compiler cache was not used"
+    exit 1
+fi
+
+# rebuild after clean gets the object file from the compiler cache
+rm -rf build/testapp_ccache
+run_rockbuilder
+if grep -Eq "testapp_ccache +CMD_BUILD +1 +0 +100%" ${TEST_LOG_FILE}; then
+    echo "test10_2: OK"
+else
+    echo "test10_2: Failed, compiler cache hit was not reported"
+    exit 1
+fi
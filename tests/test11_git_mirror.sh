@@ -0,0 +1,60 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_MAIN_REPO=/tmp/rcb_test_mirror_main
+TEST_SUB_REPO=/tmp/rcb_test_mirror_sub
+TEST_MIRROR_DIR="build/test_git_mirror"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main -c protocol.file.allow=always"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+
+# create main repository which has a submodule
+rm -rf ${TEST_MAIN_REPO} ${TEST_SUB_REPO} src_apps/testapp_mirror_a src_apps/testapp_mirror_b build/testapp_mirror_a build/testapp_mirror_b ${TEST_MIRROR_DIR}
+mkdir -p ${TEST_SUB_REPO} ${TEST_MAIN_REPO}
+(cd ${TEST_SUB_REPO} && ${GIT_CMD} init -q && echo "sub" > sub.txt && ${GIT_CMD} add sub.txt && ${GIT_CMD} commit -q -m "sub")
+(cd ${TEST_MAIN_REPO} && ${GIT_CMD} init -q && echo "main" > main.txt && ${GIT_CMD} add main.txt &&
+    ${GIT_CMD} submodule -q add ${TEST_SUB_REPO} sub && ${GIT_CMD} commit -q -m "main")
+
+for app in testapp_mirror_a testapp_mirror_b; do
+    ./rockbuilder.py ./tests/apps/${app}.cfg --checkout --git-mirror-dir ${TEST_MIRROR_DIR}
+    if [ ! $? -eq 0 ]; then
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ./tests/apps/${app}.cfg --checkout --git-mirror-dir ${TEST_MIRROR_DIR}'"
+        exit 1
+    fi
+done
+
+# both app checkouts use the same mirrors for the main repository and submodule
+if [[ $(find ${TEST_MIRROR_DIR} -maxdepth 1 -name "*.git" -type d | wc -l) -eq 2 &&
+      -f src_apps/testapp_mirror_a/sub/sub.txt && -f src_apps/testapp_mirror_b/sub/sub.txt &&
+      -s src_apps/testapp_mirror_a/.git/objects/info/alternates &&
+      -s src_apps/testapp_mirror_b/.git/objects/info/alternates &&
+      -s src_apps/testapp_mirror_b/.git/modules/sub/objects/info/alternates ]]; then
+    echo "test11_1: OK"
+else
+    echo "test11_1: Failed, app checkouts do not use the git mirror"
+    exit 1
+fi
+
+# submodule remote url points to the original repository instead of the mirror
+if [[ "$(git -C src_apps/testapp_mirror_b/sub remote get-url origin)" == "${TEST_SUB_REPO}" &&
+      "$(git -C src_apps/testapp_mirror_b config submodule.sub.url)" == "${TEST_SUB_REPO}" ]]; then
+    echo "test11_2: OK"
+else
+    echo "test11_2: Failed, submodule url was not restored"
+    exit 1
+fi
@@ -0,0 +1,70 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+# local submodule repositories are used in this test
+export GIT_CONFIG_COUNT=1
+export GIT_CONFIG_KEY_0=protocol.file.allow
+export GIT_CONFIG_VALUE_0=always
+
+TEST_APP_CFG="./tests/apps/testapp_submodules.cfg"
+TEST_REPO_BASE=/tmp/rcb_test_submodules
+TEST_LOG_FILE="build/testapp_submodules.log"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+create_repo() {
+    mkdir -p $1
+    (cd $1 && ${GIT_CMD} init -q && echo "$1" > file.txt && ${GIT_CMD} add file.txt && ${GIT_CMD} commit -q -m "$1")
+}
+
+# main repository with two submodules, second one has a nested submodule
+rm -rf ${TEST_REPO_BASE}_* src_apps/testapp_submodules build/testapp_submodules ${TEST_LOG_FILE}
+mkdir -p build
+create_repo ${TEST_REPO_BASE}_nested
+create_repo ${TEST_REPO_BASE}_sub1
+create_repo ${TEST_REPO_BASE}_sub2
+(cd ${TEST_REPO_BASE}_sub2 && ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_nested nested && ${GIT_CMD} commit -q -m "nested")
+create_repo ${TEST_REPO_BASE}_main
+(cd ${TEST_REPO_BASE}_main && ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_sub1 sub1 &&
+    ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_sub2 sub2 && ${GIT_CMD} commit -q -m "submodules")
+
+./rockbuilder.py ${TEST_APP_CFG} --checkout > ${TEST_LOG_FILE} 2>&1
+if [ ! $? -eq 0 ]; then
+    cat ${TEST_LOG_FILE}
+    echo ""
+    echo "Failed to execute command: "
+    echo "    './rockbuilder.py ${TEST_APP_CFG} --checkout'"
+    exit 1
+fi
+sed -n '/Submodule fetch times:/,/total$/p' ${TEST_LOG_FILE}
+
+if [[ -f src_apps/testapp_submodules/sub1/file.txt && -f src_apps/testapp_submodules/sub2/file.txt &&
+      -f src_apps/testapp_submodules/sub2/nested/file.txt ]]; then
+    echo "test12_1: OK"
+else
+    echo "test12_1: Failed, submodules were not checked out"
+    exit 1
+fi
+
+# PROP_FETCH_JOBS of the app is used and the fetch time of each submodule is reported
+if grep -q "Fetching submodules with 2 jobs" ${TEST_LOG_FILE} &&
+   grep -Eq "sec  sub1$" ${TEST_LOG_FILE} && grep -Eq "sec  sub2/nested$" ${TEST_LOG_FILE}; then
+    echo "test12_2: OK"
+else
+    echo "test12_2: Failed, submodule fetch jobs or times were not reported"
+    exit 1
+fi
@@ -0,0 +1,84 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+# local submodule repositories are used in this test
+export GIT_CONFIG_COUNT=1
+export GIT_CONFIG_KEY_0=protocol.file.allow
+export GIT_CONFIG_VALUE_0=always
+
+TEST_APP_CFG="./tests/apps/testapp_sparse.cfg"
+TEST_REPO_BASE=/tmp/rcb_test_sparse
+TEST_SRC_DIR=src_apps/testapp_sparse
+TEST_LOG_FILE="build/testapp_sparse.log"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+# partial clone filters are allowed by the local repositories
+create_repo() {
+    mkdir -p $1
+    (cd $1 && ${GIT_CMD} init -q && git config uploadpack.allowFilter true && echo "$1" > file.txt && ${GIT_CMD} add file.txt && ${GIT_CMD} commit -q -m "$1")
+}
+
+# main repository with kernel and other directories which both have a submodule
+rm -rf ${TEST_REPO_BASE}_* ${TEST_SRC_DIR} build/testapp_sparse ${TEST_LOG_FILE}
+mkdir -p build
+create_repo ${TEST_REPO_BASE}_sub1
+create_repo ${TEST_REPO_BASE}_sub2
+create_repo ${TEST_REPO_BASE}_main
+(cd ${TEST_REPO_BASE}_main && mkdir kernel other && echo "kernel" > kernel/kernel.txt && echo "other" > other/other.txt &&
+    ${GIT_CMD} add kernel other && ${GIT_CMD} submodule -q add file://${TEST_REPO_BASE}_sub1 kernel/sub1 &&
+    ${GIT_CMD} submodule -q add file://${TEST_REPO_BASE}_sub2 other/sub2 && ${GIT_CMD} commit -q -m "dirs and submodules")
+
+./rockbuilder.py ${TEST_APP_CFG} --checkout > ${TEST_LOG_FILE} 2>&1
+if [ ! $? -eq 0 ]; then
+    cat ${TEST_LOG_FILE}
+    echo ""
+    echo "Failed to execute command: "
+    echo "    './rockbuilder.py ${TEST_APP_CFG} --checkout'"
+    exit 1
+fi
+
+# only the sparse checkout directory and its submodule are checked out
+if [[ -f ${TEST_SRC_DIR}/file.txt && -f ${TEST_SRC_DIR}/kernel/kernel.txt && -f ${TEST_SRC_DIR}/kernel/sub1/file.txt &&
+      ! -e ${TEST_SRC_DIR}/other/other.txt && ! -e ${TEST_SRC_DIR}/other/sub2/file.txt ]]; then
+    echo "test13_1: OK"
+else
+    echo "test13_1: Failed, sparse checkout directories were not used"
+    exit 1
+fi
+
+# blobs outside of the sparse checkout were not fetched
+MISSING_CNT=$(git -C ${TEST_SRC_DIR} rev-list --objects --missing=print HEAD | grep -c "^?")
+if [[ "$(git -C ${TEST_SRC_DIR} config remote.origin.partialclonefilter)" == "blob:none" &&
+      "$(git -C ${TEST_SRC_DIR}/kernel/sub1 config remote.origin.partialclonefilter)" == "blob:none" &&
+      ${MISSING_CNT} -gt 0 ]]; then
+    echo "test13_2: OK"
+else
+    echo "test13_2: Failed, partial clone filter was not used"
+    exit 1
+fi
+
+# sparse checkout is disabled when the app does not use it anymore
+sed -e "/PROP_SPARSE_CHECKOUT/d" -e "/CMD_EXEC_DIR/d" ${TEST_APP_CFG} > build/testapp_sparse.cfg
+./rockbuilder.py build/testapp_sparse.cfg --checkout > ${TEST_LOG_FILE} 2>&1
+if [[ $? -eq 0 && -f ${TEST_SRC_DIR}/other/other.txt && -f ${TEST_SRC_DIR}/other/sub2/file.txt ]]; then
+    echo "test13_3: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test13_3: Failed, full checkout after sparse checkout"
+    exit 1
+fi
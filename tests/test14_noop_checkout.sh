@@ -0,0 +1,140 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+# local submodule repositories are used in this test
+export GIT_CONFIG_COUNT=1
+export GIT_CONFIG_KEY_0=protocol.file.allow
+export GIT_CONFIG_VALUE_0=always
+
+TEST_APP_CFG="./tests/apps/testapp_noop_checkout.cfg"
+TEST_REPO_BASE=/tmp/rcb_test_noop_checkout
+TEST_SRC_DIR=src_apps/testapp_noop_checkout
+TEST_LOG_FILE="build/testapp_noop_checkout.log"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+create_repo() {
+    mkdir -p $1
+    (cd $1 && ${GIT_CMD} init -q && echo "$1" > file.txt && ${GIT_CMD} add file.txt && ${GIT_CMD} commit -q -m "$1")
+}
+
+exec_checkout() {
+    ./rockbuilder.py ${TEST_APP_CFG} --checkout > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} --checkout'"
+        exit 1
+    fi
+}
+
+rm -rf ${TEST_REPO_BASE}_* ${TEST_SRC_DIR} build/testapp_noop_checkout ${TEST_LOG_FILE}
+mkdir -p build
+create_repo ${TEST_REPO_BASE}_sub
+create_repo ${TEST_REPO_BASE}_main
+(cd ${TEST_REPO_BASE}_main && ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_sub sub && ${GIT_CMD} commit -q -m "submodule")
+
+exec_checkout
+if grep -q "Source code is already checked out" ${TEST_LOG_FILE}; then
+    echo "test14_1: Failed, first checkout was skipped"
+    exit 1
+fi
+echo "test14_1: OK"
+
+# repositories are moved away, so any fetch or ls-remote would fail.
+# locally modified files are restored without fetching.
+mv ${TEST_REPO_BASE}_main ${TEST_REPO_BASE}_main_moved
+mv ${TEST_REPO_BASE}_sub ${TEST_REPO_BASE}_sub_moved
+echo "modified" > ${TEST_SRC_DIR}/file.txt
+echo "modified" > ${TEST_SRC_DIR}/sub/file.txt
+START_TIME=$(date +%s)
+exec_checkout
+END_TIME=$(date +%s)
+if grep -q "Source code is already checked out" ${TEST_LOG_FILE} &&
+   ! grep -q "git fetch" ${TEST_LOG_FILE} &&
+   [[ "$(cat ${TEST_SRC_DIR}/file.txt)" == "${TEST_REPO_BASE}_main" &&
+      "$(cat ${TEST_SRC_DIR}/sub/file.txt)" == "${TEST_REPO_BASE}_sub" ]]; then
+    echo "test14_2: OK, no-op checkout took $((END_TIME - START_TIME)) sec"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test14_2: Failed, up to date source code was checked out again"
+    exit 1
+fi
+
+# new commit in the branch is fetched when the cached ls-remote result has expired
+mv ${TEST_REPO_BASE}_main_moved ${TEST_REPO_BASE}_main
+mv ${TEST_REPO_BASE}_sub_moved ${TEST_REPO_BASE}_sub
+(cd ${TEST_REPO_BASE}_main && echo "v2" > file.txt && ${GIT_CMD} commit -q -a -m "v2")
+RCB_LS_REMOTE_CACHE_TTL=0 exec_checkout
+if ! grep -q "Source code is already checked out" ${TEST_LOG_FILE} &&
+   [[ "$(cat ${TEST_SRC_DIR}/file.txt)" == "v2" ]]; then
+    echo "test14_3: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test14_3: Failed, new branch commit was not checked out"
+    exit 1
+fi
+
+exec_build() {
+    ./rockbuilder.py ${TEST_APP_CFG} > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG}'"
+        exit 1
+    fi
+}
+
+# checkout without the --checkout parameter is done again when the branch has moved
+exec_build
+(cd ${TEST_REPO_BASE}_main && echo "v3" > file.txt && ${GIT_CMD} commit -q -a -m "v3")
+# checkout is done on background by the source prefetcher
+rm -f build/testapp_noop_checkout/checkout_prefetch.log
+RCB_LS_REMOTE_CACHE_TTL=0 exec_build
+if cat ${TEST_LOG_FILE} build/testapp_noop_checkout/checkout_prefetch.log 2>/dev/null | grep -q "CMD_CHECKOUT inputs changed: version_sha" &&
+   [[ "$(cat ${TEST_SRC_DIR}/file.txt)" == "v3" ]]; then
+    echo "test14_4: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test14_4: Failed, moved branch was not noticed"
+    exit 1
+fi
+
+# new commit in the submodule changes the source tree hash used by the build phases
+get_src_tree_hash() {
+    python -c "
+from pathlib import Path
+from lib_python.repo_management import RockProjectRepo
+app_repo = RockProjectRepo.__new__(RockProjectRepo)
+app_repo.app_src_dir = Path('${TEST_SRC_DIR}').resolve()
+print(app_repo.get_src_tree_hash())
+"
+}
+SRC_TREE_HASH1=$(get_src_tree_hash)
+(cd ${TEST_SRC_DIR}/sub && echo "v2" > file.txt && ${GIT_CMD} commit -q -a -m "v2")
+SRC_TREE_HASH2=$(get_src_tree_hash)
+if [[ -n "${SRC_TREE_HASH1}" && "${SRC_TREE_HASH1}" != "None" &&
+      "${SRC_TREE_HASH1}" != "${SRC_TREE_HASH2}" ]]; then
+    echo "test14_5: OK"
+else
+    echo "SRC_TREE_HASH1: ${SRC_TREE_HASH1}"
+    echo "SRC_TREE_HASH2: ${SRC_TREE_HASH2}"
+    echo "test14_5: Failed, submodule change did not change the source tree hash"
+    exit 1
+fi
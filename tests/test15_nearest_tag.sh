@@ -0,0 +1,67 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_CFG="./tests/apps/testapp_nearest_tag.cfg"
+TEST_REPO_DIR=/tmp/rcb_test_nearest_tag_main
+TEST_SRC_DIR=src_apps/testapp_nearest_tag
+TEST_LOG_FILE="build/testapp_nearest_tag.log"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+# 60 commits, annotated tag v1.0 in commit 5, lightweight tag v1.1 in commit 40
+# and ci tag in commit 50 that is not a release tag
+rm -rf ${TEST_REPO_DIR} ${TEST_SRC_DIR} build/testapp_nearest_tag ${TEST_LOG_FILE}
+mkdir -p build ${TEST_REPO_DIR}
+(cd ${TEST_REPO_DIR} && ${GIT_CMD} init -q &&
+    for ii in $(seq 1 60); do
+        echo "${ii}" > file.txt && ${GIT_CMD} add file.txt && ${GIT_CMD} commit -q -m "commit ${ii}"
+        if [ ${ii} -eq 5 ]; then ${GIT_CMD} tag -a v1.0 -m "v1.0"; fi
+        if [ ${ii} -eq 40 ]; then ${GIT_CMD} tag v1.1; fi
+        if [ ${ii} -eq 50 ]; then ${GIT_CMD} tag ciflow/trunk/50; fi
+    done)
+
+./rockbuilder.py ${TEST_APP_CFG} --checkout > ${TEST_LOG_FILE} 2>&1
+if [ ! $? -eq 0 ]; then
+    cat ${TEST_LOG_FILE}
+    echo ""
+    echo "Failed to execute command: "
+    echo "    './rockbuilder.py ${TEST_APP_CFG} --checkout'"
+    exit 1
+fi
+grep "Nearest tag found" ${TEST_LOG_FILE}
+
+# describe gives the same result as with the full history and it ignores the ci tags
+EXPECTED_DESCRIBE=$(git -C ${TEST_REPO_DIR} describe --tags --match "v*")
+SRC_DESCRIBE=$(git -C ${TEST_SRC_DIR} describe --tags --exclude "THEROCK_*")
+if [[ "${SRC_DESCRIBE}" == "${EXPECTED_DESCRIBE}" ]]; then
+    echo "test15_1: OK"
+else
+    echo "test15_1: Failed, describe: ${SRC_DESCRIBE}, expected: ${EXPECTED_DESCRIBE}"
+    exit 1
+fi
+
+# only the history after the nearest tag and the tagged commit itself was fetched
+COMMIT_CNT=$(git -C ${TEST_SRC_DIR} rev-list --count HEAD)
+if [[ "$(git -C ${TEST_SRC_DIR} rev-parse --is-shallow-repository)" == "true" && ${COMMIT_CNT} -eq 21 ]] &&
+   ! git -C ${TEST_SRC_DIR} rev-parse -q --verify refs/tags/v1.0 > /dev/null &&
+   ! git -C ${TEST_SRC_DIR} rev-parse -q --verify refs/tags/ciflow/trunk/50 > /dev/null; then
+    echo "test15_2: OK, ${COMMIT_CNT} commits fetched"
+else
+    echo "test15_2: Failed, ${COMMIT_CNT} commits fetched, expected 21"
+    exit 1
+fi
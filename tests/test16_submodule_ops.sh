@@ -0,0 +1,86 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+# local submodule repositories are used in this test
+export GIT_CONFIG_COUNT=1
+export GIT_CONFIG_KEY_0=protocol.file.allow
+export GIT_CONFIG_VALUE_0=always
+# git commands are executed in the submodules in parallel also on single cpu hosts
+export RCB_GIT_JOBS=4
+
+TEST_APP_CFG="./tests/apps/testapp_submodule_ops.cfg"
+TEST_REPO_BASE=/tmp/rcb_test_submodule_ops
+TEST_SRC_DIR=src_apps/testapp_submodule_ops
+TEST_LOG_FILE="build/testapp_submodule_ops.log"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+create_repo() {
+    mkdir -p $1
+    (cd $1 && ${GIT_CMD} init -q && echo "$1" > file.txt && ${GIT_CMD} add file.txt && ${GIT_CMD} commit -q -m "$1")
+}
+
+# main repository with three submodules, first one has a nested submodule
+rm -rf ${TEST_REPO_BASE}_* ${TEST_SRC_DIR} build/testapp_submodule_ops ${TEST_LOG_FILE}
+mkdir -p build
+create_repo ${TEST_REPO_BASE}_nested
+for ii in 1 2 3; do
+    create_repo ${TEST_REPO_BASE}_sub${ii}
+done
+(cd ${TEST_REPO_BASE}_sub1 && ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_nested nested && ${GIT_CMD} commit -q -m "nested")
+create_repo ${TEST_REPO_BASE}_main
+(cd ${TEST_REPO_BASE}_main &&
+    for ii in 1 2 3; do ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_sub${ii} sub${ii}; done &&
+    ${GIT_CMD} commit -q -m "submodules")
+
+exec_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} $@ > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} $@'"
+        exit 1
+    fi
+}
+
+# hipify changes are committed and tagged in each repository
+export GIT_AUTHOR_NAME=rcb GIT_AUTHOR_EMAIL=rcb@localhost GIT_COMMITTER_NAME=rcb GIT_COMMITTER_EMAIL=rcb@localhost
+exec_rockbuilder --checkout --hipify
+for repo in . sub1 sub1/nested sub2 sub3; do
+    if [[ "$(git -C ${TEST_SRC_DIR}/${repo} log -1 --format=%s)" != "DO NOT SUBMIT: HIPIFY" ||
+          -z "$(git -C ${TEST_SRC_DIR}/${repo} tag -l THEROCK_HIPIFY_DIFFBASE)" ||
+          -z "$(git -C ${TEST_SRC_DIR}/${repo} tag -l THEROCK_UPSTREAM_DIFFBASE)" ]]; then
+        echo "test16_1: Failed, hipify changes were not committed in: ${repo}"
+        exit 1
+    fi
+done
+echo "test16_1: OK"
+
+# reset callback reverts the local changes of each repository
+for repo in . sub1 sub1/nested sub2 sub3; do
+    echo "modified" > ${TEST_SRC_DIR}/${repo}/file.txt
+    echo "untracked" > ${TEST_SRC_DIR}/${repo}/untracked.txt
+done
+exec_rockbuilder --pre_config
+for repo in . sub1 sub1/nested sub2 sub3; do
+    if [[ "$(tail -1 ${TEST_SRC_DIR}/${repo}/file.txt)" != "hipified" || -e ${TEST_SRC_DIR}/${repo}/untracked.txt ]]; then
+        echo "test16_2: Failed, repository was not reset: ${repo}"
+        exit 1
+    fi
+done
+echo "test16_2: OK"
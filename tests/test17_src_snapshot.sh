@@ -0,0 +1,101 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+# local submodule repositories are used in this test
+export GIT_CONFIG_COUNT=1
+export GIT_CONFIG_KEY_0=protocol.file.allow
+export GIT_CONFIG_VALUE_0=always
+export GIT_AUTHOR_NAME=rcb GIT_AUTHOR_EMAIL=rcb@localhost GIT_COMMITTER_NAME=rcb GIT_COMMITTER_EMAIL=rcb@localhost
+
+TEST_APP_CFG="./tests/apps/testapp_src_snapshot.cfg"
+TEST_REPO_BASE=/tmp/rcb_test_src_snapshot
+TEST_CACHE_DIR=/tmp/rcb_test_src_snapshot_cache
+TEST_SRC_DIR=src_apps/testapp_src_snapshot
+TEST_LOG_FILE="build/testapp_src_snapshot.log"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+create_repo() {
+    mkdir -p $1
+    (cd $1 && ${GIT_CMD} init -q && echo "$1" > file.txt && ${GIT_CMD} add file.txt && ${GIT_CMD} commit -q -m "$1")
+}
+
+exec_checkout() {
+    ./rockbuilder.py ${TEST_APP_CFG} --checkout --src-snapshot-cache --build-cache-dir ${TEST_CACHE_DIR} > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} --checkout --src-snapshot-cache --build-cache-dir ${TEST_CACHE_DIR}'"
+        exit 1
+    fi
+}
+
+# simulates the fresh build host without source code and build directory
+remove_src_and_build_dir() {
+    rm -rf ${TEST_SRC_DIR} build/testapp_src_snapshot
+}
+
+rm -rf ${TEST_REPO_BASE}_* ${TEST_SRC_DIR} build/testapp_src_snapshot ${TEST_LOG_FILE}
+mkdir -p build
+create_repo ${TEST_REPO_BASE}_sub
+create_repo ${TEST_REPO_BASE}_main
+(cd ${TEST_REPO_BASE}_main && ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_sub sub && ${GIT_CMD} commit -q -m "submodule")
+
+# source code is checked out and hipified and then stored to cache
+exec_checkout
+if grep -q "Build cache miss" ${TEST_LOG_FILE} &&
+   grep -q "Stored to build cache" ${TEST_LOG_FILE} &&
+   [ -n "$(find ${TEST_CACHE_DIR} -name 'src_snapshot.tar.*')" ]; then
+    echo "test17_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test17_1: Failed, source snapshot was not stored to build cache"
+    exit 1
+fi
+
+# source code is restored from the snapshot without fetching and hipify
+remove_src_and_build_dir
+exec_checkout
+if grep -q "Source code restored from snapshot" ${TEST_LOG_FILE} &&
+   grep -q "Hipify skipped" ${TEST_LOG_FILE} &&
+   ! grep -q "git fetch" ${TEST_LOG_FILE} &&
+   [[ "$(grep -c hipified ${TEST_SRC_DIR}/file.txt)" == "1" &&
+      "$(grep -c hipified ${TEST_SRC_DIR}/sub/file.txt)" == "1" &&
+      "$(git -C ${TEST_SRC_DIR}/sub log -1 --format=%s)" == "DO NOT SUBMIT: HIPIFY" &&
+      -z "$(git -C ${TEST_SRC_DIR} status --porcelain)" ]]; then
+    echo "test17_2: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test17_2: Failed, source code was not restored from snapshot"
+    exit 1
+fi
+
+# new upstream commit changes the snapshot key
+(cd ${TEST_REPO_BASE}_main && echo "v2" > file.txt && ${GIT_CMD} commit -q -a -m "v2")
+remove_src_and_build_dir
+exec_checkout
+if grep -q "Build cache miss" ${TEST_LOG_FILE} &&
+   ! grep -q "Source code restored from snapshot" ${TEST_LOG_FILE} &&
+   [[ "$(head -1 ${TEST_SRC_DIR}/file.txt)" == "v2" ]]; then
+    echo "test17_3: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test17_3: Failed, outdated source snapshot was used"
+    exit 1
+fi
+rm -rf ${TEST_CACHE_DIR}
@@ -0,0 +1,90 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+# local submodule repositories are used in this test
+export GIT_CONFIG_COUNT=1
+export GIT_CONFIG_KEY_0=protocol.file.allow
+export GIT_CONFIG_VALUE_0=always
+export GIT_AUTHOR_NAME=rcb GIT_AUTHOR_EMAIL=rcb@localhost GIT_COMMITTER_NAME=rcb GIT_COMMITTER_EMAIL=rcb@localhost
+
+TEST_APP_CFG="./tests/apps/testapp_hipify_memo.cfg"
+TEST_REPO_BASE=/tmp/rcb_test_hipify_memo
+TEST_CNT_FILE=/tmp/rcb_test_hipify_memo_cnt.txt
+TEST_SRC_DIR=src_apps/testapp_hipify_memo
+TEST_LOG_FILE="build/testapp_hipify_memo.log"
+GIT_CMD="git -c user.name=rcb -c user.email=rcb@localhost -c init.defaultBranch=main"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+create_repo() {
+    mkdir -p $1
+    (cd $1 && ${GIT_CMD} init -q && echo "$1" > file.txt && ${GIT_CMD} add file.txt && ${GIT_CMD} commit -q -m "$1")
+}
+
+exec_checkout() {
+    ./rockbuilder.py ${TEST_APP_CFG} --checkout > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} --checkout'"
+        exit 1
+    fi
+}
+
+# verify the hipify execution count and the hipified files
+check_hipify_result() {
+    if [[ "$(wc -l < ${TEST_CNT_FILE})" == "$2" &&
+          "$(tail -1 ${TEST_SRC_DIR}/file.txt)" == "$3" &&
+          "$(tail -1 ${TEST_SRC_DIR}/sub/file.txt)" == "$3" &&
+          "$(git -C ${TEST_SRC_DIR}/sub log -1 --format=%s)" == "DO NOT SUBMIT: HIPIFY" &&
+          "$(git -C ${TEST_SRC_DIR}/sub rev-parse THEROCK_HIPIFY_DIFFBASE)" == "$(git -C ${TEST_SRC_DIR}/sub rev-parse HEAD)" &&
+          -z "$(git -C ${TEST_SRC_DIR} status --porcelain)" ]]; then
+        echo "$1: OK"
+    else
+        cat ${TEST_LOG_FILE}
+        echo "$1: Failed, $4"
+        exit 1
+    fi
+}
+
+rm -rf ${TEST_REPO_BASE}_* ${TEST_CNT_FILE} ${TEST_SRC_DIR} build/testapp_hipify_memo ${TEST_LOG_FILE}
+mkdir -p build
+create_repo ${TEST_REPO_BASE}_sub
+create_repo ${TEST_REPO_BASE}_main
+(cd ${TEST_REPO_BASE}_main && ${GIT_CMD} submodule -q add ${TEST_REPO_BASE}_sub sub && ${GIT_CMD} commit -q -m "submodule")
+
+export RCB_TEST_HIPIFY_TEXT=hipified
+exec_checkout
+check_hipify_result "test18_1" 1 "hipified" "hipify was not executed"
+
+# checkout resets the repositories to the commits before the hipify
+# and the commits of the first hipify are restored without executing it again
+HIPIFY_HEAD=$(git -C ${TEST_SRC_DIR} rev-parse HEAD)
+exec_checkout
+if ! grep -q "commits of the earlier hipify restored" ${TEST_LOG_FILE} ||
+   [[ "$(git -C ${TEST_SRC_DIR} rev-parse HEAD)" != "${HIPIFY_HEAD}" ]]; then
+    cat ${TEST_LOG_FILE}
+    echo "test18_2: Failed, hipify commits were not restored"
+    exit 1
+fi
+check_hipify_result "test18_2" 1 "hipified" "hipify was executed again with same inputs"
+
+# change of the hipify command requires a new hipify
+export RCB_TEST_HIPIFY_TEXT=hipified_v2
+exec_checkout
+check_hipify_result "test18_3" 2 "hipified_v2" "hipify was not executed after the hipify command changed"
+rm -f ${TEST_CNT_FILE}
@@ -0,0 +1,69 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+unset RCB_FAST_MODE
+
+TEST_APP_CFG="./tests/apps/testapp_fast.cfg"
+TEST_BUILD_DIR=build/testapp_fast
+TEST_LOG_FILE="build/testapp_fast.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+exec_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} $@ > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} $@'"
+        exit 1
+    fi
+}
+
+rm -rf ${TEST_BUILD_DIR} ${TEST_LOG_FILE}
+mkdir -p build
+
+# fast mode is used by default when the output is not a terminal.
+# environment of each phase is saved to file instead of printing it.
+START_TIME=$(date +%s%N)
+exec_rockbuilder
+END_TIME=$(date +%s%N)
+ELAPSED_MS=$(( (END_TIME - START_TIME) / 1000000 ))
+if ! grep -q "env-settings start" ${TEST_LOG_FILE} &&
+   ! grep -q "^RCB_APP_BUILD_DIR=" ${TEST_LOG_FILE} &&
+   grep -q "TESTAPP_FAST_VAR=fast" ${TEST_BUILD_DIR}/env/env_setup.env &&
+   grep -q "TESTAPP_FAST_VAR=fast" ${TEST_BUILD_DIR}/env/build.env &&
+   grep -q "CMD_BUILD fast" ${TEST_BUILD_DIR}/build_steps.txt &&
+   [ ${ELAPSED_MS} -lt 5000 ]; then
+    echo "test19_1: OK, build of all phases took ${ELAPSED_MS} ms"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test19_1: Failed, environment was printed or build took ${ELAPSED_MS} ms"
+    exit 1
+fi
+
+# environment is printed with --no-fast and not saved to file
+rm -rf ${TEST_BUILD_DIR}/env
+exec_rockbuilder --no-fast --build
+if grep -q "env-settings start" ${TEST_LOG_FILE} &&
+   grep -q "^RCB_APP_BUILD_DIR=" ${TEST_LOG_FILE} &&
+   [ ! -e ${TEST_BUILD_DIR}/env ]; then
+    echo "test19_2: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test19_2: Failed, environment was not printed or was saved to file with --no-fast"
+    exit 1
+fi
@@ -0,0 +1,115 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+TEST_APP_CFG="./tests/apps/testapp_fast.cfg"
+TEST_BUILD_DIR=build/testapp_fast
+TEST_LOG_FILE="build/testapp_startup_time.log"
+# limit for the startup time on top of the startup time of the python interpreter itself
+STARTUP_TIME_LIMIT_MS=100
+# startup time is measured with the cached bytecode of the modules written by the first run
+unset PYTHONDONTWRITEBYTECODE
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+exec_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} $@ < /dev/null > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} $@'"
+        exit 1
+    fi
+}
+
+# fastest of the 10 runs without the startup time of the python interpreter,
+# interpreter startup is measured on each run so that the load of the host affects both
+measure_startup_time() {
+    STARTUP_TIME_MS=
+    for ii in $(seq 10); do
+        START_TIME=$(date +%s%N)
+        python -c pass
+        PYTHON_END_TIME=$(date +%s%N)
+        exec_rockbuilder $@
+        END_TIME=$(date +%s%N)
+        ELAPSED_MS=$(( (END_TIME - PYTHON_END_TIME - (PYTHON_END_TIME - START_TIME)) / 1000000 ))
+        if [[ -z "${STARTUP_TIME_MS}" || ${ELAPSED_MS} -lt ${STARTUP_TIME_MS} ]]; then
+            STARTUP_TIME_MS=${ELAPSED_MS}
+        fi
+    done
+}
+
+rm -rf ${TEST_BUILD_DIR} ${TEST_LOG_FILE}
+mkdir -p build
+
+# status and dry-run do not require the rockbuilder configuration or rocm sdk
+unset RCB_DISABLE_ROCM_SDK_CHECK
+measure_startup_time --status
+if grep -q "CMD_BUILD\s*pending" ${TEST_LOG_FILE} &&
+   [ ! -e ${TEST_BUILD_DIR}/CMD_INIT.done ] &&
+   [ ${STARTUP_TIME_MS} -lt ${STARTUP_TIME_LIMIT_MS} ]; then
+    echo "test20_1: OK, --status startup time: ${STARTUP_TIME_MS} ms"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test20_1: Failed, --status took ${STARTUP_TIME_MS} ms"
+    exit 1
+fi
+
+measure_startup_time --dry-run
+if grep -q "phases to execute: CMD_INIT CMD_PRE_CONFIG CMD_CONFIG CMD_POST_CONFIG CMD_BUILD CMD_INSTALL CMD_POST_INSTALL" ${TEST_LOG_FILE} &&
+   [ ! -e ${TEST_BUILD_DIR}/build_steps.txt ] &&
+   [ ${STARTUP_TIME_MS} -lt ${STARTUP_TIME_LIMIT_MS} ]; then
+    echo "test20_2: OK, --dry-run startup time: ${STARTUP_TIME_MS} ms"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test20_2: Failed, --dry-run took ${STARTUP_TIME_MS} ms"
+    exit 1
+fi
+
+# after the build all phases are done and the phase arguments force the execution again
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+exec_rockbuilder
+exec_rockbuilder --status
+if grep -q "CMD_BUILD\s*done" ${TEST_LOG_FILE} && ! grep -q "pending" ${TEST_LOG_FILE}; then
+    exec_rockbuilder --dry-run
+    if grep -q "phases to execute: none" ${TEST_LOG_FILE}; then
+        exec_rockbuilder --dry-run --build
+        if grep -q "phases to execute: CMD_INIT CMD_BUILD CMD_INSTALL CMD_POST_INSTALL" ${TEST_LOG_FILE}; then
+            echo "test20_3: OK"
+        else
+            cat ${TEST_LOG_FILE}
+            echo "test20_3: Failed, --dry-run --build did not list the forced phases"
+            exit 1
+        fi
+    else
+        cat ${TEST_LOG_FILE}
+        echo "test20_3: Failed, --dry-run listed phases after the build"
+        exit 1
+    fi
+else
+    cat ${TEST_LOG_FILE}
+    echo "test20_3: Failed, --status did not report the phases done"
+    exit 1
+fi
+
+# help does not read the app configs
+measure_startup_time --help
+if grep -q "usage:" ${TEST_LOG_FILE} &&
+   [ ${STARTUP_TIME_MS} -lt ${STARTUP_TIME_LIMIT_MS} ]; then
+    echo "test20_4: OK, --help startup time: ${STARTUP_TIME_MS} ms"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test20_4: Failed, --help took ${STARTUP_TIME_MS} ms"
+    exit 1
+fi
@@ -0,0 +1,122 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+# app config is generated by the test, so that it can be modified
+TEST_APP_CFG="build/testapp_cfg_index.cfg"
+TEST_BUILD_DIR=build/testapp_cfg_index
+TEST_INDEX_FILE=build/app_cfg_index.json
+TEST_LOG_FILE="build/testapp_cfg_index.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+exec_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} $@ > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} $@'"
+        exit 1
+    fi
+}
+
+write_app_cfg() {
+    cat > ${TEST_APP_CFG} <<EOF_CFG
+[app_info]
+APP_NAME=testapp_cfg_index
+
+PROP_IS_ROCM_SDK_USED=NO
+
+CMD_EXEC_DIR=\${RCB_APP_BUILD_DIR}
+CMD_BUILD = echo "generic" > build_cmd.txt
+CMD_BUILD_LINUX = echo "$1" > build_cmd.txt
+EOF_CFG
+}
+
+get_indexed_time() {
+    python -c "import json, os; print(json.load(open('${TEST_INDEX_FILE}'))['entries'][os.path.realpath('${TEST_APP_CFG}')]['indexed_ns'])"
+}
+
+rm -rf ${TEST_BUILD_DIR} ${TEST_APP_CFG} ${TEST_INDEX_FILE} ${TEST_LOG_FILE}
+mkdir -p build
+
+# os specific command is resolved to the index
+write_app_cfg linux_1
+exec_rockbuilder
+if [[ "$(cat ${TEST_BUILD_DIR}/build_cmd.txt)" == "linux_1" ]] &&
+   grep -q '"CMD_BUILD": "echo \\"linux_1\\" > build_cmd.txt"' ${TEST_INDEX_FILE}; then
+    echo "test21_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test21_1: Failed, os specific command was not resolved from the index"
+    exit 1
+fi
+
+# index entry is reused without parsing when the config file has not changed
+touch -d "2020-01-01" ${TEST_APP_CFG}
+exec_rockbuilder --status
+INDEXED_TIME_1=$(get_indexed_time)
+exec_rockbuilder --status
+INDEXED_TIME_2=$(get_indexed_time)
+if [[ -n "${INDEXED_TIME_1}" && "${INDEXED_TIME_1}" == "${INDEXED_TIME_2}" ]]; then
+    echo "test21_2: OK"
+else
+    echo "test21_2: Failed, index entry was not reused: ${INDEXED_TIME_1} ${INDEXED_TIME_2}"
+    exit 1
+fi
+
+# modified config file of the same size is parsed again
+write_app_cfg linux_2
+exec_rockbuilder --build
+if [[ "$(cat ${TEST_BUILD_DIR}/build_cmd.txt)" == "linux_2" ]]; then
+    echo "test21_3: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test21_3: Failed, modified config file was not parsed again"
+    exit 1
+fi
+
+# app list file is read from the index and the apps in it are listed
+TEST_APP_LIST_CFG="build/testapps_cfg_index.apps"
+cat > ${TEST_APP_LIST_CFG} <<EOF_CFG
+[apps]
+app_list=
+    ${TEST_APP_CFG}
+EOF_CFG
+./rockbuilder.py ${TEST_APP_LIST_CFG} --status > ${TEST_LOG_FILE} 2>&1
+if [ $? -eq 0 ] &&
+   grep -q "^testapp_cfg_index:" ${TEST_LOG_FILE} &&
+   grep -q "testapps_cfg_index.apps" ${TEST_INDEX_FILE}; then
+    echo "test21_4: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test21_4: Failed, apps of the app list were not read from the index"
+    exit 1
+fi
+
+# app config without the app_info section is reported as an error
+printf '[other]\nKEY=value\n' > ${TEST_APP_CFG}
+./rockbuilder.py ${TEST_APP_LIST_CFG} --status > ${TEST_LOG_FILE} 2>&1
+if [ $? -ne 0 ] &&
+   grep -q "Could not find the app_info from configuration file" ${TEST_LOG_FILE} &&
+   ! grep -q "Traceback" ${TEST_LOG_FILE}; then
+    echo "test21_5: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test21_5: Failed, missing app_info section was not reported"
+    exit 1
+fi
@@ -0,0 +1,95 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+unset RCB_PHASE_LOG_COMPRESS
+unset TESTAPP_PHASE_LOG_FAIL
+export RCB_PHASE_LOG_TAIL_LINES=5
+
+TEST_APP_CFG="./tests/apps/testapp_phase_log.cfg"
+TEST_BUILD_DIR=build/testapp_phase_log
+TEST_LOG_FILE="build/testapp_phase_log.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+rm -rf ${TEST_BUILD_DIR} ${TEST_LOG_FILE}
+mkdir -p build
+
+# output of each phase is shown and saved to the phase log
+./rockbuilder.py ${TEST_APP_CFG} > ${TEST_LOG_FILE} 2>&1
+if [ $? -eq 0 ] &&
+   grep -q "^config output" ${TEST_LOG_FILE} &&
+   grep -q "^build line 1000" ${TEST_LOG_FILE} &&
+   grep -q "^config output" ${TEST_BUILD_DIR}/logs/config.log &&
+   [ "$(grep -c '^build line' ${TEST_BUILD_DIR}/logs/build.log)" == "1000" ]; then
+    echo "test22_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test22_1: Failed, phase output was not saved to the phase logs"
+    exit 1
+fi
+
+# last lines of output are printed when the phase fails, compressed log has the whole output
+export RCB_PHASE_LOG_COMPRESS=1
+export TESTAPP_PHASE_LOG_FAIL=1
+./rockbuilder.py ${TEST_APP_CFG} --build > ${TEST_LOG_FILE} 2>&1
+if [ $? -ne 0 ] &&
+   grep -A5 "last 5 lines of output" ${TEST_LOG_FILE} | grep -q "^build line 997" &&
+   grep -A5 "last 5 lines of output" ${TEST_LOG_FILE} | grep -q "^build error" &&
+   grep -q "Log file: .*logs/build.log.gz" ${TEST_LOG_FILE} &&
+   [ "$(zcat ${TEST_BUILD_DIR}/logs/build.log.gz | grep -c '^build line')" == "1000" ] &&
+   zcat ${TEST_BUILD_DIR}/logs/build.log.gz | grep -q "^build error"; then
+    echo "test22_2: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test22_2: Failed, last lines of the failed phase were not printed"
+    exit 1
+fi
+
+# windows batch file of the multi-line commands is executed with the phase log
+# and its resource usage is recorded for the build report
+# (executable shell script is used as a batch file on linux)
+exec_batch_file() {
+    python -c "
+from pathlib import Path
+from lib_python.repo_management import RockProjectRepo
+from lib_python.build_report import RockCmdResourceUsage
+app_repo = RockProjectRepo.__new__(RockProjectRepo)
+app_repo.app_build_dir = Path('${TEST_BUILD_DIR}').resolve()
+app_repo.is_phase_log_open = False
+app_repo.cmd_resource_usage = RockCmdResourceUsage()
+batch_file = app_repo.app_build_dir / 'batch.bat'
+batch_file.write_text('#!/bin/sh\necho batch output\nexit 3\n')
+batch_file.chmod(0o755)
+app_repo._open_phase_log('batch')
+ret = app_repo._exec_subprocess_batch_file(batch_file.as_posix(), app_repo.app_build_dir.as_posix())
+app_repo.printout_phase_log_tail()
+print('batch result: ' + str(ret))
+usage = app_repo.cmd_resource_usage.to_dict()
+print('batch usage: ' + str(usage['cmd_count']) + ' ' + str(usage['exit_status']) + ' ' + str(usage['cmd_wall_time'] > 0))
+"
+}
+unset RCB_PHASE_LOG_COMPRESS
+exec_batch_file > ${TEST_LOG_FILE} 2>&1
+if grep -q "^batch result: False" ${TEST_LOG_FILE} &&
+   grep -A2 "last 1 lines of output" ${TEST_LOG_FILE} | grep -q "^batch output" &&
+   grep -q "^batch output" ${TEST_BUILD_DIR}/logs/batch.log &&
+   grep -q "^batch usage: 1 3 True" ${TEST_LOG_FILE}; then
+    echo "test22_3: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test22_3: Failed, batch file was not executed with the phase log and resource usage"
+    exit 1
+fi
@@ -0,0 +1,65 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+unset RCB_BUILD_REPORT_RECORD_FILE
+unset TESTAPP_PHASE_LOG_FAIL
+
+TEST_APP_CFG="./tests/apps/testapp_phase_log.cfg"
+TEST_BUILD_DIR=build/testapp_phase_log
+TEST_REPORT_DIR=build/reports
+TEST_LOG_FILE="build/testapp_build_report.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+# check the CMD_BUILD phase of the latest build report with python expression
+check_build_report() {
+    python -c "
+import json, pathlib, sys
+report_fname = sorted(pathlib.Path('${TEST_REPORT_DIR}').glob('build_report_*.json'))[-1]
+app = json.load(open(report_fname))['apps']['testapp_phase_log']
+build = app['phases']['CMD_BUILD']
+sys.exit(0 if ($1) else 1)
+"
+}
+
+rm -rf ${TEST_BUILD_DIR} ${TEST_REPORT_DIR} ${TEST_LOG_FILE}
+mkdir -p build
+
+# resource usage of each phase is saved to the build report of the run
+./rockbuilder.py ${TEST_APP_CFG} > ${TEST_LOG_FILE} 2>&1
+if [ $? -eq 0 ] &&
+   grep -q "Build report: .*build_report_.*.json" ${TEST_LOG_FILE} &&
+   check_build_report "app['success'] and build['success'] and build['cmd_count'] == 1 and build['exit_status'] == 0 and build['max_rss_kb'] > 0 and 'CMD_INSTALL' in app['phases']" &&
+   [ -z "$(ls ${TEST_REPORT_DIR}/*.jsonl 2> /dev/null)" ]; then
+    echo "test23_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test23_1: Failed, build report does not contain the phase resource usage"
+    exit 1
+fi
+
+# exit status of the failed phase is saved to the build report
+sleep 1
+export TESTAPP_PHASE_LOG_FAIL=1
+./rockbuilder.py ${TEST_APP_CFG} --build > ${TEST_LOG_FILE} 2>&1
+if [ $? -ne 0 ] &&
+   check_build_report "not app['success'] and not build['success'] and build['exit_status'] == 3 and 'CMD_INSTALL' not in app['phases']"; then
+    echo "test23_2: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test23_2: Failed, failed phase was not saved to the build report"
+    exit 1
+fi
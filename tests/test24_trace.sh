@@ -0,0 +1,52 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+unset RCB_TRACE_EVENT_FILE
+unset TESTAPP_PHASE_LOG_FAIL
+
+TEST_APP_CFG="./tests/apps/testapp_phase_log.cfg"
+TEST_BUILD_DIR=build/testapp_phase_log
+TEST_TRACE_FILE=build/testapp_trace.json
+TEST_LOG_FILE="build/testapp_trace.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+rm -rf ${TEST_BUILD_DIR} ${TEST_TRACE_FILE} ${TEST_LOG_FILE}
+mkdir -p build
+
+# app, phase and command events are written to the trace and the phases are inside the app
+./rockbuilder.py ${TEST_APP_CFG} --trace ${TEST_TRACE_FILE} > ${TEST_LOG_FILE} 2>&1
+if [ $? -eq 0 ] &&
+   grep -q "Trace: .*testapp_trace.json" ${TEST_LOG_FILE} &&
+   [ -z "$(ls build/trace_events_*.jsonl 2> /dev/null)" ] &&
+   python -c "
+import json, sys
+event_list = json.load(open('${TEST_TRACE_FILE}'))['traceEvents']
+def get_events(cat):
+    return [ev for ev in event_list if ev['ph'] == 'X' and ev['cat'] == cat]
+app = [ev for ev in get_events('app') if ev['name'] == 'testapp_phase_log'][0]
+phase_list = get_events('phase')
+build = [ev for ev in phase_list if ev['name'] == 'CMD_BUILD'][0]
+cmd_list = [ev for ev in get_events('cmd') if build['ts'] <= ev['ts'] and ev['ts'] + ev['dur'] <= build['ts'] + build['dur']]
+sys.exit(0 if (get_events('run') and cmd_list and
+               all(app['ts'] <= ev['ts'] and ev['ts'] + ev['dur'] <= app['ts'] + app['dur'] for ev in phase_list)) else 1)
+"; then
+    echo "test24_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test24_1: Failed, trace does not contain the app, phase and command events"
+    exit 1
+fi
@@ -0,0 +1,52 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+TEST_WORK_DIR=build/test_benchmark
+TEST_RESULT_FILE=build/test_benchmark_result.json
+TEST_LOG_FILE="build/test_benchmark.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+
+rm -rf ${TEST_WORK_DIR} ${TEST_RESULT_FILE} ${TEST_LOG_FILE}
+mkdir -p build
+
+# benchmark builds the synthetic apps offline and saves the time of each step
+./rockbuilder_benchmark.py --app-count 3 --work-dir ${TEST_WORK_DIR} --output ${TEST_RESULT_FILE} > ${TEST_LOG_FILE} 2>&1
+if [ $? -eq 0 ] &&
+   python -c "
+import json, sys
+report = json.load(open('${TEST_RESULT_FILE}'))
+results = report['results']
+sys.exit(0 if (report['params']['app_count'] == 3 and
+               all(results[name]['time'] > 0 for name in ['cfg_parse_cold', 'cfg_parse_warm', 'checkout', 'patch_apply',
+                                                          'hipify', 'hipify_commit', 'env_setup', 'build_phases', 'stamp_check_run'])) else 1)
+" &&
+   grep -q "hipified" ${TEST_WORK_DIR}/workspace/src_apps/bench_app_000/src/file_0.txt &&
+   [ -e ${TEST_WORK_DIR}/workspace/src_apps/bench_app_000/hipified_patch_0.txt ]; then
+    echo "test25_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test25_1: Failed, benchmark did not measure all steps"
+    exit 1
+fi
+
+# results are compared with the earlier results
+./rockbuilder_benchmark.py --app-count 3 --work-dir ${TEST_WORK_DIR} --output ${TEST_RESULT_FILE} --compare ${TEST_RESULT_FILE} > ${TEST_LOG_FILE} 2>&1
+if [ $? -eq 0 ] && grep -q "^stamp_check_run .*%$" ${TEST_LOG_FILE}; then
+    echo "test25_2: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test25_2: Failed, results were not compared"
+    exit 1
+fi
+rm -rf ${TEST_WORK_DIR}
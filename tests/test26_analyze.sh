@@ -0,0 +1,62 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_LIST_CFG="./tests/apps/testapps_parallel.apps"
+TEST_REPORT_DIR=build/reports
+TEST_LOG_FILE="build/testapps_analyze.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_LIST_CFG: ${TEST_APP_LIST_CFG}"
+
+rm -rf ${TEST_REPORT_DIR} ${TEST_LOG_FILE} build/testapp_par_*
+mkdir -p ${TEST_REPORT_DIR}
+
+# analysis requires the build history
+./rockbuilder.py ${TEST_APP_LIST_CFG} --analyze > ${TEST_LOG_FILE} 2>&1
+if [ $? -ne 0 ] && grep -q "Error, no build reports found" ${TEST_LOG_FILE}; then
+    echo "test26_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test26_1: Failed, analysis without build reports did not fail"
+    exit 1
+fi
+
+# testapp_par_c depends from testapp_par_a (10 sec) and testapp_par_b (20 sec, uses 2 cpus).
+# Later report overrides the CMD_BUILD duration of the testapp_par_b from the earlier report.
+write_report() {
+    echo "{\"version\": 1, \"apps\": {$2}}" > ${TEST_REPORT_DIR}/build_report_$1.json
+}
+phase() {
+    echo "\"$1\": {\"success\": true, \"phases\": {\"CMD_BUILD\": {\"success\": true, \"wall_time\": $2, \"user_cpu_time\": $3, \"sys_cpu_time\": 0}}}"
+}
+write_report 20250101_000000_1 "$(phase testapp_par_a 10 10), $(phase testapp_par_b 50 50), $(phase testapp_par_c 5 1)"
+write_report 20250102_000000_1 "$(phase testapp_par_b 20 40)"
+./rockbuilder.py ${TEST_APP_LIST_CFG} --analyze --jobs 2 > ${TEST_LOG_FILE} 2>&1
+if [ $? -eq 0 ] &&
+   grep -q "from 2 build reports" ${TEST_LOG_FILE} &&
+   grep -q "^Critical path: tests/apps/testapp_par_b.cfg -> tests/apps/testapp_par_c.cfg (25.0 sec)" ${TEST_LOG_FILE} &&
+   grep -q "^Total build time of the apps: 35.0 sec" ${TEST_LOG_FILE} &&
+   grep -Eq "^ +tests/apps/testapp_par_a.cfg +10.0 +0.0 +10.0 +10.0$" ${TEST_LOG_FILE} &&
+   grep -Eq "^ +unlimited +35.0 \(1.0x\) +25.0 \(1.4x\) +25.0 \(1.4x\)$" ${TEST_LOG_FILE} &&
+   grep -Eq "^ +2 +35.0 \(1.0x\) +30.0 \(1.17x\) +30.0 \(1.17x\)$" ${TEST_LOG_FILE} &&
+   [ -z "$(ls build/testapp_par_* 2> /dev/null)" ]; then
+    echo "test26_2: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test26_2: Failed, wrong critical path or simulated build times"
+    exit 1
+fi
+rm -rf ${TEST_REPORT_DIR}
@@ -0,0 +1,88 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_CFG="./tests/apps/testapp_cache.cfg"
+TEST_GIT_REPO_FILE=tests/repositories/test1_check_build_steps_git.tar
+TEST_RES_FILE="build/testapp_cache.txt"
+TEST_WHEEL_DIR="build/test_batch_wheel_install_wheels"
+TEST_LOG_FILE="build/testapp_batch_wheel_install.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+if [ -f ${TEST_GIT_REPO_FILE} ]; then
+    tar -xf ${TEST_GIT_REPO_FILE} -C /tmp
+else
+    echo "Error, could not find test repository files:"
+    echo "    ${TEST_GIT_REPO_FILE}"
+    exit 1
+fi
+
+rm -rf build/testapp_cache src_apps/testapp_cache ${TEST_RES_FILE} ${TEST_WHEEL_DIR} ${TEST_LOG_FILE}
+pip uninstall -y rcb_testapp_cache > /dev/null 2>&1
+mkdir -p build
+
+run_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} --batch-wheel-install --output-dir ${TEST_WHEEL_DIR} > ${TEST_LOG_FILE} 2>&1
+    if [ ! $? -eq 0 ]; then
+        cat ${TEST_LOG_FILE}
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} --batch-wheel-install --output-dir ${TEST_WHEEL_DIR}'"
+        pip uninstall -y rcb_testapp_cache
+        exit 1
+    fi
+}
+
+# app is not used by other apps, so its wheel is installed at the end of the run
+run_rockbuilder
+if grep -q "Python wheel install queued to the end of the run" ${TEST_LOG_FILE} &&
+   grep -q "Installing 1 queued python wheels" ${TEST_LOG_FILE} &&
+   pip show rcb_testapp_cache > /dev/null 2>&1 &&
+   [ -f build/testapp_cache/python_wheel_install.json ]; then
+    echo "test27_1: OK"
+else
+    echo "test27_1: Failed, queued python wheel was not installed"
+    pip uninstall -y rcb_testapp_cache
+    exit 1
+fi
+
+# install of the same wheel is skipped
+rm -f build/testapp_cache/CMD_INSTALL.done
+run_rockbuilder
+if grep -q "Python wheel already installed: rcb_testapp_cache-0.1-py3-none-any.whl" ${TEST_LOG_FILE} &&
+   ! grep -q "queued python wheels" ${TEST_LOG_FILE} &&
+   [ $(grep -c "CMD_BUILD" ${TEST_RES_FILE}) -eq 1 ]; then
+    echo "test27_2: OK"
+else
+    echo "test27_2: Failed, install of the already installed python wheel was not skipped"
+    pip uninstall -y rcb_testapp_cache
+    exit 1
+fi
+
+# wheel is installed again after it has been removed from the python environment
+pip uninstall -y rcb_testapp_cache > /dev/null 2>&1
+rm -f build/testapp_cache/CMD_INSTALL.done
+run_rockbuilder
+pip show rcb_testapp_cache > /dev/null 2>&1
+INSTALLED=$?
+pip uninstall -y rcb_testapp_cache > /dev/null 2>&1
+if grep -q "Installing 1 queued python wheels" ${TEST_LOG_FILE} && [ ${INSTALLED} -eq 0 ]; then
+    echo "test27_3: OK"
+else
+    echo "test27_3: Failed, removed python wheel was not installed again"
+    exit 1
+fi
@@ -0,0 +1,105 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+TEST_SDK_DIR=build/test_rocm_sdk_tool_paths
+TEST_SDK_STD_DIR=${TEST_SDK_DIR}/standard
+TEST_SDK_CUSTOM_DIR=${TEST_SDK_DIR}/custom
+TEST_CACHE_FILE=build/rocm_sdk_tool_paths.json
+TEST_LOG_FILE="build/test_rocm_sdk_tool_paths.log"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+
+rm -rf ${TEST_SDK_DIR} ${TEST_CACHE_FILE} ${TEST_LOG_FILE}
+
+# fake rocm sdk with the standard install layout
+mkdir -p ${TEST_SDK_STD_DIR}/.info ${TEST_SDK_STD_DIR}/bin ${TEST_SDK_STD_DIR}/lib/llvm/bin ${TEST_SDK_STD_DIR}/lib/llvm/amdgcn/bitcode
+echo "7.0.0" > ${TEST_SDK_STD_DIR}/.info/version
+touch ${TEST_SDK_STD_DIR}/bin/hipcc ${TEST_SDK_STD_DIR}/lib/llvm/bin/clang ${TEST_SDK_STD_DIR}/lib/llvm/bin/clang++
+# fake rocm sdk with the tools in non-standard locations and decoys in the include dir
+mkdir -p ${TEST_SDK_CUSTOM_DIR}/include/bin ${TEST_SDK_CUSTOM_DIR}/tools/bin ${TEST_SDK_CUSTOM_DIR}/compiler/bin ${TEST_SDK_CUSTOM_DIR}/share/amdgcn/bitcode
+touch ${TEST_SDK_CUSTOM_DIR}/include/bin/hipcc ${TEST_SDK_CUSTOM_DIR}/tools/bin/hipcc
+touch ${TEST_SDK_CUSTOM_DIR}/compiler/bin/clang ${TEST_SDK_CUSTOM_DIR}/compiler/bin/clang++
+
+# Prints "search" when the rocm sdk directory is searched instead of using the cache
+# and then the tool paths found.
+get_tool_paths() {
+    python -c "
+import json
+import lib_python.utils as utils
+find_tool_paths = utils._find_rocm_sdk_tool_paths
+def find_tool_paths_and_report(rocm_home_root_path):
+    print('search')
+    return find_tool_paths(rocm_home_root_path)
+utils._find_rocm_sdk_tool_paths = find_tool_paths_and_report
+print(json.dumps(utils.get_rocm_sdk_tool_paths(utils.Path('$1')), sort_keys=True))
+" > ${TEST_LOG_FILE} 2>&1
+}
+
+# first lookup searches the sdk and stores the result to the cache file
+get_tool_paths ${TEST_SDK_STD_DIR}
+if grep -q "^search" ${TEST_LOG_FILE} &&
+   grep -q "\"bitcode\": \"${TEST_SDK_STD_DIR}/lib/llvm/amdgcn/bitcode\"" ${TEST_LOG_FILE} &&
+   grep -q "\"clang_cxx\": \"${TEST_SDK_STD_DIR}/lib/llvm/bin/clang++\"" ${TEST_LOG_FILE} &&
+   grep -q "\"hipcc\": \"${TEST_SDK_STD_DIR}/bin/hipcc\"" ${TEST_LOG_FILE} &&
+   [ -f ${TEST_CACHE_FILE} ]; then
+    echo "test28_1: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test28_1: Failed, tool paths were not found from the standard rocm sdk layout"
+    exit 1
+fi
+
+# lookup from the new process uses the cache file
+cp ${TEST_LOG_FILE} ${TEST_LOG_FILE}.first
+get_tool_paths ${TEST_SDK_STD_DIR}
+if ! grep -q "^search" ${TEST_LOG_FILE} &&
+   [ "$(tail -1 ${TEST_LOG_FILE})" == "$(tail -1 ${TEST_LOG_FILE}.first)" ]; then
+    echo "test28_2: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test28_2: Failed, tool paths were not read from the cache"
+    exit 1
+fi
+
+# cache is invalidated when the bin directory or the version changes
+touch -d "2001-01-01 00:00:00" ${TEST_SDK_STD_DIR}/bin
+get_tool_paths ${TEST_SDK_STD_DIR}
+if grep -q "^search" ${TEST_LOG_FILE}; then
+    echo "8.0.0" > ${TEST_SDK_STD_DIR}/.info/version
+    get_tool_paths ${TEST_SDK_STD_DIR}
+    if grep -q "^search" ${TEST_LOG_FILE}; then
+        echo "test28_3: OK"
+    else
+        cat ${TEST_LOG_FILE}
+        echo "test28_3: Failed, cache was not invalidated after the rocm sdk version changed"
+        exit 1
+    fi
+else
+    cat ${TEST_LOG_FILE}
+    echo "test28_3: Failed, cache was not invalidated after the bin directory changed"
+    exit 1
+fi
+
+# tools are searched from the whole sdk directory, except from the include dirs
+get_tool_paths ${TEST_SDK_CUSTOM_DIR}
+if grep -q "^search" ${TEST_LOG_FILE} &&
+   grep -q "\"bitcode\": \"${TEST_SDK_CUSTOM_DIR}/share/amdgcn/bitcode\"" ${TEST_LOG_FILE} &&
+   grep -q "\"clang_cxx\": \"${TEST_SDK_CUSTOM_DIR}/compiler/bin/clang++\"" ${TEST_LOG_FILE} &&
+   grep -q "\"hipcc\": \"${TEST_SDK_CUSTOM_DIR}/tools/bin/hipcc\"" ${TEST_LOG_FILE}; then
+    echo "test28_4: OK"
+else
+    cat ${TEST_LOG_FILE}
+    echo "test28_4: Failed, tool paths were not found from the non-standard rocm sdk layout"
+    exit 1
+fi
+rm -rf ${TEST_SDK_DIR} ${TEST_LOG_FILE} ${TEST_LOG_FILE}.first
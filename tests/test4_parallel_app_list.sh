@@ -0,0 +1,60 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_LIST_CFG="./tests/apps/testapps_parallel.apps"
+TEST_RES_FILE="build/testapps_parallel.txt"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_LIST_CFG: ${TEST_APP_LIST_CFG}"
+
+rm -f ${TEST_RES_FILE}
+./rockbuilder.py ${TEST_APP_LIST_CFG} --build --max-parallel-apps 2
+if [ ! $? -eq 0 ]; then
+    echo ""
+    echo "Failed to execute command: "
+    echo "    './rockbuilder.py ${TEST_APP_LIST_CFG} --build --max-parallel-apps 2'"
+    exit 1
+fi
+
+get_line_number() {
+    grep -n "$1" ${TEST_RES_FILE} | cut -d: -f1
+}
+
+A_START=$(get_line_number "testapp_par_a start")
+A_END=$(get_line_number "testapp_par_a end")
+B_START=$(get_line_number "testapp_par_b start")
+B_END=$(get_line_number "testapp_par_b end")
+C_START=$(get_line_number "testapp_par_c start")
+
+cat ${TEST_RES_FILE}
+if [[ -z ${A_START} || -z ${A_END} || -z ${B_START} || -z ${B_END} || -z ${C_START} ]]; then
+    echo "test4_1: Failed, all apps were not build"
+    exit 1
+fi
+# testapp_par_a and testapp_par_b does not depend from each other
+if [[ ${A_START} -lt ${B_END} && ${B_START} -lt ${A_END} ]]; then
+    echo "test4_1: OK"
+else
+    echo "test4_1: Failed, independent apps were not build in parallel"
+    exit 1
+fi
+# testapp_par_c depends from both testapp_par_a and testapp_par_b
+if [[ ${C_START} -gt ${A_END} && ${C_START} -gt ${B_END} ]]; then
+    echo "test4_2: OK"
+else
+    echo "test4_2: Failed, app was build before its dependencies"
+    exit 1
+fi
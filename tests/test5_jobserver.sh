@@ -0,0 +1,52 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+unset CMAKE_BUILD_PARALLEL_LEVEL
+
+TEST_APP_CFG="./tests/apps/testapp_jobs.cfg"
+TEST_RES_FILE="build/testapp_jobs.txt"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+if ! command -v make &> /dev/null; then
+    echo "test5: skipped, make is not installed"
+    exit 0
+fi
+
+rm -f ${TEST_RES_FILE}
+./rockbuilder.py ${TEST_APP_CFG} --build --jobs 3 --load-average 8
+if [ ! $? -eq 0 ]; then
+    echo ""
+    echo "Failed to execute command: "
+    echo "    './rockbuilder.py ${TEST_APP_CFG} --build --jobs 3 --load-average 8'"
+    exit 1
+fi
+
+cat ${TEST_RES_FILE}
+# make started by the app build needs to be a client of the rockbuilder job server
+if grep -q "jobserver-auth" ${TEST_RES_FILE} && grep -q "l8" ${TEST_RES_FILE}; then
+    echo "test5_1: OK"
+else
+    echo "test5_1: Failed, job server was not passed to make"
+    exit 1
+fi
+# CMAKE_BUILD_PARALLEL_LEVEL would override the job server in the make started by cmake
+if grep -q "^MAX_JOBS=3$" ${TEST_RES_FILE} && grep -q "^CMAKE_BUILD_PARALLEL_LEVEL=$" ${TEST_RES_FILE}; then
+    echo "test5_2: OK"
+else
+    echo "test5_2: Failed, job count was not exported or CMAKE_BUILD_PARALLEL_LEVEL was set"
+    exit 1
+fi
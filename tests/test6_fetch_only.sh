@@ -0,0 +1,63 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_LIST_CFG="./tests/apps/testapps_fetch.apps"
+TEST_GIT_REPO_FILE=tests/repositories/test1_check_build_steps_git.tar
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_LIST_CFG: ${TEST_APP_LIST_CFG}"
+
+if [ -f ${TEST_GIT_REPO_FILE} ]; then
+    tar -xf ${TEST_GIT_REPO_FILE} -C /tmp
+else
+    echo "Error, could not find test repository files:"
+    echo "    ${TEST_GIT_REPO_FILE}"
+    exit 1
+fi
+
+rm -rf build/testapp_01 build/testapp_fetch src_apps/testapp_01 src_apps/testapp_fetch
+./rockbuilder.py ${TEST_APP_LIST_CFG} --fetch-only
+if [ ! $? -eq 0 ]; then
+    echo ""
+    echo "Failed to execute command: "
+    echo "    './rockbuilder.py ${TEST_APP_LIST_CFG} --fetch-only'"
+    exit 1
+fi
+
+# sources of all apps are checked out but nothing is build
+if [[ -f src_apps/testapp_01/hello_world.txt && -f src_apps/testapp_fetch/hello_world.txt &&
+      -f build/testapp_01/CMD_CHECKOUT.done && -f build/testapp_fetch/CMD_CHECKOUT.done &&
+      ! -f build/testapp_01/CMD_BUILD.done && ! -f build/testapp_fetch/CMD_BUILD.done ]]; then
+    echo "test6_1: OK"
+else
+    echo "test6_1: Failed, --fetch-only did not checkout all apps"
+    exit 1
+fi
+
+# build uses the sources fetched earlier
+./rockbuilder.py ${TEST_APP_LIST_CFG}
+if [ ! $? -eq 0 ]; then
+    echo ""
+    echo "Failed to execute command: "
+    echo "    './rockbuilder.py ${TEST_APP_LIST_CFG}'"
+    exit 1
+fi
+if [[ -f build/testapp_01/CMD_BUILD.done && -f build/testapp_fetch/CMD_BUILD.done ]]; then
+    echo "test6_2: OK"
+else
+    echo "test6_2: Failed, apps were not build after --fetch-only"
+    exit 1
+fi
@@ -0,0 +1,54 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_CFG="./tests/apps/testapp_stamps.cfg"
+TEST_RES_FILE="build/testapp_stamps.txt"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+rm -rf build/testapp_stamps ${TEST_RES_FILE}
+
+run_rockbuilder() {
+    RCB_AMDGPU_TARGETS=$1 ./rockbuilder.py ${TEST_APP_CFG}
+    if [ ! $? -eq 0 ]; then
+        echo ""
+        echo "Failed to execute command: "
+        echo "    'RCB_AMDGPU_TARGETS=$1 ./rockbuilder.py ${TEST_APP_CFG}'"
+        exit 1
+    fi
+}
+
+run_rockbuilder gfx1100
+run_rockbuilder gfx1100
+cat ${TEST_RES_FILE}
+# phases are not executed again if their inputs have not changed
+if [[ $(grep -c "CMD_CONFIG" ${TEST_RES_FILE}) -eq 1 && $(grep -c "CMD_BUILD gfx1100" ${TEST_RES_FILE}) -eq 1 ]]; then
+    echo "test7_1: OK"
+else
+    echo "test7_1: Failed, phases were executed again without changes"
+    exit 1
+fi
+
+run_rockbuilder gfx1201
+cat ${TEST_RES_FILE}
+# change of target gpus needs to execute the phases again
+if [[ $(grep -c "CMD_CONFIG" ${TEST_RES_FILE}) -eq 2 && $(grep -c "CMD_BUILD gfx1201" ${TEST_RES_FILE}) -eq 1 ]]; then
+    echo "test7_2: OK"
+else
+    echo "test7_2: Failed, phases were not executed again after the inputs changed"
+    exit 1
+fi
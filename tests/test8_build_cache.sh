@@ -0,0 +1,67 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_CFG="./tests/apps/testapp_cache.cfg"
+TEST_GIT_REPO_FILE=tests/repositories/test1_check_build_steps_git.tar
+TEST_RES_FILE="build/testapp_cache.txt"
+TEST_CACHE_DIR="build/test_build_cache"
+TEST_WHEEL_DIR="build/test_build_cache_wheels"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+if [ -f ${TEST_GIT_REPO_FILE} ]; then
+    tar -xf ${TEST_GIT_REPO_FILE} -C /tmp
+else
+    echo "Error, could not find test repository files:"
+    echo "    ${TEST_GIT_REPO_FILE}"
+    exit 1
+fi
+
+rm -rf build/testapp_cache src_apps/testapp_cache ${TEST_RES_FILE} ${TEST_CACHE_DIR} ${TEST_WHEEL_DIR}
+
+run_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} --build-cache-dir ${TEST_CACHE_DIR} --output-dir ${TEST_WHEEL_DIR}
+    if [ ! $? -eq 0 ]; then
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} --build-cache-dir ${TEST_CACHE_DIR} --output-dir ${TEST_WHEEL_DIR}'"
+        pip uninstall -y rcb_testapp_cache
+        exit 1
+    fi
+}
+
+# first build stores the wheel to cache
+run_rockbuilder
+if [[ $(grep -c "CMD_BUILD" ${TEST_RES_FILE}) -eq 1 && -n "$(find ${TEST_CACHE_DIR} -name '*.whl')" ]]; then
+    echo "test8_1: OK"
+else
+    echo "test8_1: Failed, wheel was not stored to build cache"
+    pip uninstall -y rcb_testapp_cache
+    exit 1
+fi
+
+# second build after removing the build and source dirs installs the wheel from cache
+rm -rf build/testapp_cache src_apps/testapp_cache ${TEST_WHEEL_DIR}
+run_rockbuilder
+pip uninstall -y rcb_testapp_cache
+if [[ $(grep -c "CMD_BUILD" ${TEST_RES_FILE}) -eq 1 && ! -d src_apps/testapp_cache &&
+      -f ${TEST_WHEEL_DIR}/testapp_cache/rcb_testapp_cache-0.1-py3-none-any.whl ]]; then
+    echo "test8_2: OK"
+else
+    echo "test8_2: Failed, wheel was not installed from build cache"
+    exit 1
+fi
@@ -0,0 +1,93 @@
+#!/usr/bin/env bash
+
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+cd $SCRIPT_DIR
+cd ..
+
+if [[ -n "$VIRTUAL_ENV" ]]; then
+    echo "Virtual environment is active: $VIRTUAL_ENV"
+else
+     echo "No virtual environment is active."
+     source ./init_rcb_env.sh
+fi
+
+# these tests does not require the installation/build of rocm sdk itself
+export RCB_DISABLE_ROCM_SDK_CHECK=1
+
+TEST_APP_CFG="./tests/apps/testapp_cache.cfg"
+TEST_GIT_REPO_FILE=tests/repositories/test1_check_build_steps_git.tar
+TEST_RES_FILE="build/testapp_cache.txt"
+TEST_SERVER_DIR="build/test_remote_build_cache_server"
+TEST_SERVER_PORT_FILE="build/test_remote_build_cache_server.port"
+TEST_CACHE_DIR="build/test_remote_build_cache_local"
+TEST_WHEEL_DIR="build/test_remote_build_cache_wheels"
+
+echo "SCRIPT_DIR: ${SCRIPT_DIR}"
+echo "TEST_APP_CFG: ${TEST_APP_CFG}"
+
+if [ -f ${TEST_GIT_REPO_FILE} ]; then
+    tar -xf ${TEST_GIT_REPO_FILE} -C /tmp
+else
+    echo "Error, could not find test repository files:"
+    echo "    ${TEST_GIT_REPO_FILE}"
+    exit 1
+fi
+
+rm -rf build/testapp_cache src_apps/testapp_cache ${TEST_RES_FILE} ${TEST_SERVER_DIR} ${TEST_SERVER_PORT_FILE} ${TEST_CACHE_DIR} ${TEST_WHEEL_DIR}
+mkdir -p build
+
+python ./rockbuilder_cache_server.py --dir ${TEST_SERVER_DIR} --port 0 --port-file ${TEST_SERVER_PORT_FILE} &
+SERVER_PID=$!
+
+cleanup() {
+    kill ${SERVER_PID}
+    pip uninstall -y rcb_testapp_cache
+}
+
+for ii in $(seq 1 50); do
+    if [ -s ${TEST_SERVER_PORT_FILE} ]; then
+        break
+    fi
+    sleep 0.1
+done
+if [ ! -s ${TEST_SERVER_PORT_FILE} ]; then
+    echo "Error, build cache server did not start"
+    kill ${SERVER_PID}
+    exit 1
+fi
+TEST_CACHE_URL="http://127.0.0.1:$(cat ${TEST_SERVER_PORT_FILE})"
+
+run_rockbuilder() {
+    ./rockbuilder.py ${TEST_APP_CFG} --build-cache-url ${TEST_CACHE_URL} --output-dir ${TEST_WHEEL_DIR} "$@"
+    if [ ! $? -eq 0 ]; then
+        echo ""
+        echo "Failed to execute command: "
+        echo "    './rockbuilder.py ${TEST_APP_CFG} --build-cache-url ${TEST_CACHE_URL} --output-dir ${TEST_WHEEL_DIR} $@'"
+        cleanup
+        exit 1
+    fi
+}
+
+# first build uploads the wheel to the cache server
+run_rockbuilder
+if [[ $(grep -c "CMD_BUILD" ${TEST_RES_FILE}) -eq 1 &&
+      -n "$(find ${TEST_SERVER_DIR} -name '*.whl')" && -n "$(find ${TEST_SERVER_DIR} -name 'metadata.json')" ]]; then
+    echo "test9_1: OK"
+else
+    echo "test9_1: Failed, wheel was not uploaded to build cache server"
+    cleanup
+    exit 1
+fi
+
+# second build downloads the wheel from the cache server and stores it also to local cache
+rm -rf build/testapp_cache src_apps/testapp_cache ${TEST_WHEEL_DIR}
+run_rockbuilder --build-cache-dir ${TEST_CACHE_DIR}
+cleanup
+if [[ $(grep -c "CMD_BUILD" ${TEST_RES_FILE}) -eq 1 && ! -d src_apps/testapp_cache &&
+      -f ${TEST_WHEEL_DIR}/testapp_cache/rcb_testapp_cache-0.1-py3-none-any.whl &&
+      -n "$(find ${TEST_CACHE_DIR} -name '*.whl')" ]]; then
+    echo "test9_2: OK"
+else
+    echo "test9_2: Failed, wheel was not installed from build cache server"
+    exit 1
+fi
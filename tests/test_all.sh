@@ -8,6 +8,31 @@ scripts=(
     "./test1_check_build_steps.sh"
     "./test2_incorrect_exec_dir.sh"
     "./test3_correct_exec_dir.sh"
+    "./test4_parallel_app_list.sh"
+    "./test5_jobserver.sh"
+    "./test6_fetch_only.sh"
+    "./test7_phase_stamps.sh"
+    "./test8_build_cache.sh"
+    "./test9_remote_build_cache.sh"
+    "./test10_compiler_cache.sh"
+    "./test11_git_mirror.sh"
+    "./test12_submodule_fetch.sh"
+    "./test13_sparse_checkout.sh"
+    "./test14_noop_checkout.sh"
+    "./test15_nearest_tag.sh"
+    "./test16_submodule_ops.sh"
+    "./test17_src_snapshot.sh"
+    "./test18_hipify_memo.sh"
+    "./test19_fast_mode.sh"
+    "./test20_startup_time.sh"
+    "./test21_cfg_index.sh"
+    "./test22_phase_log.sh"
+    "./test23_build_report.sh"
+    "./test24_trace.sh"
+    "./test25_benchmark.sh"
+    "./test26_analyze.sh"
+    "./test27_batch_wheel_install.sh"
+    "./test28_rocm_sdk_tool_paths.sh"
 )
 
 # Loop through each script in the array and execute it